@@ -0,0 +1,162 @@
+# ===============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import json
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+
+
+# Categories of timed calculation parts
+CAT_CALC = 'calc'  # Whole fit calculation, by calculation type (local, projected, command)
+CAT_FIT = 'fit'  # Whole fit calculation, by fit
+CAT_RUNTIME = 'runTime'  # Effect run time phases of fit calculations
+CAT_ITEM = 'item'  # Local effects of single item onto its fit
+CAT_EFFECT = 'effect'  # Single effect handler call
+CAT_CAPSIM = 'capSim'  # Capacitor simulations
+
+
+class CalcProfiler:
+    """
+    Opt-in timing of fit calculations. Instrumented code checks enabled flag
+    before timing anything, so profiler costs next to nothing when it is off.
+    All times are inclusive, e.g. time of item includes its effects.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        # Format: {category: {key: [name, calls, total time, max time]}}
+        self.__stats = {}
+        self.__startTime = None
+        self.__elapsed = 0
+
+    def start(self, reset=True):
+        if reset:
+            self.reset()
+        self.enabled = True
+        self.__startTime = perf_counter()
+
+    def stop(self):
+        if self.enabled:
+            self.__elapsed += perf_counter() - self.__startTime
+        self.enabled = False
+        self.__startTime = None
+
+    def reset(self):
+        self.__stats = {}
+        self.__elapsed = 0
+        if self.enabled:
+            self.__startTime = perf_counter()
+
+    @contextmanager
+    def profiling(self):
+        self.start()
+        try:
+            yield self
+        finally:
+            self.stop()
+
+    def record(self, category, key, name, elapsed):
+        categoryStats = self.__stats.setdefault(category, {})
+        entry = categoryStats.get(key)
+        if entry is None:
+            categoryStats[key] = [name, 1, elapsed, elapsed]
+        else:
+            entry[1] += 1
+            entry[2] += elapsed
+            if elapsed > entry[3]:
+                entry[3] = elapsed
+
+    @contextmanager
+    def timed(self, category, key, name=None):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(category, key, name, perf_counter() - start)
+
+    def wrapEffect(self, effect, handler):
+        """Return effect handler which records its own run time."""
+        effectID = effect.ID
+        effectName = effect.name
+
+        @wraps(handler)
+        def timedHandler(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                self.record(CAT_EFFECT, effectID, effectName, perf_counter() - start)
+
+        return timedHandler
+
+    @staticmethod
+    def getItemKey(item):
+        """Return (key, name) for anything which runs its effects on fit."""
+        gameItem = getattr(item, 'item', None)
+        if gameItem is not None:
+            return gameItem.ID, gameItem.name
+        return type(item).__name__, type(item).__name__
+
+    def getReport(self, limit=None):
+        """
+        Return aggregated timings in {category: [entry]} format, entries
+        sorted by total time, longest first.
+        """
+        elapsed = self.__elapsed
+        if self.enabled:
+            elapsed += perf_counter() - self.__startTime
+        report = {'elapsed': elapsed, 'categories': {}}
+        for category, categoryStats in self.__stats.items():
+            entries = []
+            for key, (name, calls, total, maxTime) in categoryStats.items():
+                entries.append({
+                    'key': key if isinstance(key, (int, float, str)) else str(key),
+                    'name': name,
+                    'calls': calls,
+                    'total': total,
+                    'mean': total / calls,
+                    'max': maxTime})
+            entries.sort(key=lambda e: e['total'], reverse=True)
+            report['categories'][category] = entries[:limit] if limit else entries
+        return report
+
+    def formatReport(self, limit=20):
+        report = self.getReport(limit=limit)
+        lines = ['Calc profile, {:.3f}s profiled'.format(report['elapsed'])]
+        for category in (CAT_CALC, CAT_FIT, CAT_RUNTIME, CAT_ITEM, CAT_EFFECT, CAT_CAPSIM):
+            entries = report['categories'].get(category)
+            if not entries:
+                continue
+            lines.append('')
+            lines.append('{}:'.format(category))
+            lines.append('  {:>10} {:>8} {:>10} {:>10}  {}'.format('total, ms', 'calls', 'mean, ms', 'max, ms', 'name'))
+            for entry in entries:
+                lines.append('  {:>10.2f} {:>8} {:>10.3f} {:>10.3f}  {} ({})'.format(
+                    entry['total'] * 1000, entry['calls'], entry['mean'] * 1000, entry['max'] * 1000,
+                    entry['name'], entry['key']))
+        return '\n'.join(lines)
+
+    def exportReport(self, path, limit=None):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.getReport(limit=limit), f, indent=2)
+
+
+calcProfiler = CalcProfiler()
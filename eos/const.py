@@ -113,3 +113,21 @@ class Operator(IntEnum):
     MULTIPLY = 2
     POSTINCREASE = 3
     FORCE = 4
+
+
+@unique
+class FitRevisionCategory(IntEnum):
+    """
+    Contains groups of fit data tracked by fit revision counters
+    """
+    FIT = 0
+    MODULES = 1
+    DRONES = 2
+    FIGHTERS = 3
+    CARGO = 4
+    IMPLANTS = 5
+    BOOSTERS = 6
+    CHARACTER = 7
+    PROJECTED = 8
+    BOOSTS = 9
+    PROFILE = 10
@@ -18,13 +18,14 @@
 # ===============================================================================
 
 from sqlalchemy.inspection import inspect
-from sqlalchemy.orm import aliased, exc, join
+from sqlalchemy.orm import aliased, exc, join, joinedload, selectinload
 from sqlalchemy.sql import and_, or_, select
 
 import eos.config
 from eos.db import get_gamedata_session
 from eos.db.gamedata.item import items_table
 from eos.db.gamedata.group import groups_table
+from eos.db.gamedata.marketGroup import marketgroups_table
 from eos.db.util import processEager, processWhere
 from eos.gamedata import AlphaClone, Attribute, AttributeInfo, Category, DynamicItem, Group, Item, MarketGroup, MetaData, MetaGroup, ImplantSet
 
@@ -109,6 +110,22 @@ def getItems(itemIDs, eager=None):
     return items
 
 
+def getItemsPrefetched(itemIDs):
+    """
+    Load items along with everything item stats and fitting usually need.
+    Collections are loaded by separate batched queries, to avoid row
+    explosion of joining them all together.
+    """
+    if not itemIDs:
+        return []
+    return get_gamedata_session().query(Item).options(
+        selectinload(Item._Item__attributes),
+        selectinload(Item.effects),
+        joinedload(Item.group).joinedload(Group.category),
+        joinedload(Item.metaGroup),
+        joinedload(Item.traits)).filter(Item.ID.in_(itemIDs)).all()
+
+
 def getMutaplasmid(lookfor, eager=None):
     if isinstance(lookfor, int):
         item = get_gamedata_session().query(DynamicItem).filter(DynamicItem.ID == lookfor).first()
@@ -299,6 +316,26 @@ def getMarketTreeNodeIds(rootNodeIds):
     return allIds
 
 
+def getMarketIndexData():
+    """
+    Get raw market group and item rows needed to build market index,
+    without going through ORM.
+    """
+    session = get_gamedata_session()
+    groupRows = session.execute(select([
+        marketgroups_table.c.marketGroupID,
+        marketgroups_table.c.parentGroupID,
+        marketgroups_table.c.hasTypes,
+        marketgroups_table.c.iconID])).fetchall()
+    itemRows = session.execute(select([
+        items_table.c.typeID,
+        items_table.c.marketGroupID,
+        items_table.c.published,
+        items_table.c.variationParentTypeID,
+        items_table.c.iconID])).fetchall()
+    return groupRows, itemRows
+
+
 @cachedQuery(2, "where", "filter")
 def getItemsByCategory(filter, where=None, eager=None):
     if isinstance(filter, int):
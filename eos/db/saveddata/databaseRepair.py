@@ -17,16 +17,107 @@
 # along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
 # ===============================================================================
 
+import json
+import os
+
 from sqlalchemy.exc import DatabaseError
 from logbook import Logger
 
 pyfalog = Logger(__name__)
 
 
+ORPHANED_ITEM_FILTER = "itemID IS NULL OR itemID = '' or itemID = '0' or fitID IS NULL OR fitID = '' or fitID = '0'"
+ORPHANED_MODULE_FILTER = "itemID = '0' or fitID IS NULL OR fitID = '' or fitID = '0'"
+
+# Queries which count records each cleanup has to fix, in order cleanups are
+# run. Format: (cleanup method name, count query, count above which cleanup
+# is needed)
+CLEANUP_CHECKS = (
+    ('OrphanedCharacterSkills', "SELECT COUNT(*) FROM characterSkills WHERE characterID NOT IN (SELECT ID from characters)", 0),
+    ('OrphanedFitCharacterIDs', "SELECT COUNT(*) FROM fits WHERE characterID NOT IN (SELECT ID FROM characters) OR characterID IS NULL", 0),
+    ('OrphanedFitDamagePatterns', "SELECT COUNT(*) FROM fits WHERE damagePatternID NOT IN (SELECT ID FROM damagePatterns) OR damagePatternID IS NULL", 0),
+    ('NullDamagePatternNames', "SELECT COUNT(*) FROM damagePatterns WHERE name IS NULL OR name = ''", 0),
+    ('NullTargetResistNames', "SELECT COUNT(*) FROM targetResists WHERE name IS NULL OR name = ''", 0),
+    *(('OrphanedFitIDItemID', "SELECT COUNT(*) FROM {} WHERE {}".format(table, ORPHANED_ITEM_FILTER), 0)
+      for table in ('drones', 'cargo', 'fighters')),
+    ('OrphanedFitIDItemID', "SELECT COUNT(*) FROM modules WHERE {}".format(ORPHANED_MODULE_FILTER), 0),
+    *(('NullDamageTargetPatternValues', "SELECT COUNT(*) FROM {0} WHERE {1}Amount IS NULL OR {1}Amount = ''".format(profileType, damageType), 0)
+      for profileType in ('damagePatterns', 'targetResists')
+      for damageType in ('em', 'thermal', 'kinetic', 'explosive')),
+    ('DuplicateSelectedAmmoName', "SELECT COUNT(*) FROM damagePatterns WHERE name = 'Selected Ammo'", 1),
+)
+
+
+class IntegrityMarker:
+    """
+    Marker file written next to saveddata database on clean shutdown. While it
+    exists and matches the database file (schema version, size, modification
+    time), database is known to be consistent and startup validation can be
+    skipped. Marker is removed as soon as it is checked, so crash or external
+    modification of database always leads to validation on next start.
+    """
+
+    def __init__(self, dbPath):
+        self.dbPath = dbPath
+        self.path = dbPath + '.clean'
+
+    def __fingerprint(self, dbVersion):
+        stat = os.stat(self.dbPath)
+        return {'dbVersion': dbVersion, 'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+
+    def consume(self, dbVersion):
+        """Check if database was closed cleanly, and invalidate marker."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (IOError, ValueError):
+            return False
+        finally:
+            self.invalidate()
+        try:
+            return data == self.__fingerprint(dbVersion)
+        except OSError:
+            return False
+
+    def write(self, dbVersion):
+        try:
+            data = self.__fingerprint(dbVersion)
+            with open(self.path, 'w') as f:
+                json.dump(data, f)
+        except (IOError, OSError):
+            pyfalog.warning("Failed to write database integrity marker {0}", self.path)
+
+    def invalidate(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            pyfalog.warning("Failed to remove database integrity marker {0}", self.path)
+
+
 class DatabaseCleanup:
     def __init__(self):
         pass
 
+    @staticmethod
+    def RunAll(saveddata_engine):
+        """
+        Find and fix database corruption issues. Which cleanups are needed is
+        found out via single query combining all the checks.
+        """
+        query = "SELECT {}".format(", ".join("({})".format(q) for _, q, _ in CLEANUP_CHECKS))
+        results = DatabaseCleanup.ExecuteSQLQuery(saveddata_engine, query)
+        row = results.first() if results is not None else None
+        needed = []
+        for i, (cleanup, _, threshold) in enumerate(CLEANUP_CHECKS):
+            # If combined check fails, run everything and let each cleanup check on its own
+            if (row is None or (row[i] or 0) > threshold) and cleanup not in needed:
+                needed.append(cleanup)
+        for cleanup in needed:
+            getattr(DatabaseCleanup, cleanup)(saveddata_engine)
+        return needed
+
     @staticmethod
     def ExecuteSQLQuery(saveddata_engine, query):
         try:
@@ -0,0 +1,41 @@
+# ===============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+from sqlalchemy import Table, Column, Boolean, DateTime, Float, Integer, String
+from sqlalchemy.orm import mapper
+
+from eos.db import saveddata_meta
+from eos.saveddata.fitStats import FitStats
+
+
+fitStats_table = Table("fitStats", saveddata_meta,
+                       Column("fitID", Integer, primary_key=True),
+                       Column("fitModified", DateTime, nullable=True),
+                       Column("characterID", Integer, nullable=True, index=True),
+                       Column("gamedataVersion", String, nullable=True),
+                       Column("dps", Float, default=0.0),
+                       Column("volley", Float, default=0.0),
+                       Column("ehp", Float, default=0.0),
+                       Column("maxSpeed", Float, default=0.0),
+                       Column("capStable", Boolean, default=False),
+                       Column("capState", Float, default=0.0),
+                       Column("price", Float, default=0.0))
+
+
+mapper(FitStats, fitStats_table)
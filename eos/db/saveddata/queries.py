@@ -34,6 +34,7 @@ from eos.saveddata.targetProfile import TargetProfile
 from eos.saveddata.character import Character
 from eos.saveddata.implantSet import ImplantSet
 from eos.saveddata.fit import Fit, FitLite
+from eos.saveddata.fitStats import FitStats
 from eos.saveddata.module import Module
 from eos.saveddata.miscData import MiscData
 from eos.saveddata.override import Override
@@ -354,6 +355,50 @@ def clearPrices():
     return deleted_rows
 
 
+def getFitStats(fitID):
+    if isinstance(fitID, int):
+        with sd_lock:
+            summary = saveddata_session.query(FitStats).get(fitID)
+    else:
+        raise TypeError("Need integer as argument")
+    return summary
+
+
+def getValidFitStats(fitIDs, gamedataVersion):
+    """
+    Get stored stats summaries of passed fits as {fitID: summary}. Only
+    summaries made for current state of fit, its character and game data
+    are returned.
+    """
+    fitIDs = list(fitIDs)
+    if not fitIDs:
+        return {}
+    filter = and_(
+        FitStats.fitID.in_(fitIDs),
+        FitStats.fitModified.is_not_distinct_from(func.coalesce(fits_table.c.modified, fits_table.c.created)),
+        FitStats.characterID.is_not_distinct_from(fits_table.c.characterID),
+        FitStats.gamedataVersion == gamedataVersion)
+    with sd_lock:
+        summaries = saveddata_session.query(FitStats).join(fits_table, fits_table.c.ID == FitStats.fitID).filter(filter).all()
+    return {s.fitID: s for s in summaries}
+
+
+def clearFitStats(fitID=None, characterID=None):
+    """
+    Remove stored stats summaries. If no fit or character is passed,
+    all of them are removed.
+    """
+    with sd_lock:
+        query = saveddata_session.query(FitStats)
+        if fitID is not None:
+            query = query.filter(FitStats.fitID == fitID)
+        if characterID is not None:
+            query = query.filter(FitStats.characterID == characterID)
+        deleted_rows = query.delete(synchronize_session='fetch')
+    commit()
+    return deleted_rows
+
+
 def getMiscData(field):
     if isinstance(field, str):
         with sd_lock:
@@ -4,7 +4,8 @@ import datetime
 from sqlalchemy.event import listen
 from sqlalchemy.orm.collections import InstrumentedList
 
-from eos.db.saveddata.fit import projectedFitSourceRel, boostedOntoRel
+from eos.const import FitRevisionCategory
+from eos.db.saveddata.fit import CommandFit, ProjectedFit, projectedFitSourceRel, boostedOntoRel
 
 from eos.saveddata.fit import Fit
 from eos.saveddata.module import Module
@@ -19,6 +20,39 @@ ignored_rels = [
     boostedOntoRel
 ]
 
+# Categories of fit revision which get bumped when fit relationship is changed
+rel_revision_categories = {
+    '_Fit__modules': FitRevisionCategory.MODULES,
+    '_Fit__projectedModules': FitRevisionCategory.PROJECTED,
+    '_Fit__drones': FitRevisionCategory.DRONES,
+    '_Fit__projectedDrones': FitRevisionCategory.PROJECTED,
+    '_Fit__fighters': FitRevisionCategory.FIGHTERS,
+    '_Fit__projectedFighters': FitRevisionCategory.PROJECTED,
+    '_Fit__cargo': FitRevisionCategory.CARGO,
+    '_Fit__implants': FitRevisionCategory.IMPLANTS,
+    '_Fit__boosters': FitRevisionCategory.BOOSTERS,
+    'victimOf': FitRevisionCategory.PROJECTED,
+    'boostedOf': FitRevisionCategory.BOOSTS,
+}
+
+
+def get_item_revision_category(item):
+    if isinstance(item, (Module, Drone, Fighter)) and getattr(item, 'projected', False):
+        return FitRevisionCategory.PROJECTED
+    if isinstance(item, Module):
+        return FitRevisionCategory.MODULES
+    if isinstance(item, Drone):
+        return FitRevisionCategory.DRONES
+    if isinstance(item, Fighter):
+        return FitRevisionCategory.FIGHTERS
+    if isinstance(item, Cargo):
+        return FitRevisionCategory.CARGO
+    if isinstance(item, Implant):
+        return FitRevisionCategory.IMPLANTS
+    if isinstance(item, Booster):
+        return FitRevisionCategory.BOOSTERS
+    return FitRevisionCategory.FIT
+
 
 def update_fit_modified(target, value, oldvalue, initiator):
     if not target.owner:
@@ -35,8 +69,9 @@ def update_fit_modified(target, value, oldvalue, initiator):
             parent = target.owner
 
         # ensure this is a fit we're dealing with
-        if isinstance(parent, Fit):
+        if isinstance(parent, Fit) and not parent.hasTemporaryChanges:
             parent.modified = datetime.datetime.now()
+            parent.bumpRevision(get_item_revision_category(target))
 
 
 def apply_col_listeners(target, context):
@@ -55,10 +90,26 @@ def apply_col_listeners(target, context):
 
 
 def rel_listener(target, value, initiator):
-    if not target or (isinstance(value, Module) and value.isEmpty):
+    if not target or (isinstance(value, Module) and value.isEmpty) or target.hasTemporaryChanges:
         return
 
     target.modified = datetime.datetime.now()
+    target.bumpRevision(rel_revision_categories.get(getattr(initiator, 'key', None), FitRevisionCategory.FIT))
+
+
+def fit_col_listener(target, value, oldvalue, initiator):
+    if value != oldvalue:
+        target.bumpRevision(FitRevisionCategory.FIT)
+
+
+def projected_fit_listener(target, value, oldvalue, initiator):
+    if value != oldvalue and target.victim_fit is not None:
+        target.victim_fit.bumpRevision(FitRevisionCategory.PROJECTED)
+
+
+def command_fit_listener(target, value, oldvalue, initiator):
+    if value != oldvalue and target.boosted_fit is not None:
+        target.boosted_fit.bumpRevision(FitRevisionCategory.BOOSTS)
 
 
 def apply_rel_listeners(target, context):
@@ -84,3 +135,13 @@ listen(Fighter, 'load', apply_col_listeners)
 listen(Cargo, 'load', apply_col_listeners)
 listen(Implant, 'load', apply_col_listeners)
 listen(Booster, 'load', apply_col_listeners)
+
+# Fit revisions track everything which affects fit calculation; unlike fit
+# modified date, they are not persisted, so these can be set up right away
+listen(Fit.systemSecurity, 'set', fit_col_listener)
+listen(Fit.ignoreRestrictions, 'set', fit_col_listener)
+listen(Fit.implantLocation, 'set', fit_col_listener)
+listen(ProjectedFit.active, 'set', projected_fit_listener)
+listen(ProjectedFit._ProjectedFit__amount, 'set', projected_fit_listener)
+listen(ProjectedFit.projectionRange, 'set', projected_fit_listener)
+listen(CommandFit.active, 'set', command_fit_listener)
@@ -26,6 +26,7 @@ from sqlalchemy.orm import reconstructor
 
 import eos.effects
 import eos.db
+from eos.calcProfiler import calcProfiler
 from eos.saveddata.price import Price as types_Price
 from .eqBase import EqBase
 
@@ -68,6 +69,8 @@ class Effect(EqBase):
             pyfalog.debug("Generating effect: {0} ({1}) [runTime: {2}]", self.name, self.effectID, self.runTime)
             self.__generateHandler()
 
+        if calcProfiler.enabled:
+            return calcProfiler.wrapEffect(self, self.__handler)
         return self.__handler
 
     @property
@@ -229,6 +232,7 @@ class Item(EqBase):
     def init(self):
         self.__race = None
         self.__requiredSkills = None
+        self.__requiredSkillNames = None
         self.__requiredFor = None
         self.__offensive = None
         self.__assistive = None
@@ -446,6 +450,12 @@ class Item(EqBase):
 
         return False
 
+    def requiresAnySkill(self, skillNames):
+        """Check if item requires any of skills with passed names."""
+        if self.__requiredSkillNames is None:
+            self.__requiredSkillNames = frozenset(s.typeName for s in self.requiredSkills)
+        return not self.__requiredSkillNames.isdisjoint(skillNames)
+
     @property
     def price(self):
         # todo: use `from sqlalchemy import inspect` instead (mac-deprecated doesn't have inspect(), was imp[lemented in 0.8)
@@ -128,6 +128,7 @@ class ModifiedAttributeDict(MutableMapping):
         self.__preAssigns = {}
         self.__preIncreases = {}
         self.__multipliers = {}
+        # Format: {attr name: {penalty group: [(multiplier, count)]}}
         self.__penalizedMultipliers = {}
         self.__postIncreases = {}
         # We sometimes override the modifier (for things like skill handling). Store it here instead of registering it
@@ -361,7 +362,8 @@ class ModifiedAttributeDict(MutableMapping):
                         continue
                     mult = (mult - 1) * resMult + 1
                     multipliers.append(mult)
-                penalizedMultiplierGroups[stackGroup] = penalizedMultiplierGroups.get(stackGroup, []) + multipliers
+                penalizedMultiplierGroups[stackGroup] = (
+                    penalizedMultiplierGroups.get(stackGroup, []) + [(mult, 1) for mult in multipliers])
         postIncrease = self.__postIncreases.get(key, 0)
 
         # Grab initial value, priorities are:
@@ -384,26 +386,40 @@ class ModifiedAttributeDict(MutableMapping):
                 # Avoid modifying source and remove multipliers we were asked to remove for this calc
                 penalizedMultipliers = penalizedMultipliers[:]
                 for ignoreMult in ignorePenMult[penaltyGroup]:
-                    try:
-                        penalizedMultipliers.remove(ignoreMult)
-                    except ValueError:
-                        pass
+                    for i, (mult, count) in enumerate(penalizedMultipliers):
+                        if mult == ignoreMult:
+                            if count > 1:
+                                penalizedMultipliers[i] = (mult, count - 1)
+                            else:
+                                del penalizedMultipliers[i]
+                            break
             # A quick explanation of how this works:
             # 1: Bonuses and penalties are calculated seperately, so we'll have to filter each of them
-            l1 = [_val for _val in penalizedMultipliers if _val > 1]
-            l2 = [_val for _val in penalizedMultipliers if _val < 1]
+            l1 = [entry for entry in penalizedMultipliers if entry[0] > 1]
+            l2 = [entry for entry in penalizedMultipliers if entry[0] < 1]
             # 2: The most significant bonuses take the smallest penalty,
             # This means we'll have to sort
-            abssort = lambda _val: -abs(_val - 1)
+            abssort = lambda entry: -abs(entry[0] - 1)
             l1.sort(key=abssort)
             l2.sort(key=abssort)
             # 3: The first module doesn't get penalized at all
             # Any module after the first takes penalties according to:
             # 1 + (multiplier - 1) * math.exp(- math.pow(i, 2) / 7.1289)
+            # Multiplier applied count times takes count consecutive positions
             for l in (l1, l2):
-                for i in range(len(l)):
-                    bonus = l[i]
-                    val *= 1 + (bonus - 1) * exp(- i ** 2 / 7.1289)
+                i = 0
+                for bonus, count in l:
+                    for _ in range(count):
+                        factor = 1 + (bonus - 1) * exp(- i ** 2 / 7.1289)
+                        # Penalty only grows and bonuses only get weaker further
+                        # down the list, nothing else can change the value
+                        if factor == 1:
+                            break
+                        val *= factor
+                        i += 1
+                    else:
+                        continue
+                    break
         val += postIncrease
         if postIncAdj is not None:
             val += postIncAdj
@@ -433,7 +449,14 @@ class ModifiedAttributeDict(MutableMapping):
     def iterAfflictions(self):
         return self.__affectedBy.__iter__()
 
-    def __afflict(self, attributeName, operator, stackingGroup, preResAmount, postResAmount, used=True):
+    def __getModifierAmount(self):
+        """Return how many times current modifier applies its modifications"""
+        fit = self.fit
+        if fit is None:
+            return 1
+        return fit.getModifierAmount()
+
+    def __afflict(self, attributeName, operator, stackingGroup, preResAmount, postResAmount, used=True, amount=1):
         """Add modifier to list of things affecting current item"""
         # Do nothing if no fit is assigned
         fit = self.fit
@@ -458,17 +481,23 @@ class ModifiedAttributeDict(MutableMapping):
         else:
             modifier = fit.getModifier()
 
-        # Add current affliction to list
-        affs.append((modifier, operator, stackingGroup, preResAmount, postResAmount, used))
+        # Add current affliction to list, once per application
+        affs.extend([(modifier, operator, stackingGroup, preResAmount, postResAmount, used)] * amount)
 
     def preAssign(self, attributeName, value, **kwargs):
         """Overwrites original value of the entity with given one, allowing further modification"""
         self.__preAssigns[attributeName] = value
         self.__placehold(attributeName)
-        self.__afflict(attributeName, Operator.PREASSIGN, None, value, value, value != self.getOriginal(attributeName))
+        self.__afflict(
+            attributeName, Operator.PREASSIGN, None, value, value, value != self.getOriginal(attributeName),
+            amount=self.__getModifierAmount())
 
     def increase(self, attributeName, increase, position="pre", skill=None, **kwargs):
         """Increase value of given attribute by given number"""
+        self.increaseN(attributeName, increase, 1, position=position, skill=skill, **kwargs)
+
+    def increaseN(self, attributeName, increase, count, position="pre", skill=None, **kwargs):
+        """Increase value of given attribute by given number, count times"""
         if skill:
             increase *= self.__handleSkill(skill)
 
@@ -485,14 +514,24 @@ class ModifiedAttributeDict(MutableMapping):
             tbl = self.__postIncreases
         else:
             raise ValueError("position should be either pre or post")
+        amount = count * self.__getModifierAmount()
         if attributeName not in tbl:
             tbl[attributeName] = 0
-        tbl[attributeName] += increase
+        tbl[attributeName] += increase * amount
         self.__placehold(attributeName)
-        self.__afflict(attributeName, operator, None, increase, increase, increase != 0)
+        self.__afflict(attributeName, operator, None, increase, increase, increase != 0, amount=amount)
 
     def multiply(self, attributeName, multiplier, stackingPenalties=False, penaltyGroup="default", skill=None, **kwargs):
         """Multiply value of given attribute by given factor"""
+        self.multiplyN(
+            attributeName, multiplier, 1, stackingPenalties=stackingPenalties, penaltyGroup=penaltyGroup,
+            skill=skill, **kwargs)
+
+    def multiplyN(self, attributeName, multiplier, count, stackingPenalties=False, penaltyGroup="default", skill=None, **kwargs):
+        """
+        Multiply value of given attribute by given factor count times, with
+        each of them stacking penalized separately if asked to
+        """
         if multiplier is None:  # See GH issue 397
             return
 
@@ -508,20 +547,21 @@ class ModifiedAttributeDict(MutableMapping):
                 resisted = True
                 multiplier = (multiplier - 1) * resistFactor + 1
 
+        amount = count * self.__getModifierAmount()
         # If we're asked to do stacking penalized multiplication, append values
-        # to per penalty group lists
+        # to per penalty group lists, along with how many times they apply
         if stackingPenalties:
             if attributeName not in self.__penalizedMultipliers:
                 self.__penalizedMultipliers[attributeName] = {}
             if penaltyGroup not in self.__penalizedMultipliers[attributeName]:
                 self.__penalizedMultipliers[attributeName][penaltyGroup] = []
             tbl = self.__penalizedMultipliers[attributeName][penaltyGroup]
-            tbl.append(multiplier)
+            tbl.append((multiplier, amount))
         # Non-penalized multiplication factors go to the single list
         else:
             if attributeName not in self.__multipliers:
                 self.__multipliers[attributeName] = 1
-            self.__multipliers[attributeName] *= multiplier
+            self.__multipliers[attributeName] *= multiplier ** amount
 
         self.__placehold(attributeName)
 
@@ -533,21 +573,25 @@ class ModifiedAttributeDict(MutableMapping):
 
         self.__afflict(
             attributeName, Operator.MULTIPLY, penaltyGroup if stackingPenalties else None,
-            preResMultiplier, multiplier, multiplier != 1)
+            preResMultiplier, multiplier, multiplier != 1, amount=amount)
 
     def boost(self, attributeName, boostFactor, skill=None, **kwargs):
         """Boost value by some percentage"""
+        self.boostN(attributeName, boostFactor, 1, skill=skill, **kwargs)
+
+    def boostN(self, attributeName, boostFactor, count, skill=None, **kwargs):
+        """Boost value by some percentage count times"""
         if skill:
             boostFactor *= self.__handleSkill(skill)
 
         # We just transform percentage boost into multiplication factor
-        self.multiply(attributeName, 1 + boostFactor / 100.0, **kwargs)
+        self.multiplyN(attributeName, 1 + boostFactor / 100.0, count, **kwargs)
 
     def force(self, attributeName, value, **kwargs):
         """Force value to attribute and prohibit any changes to it"""
         self.__forced[attributeName] = value
         self.__placehold(attributeName)
-        self.__afflict(attributeName, Operator.FORCE, None, value, value)
+        self.__afflict(attributeName, Operator.FORCE, None, value, value, amount=self.__getModifierAmount())
 
     @staticmethod
     def getResistance(fit, effect):
@@ -19,17 +19,20 @@
 
 import datetime
 import time
+from contextlib import contextmanager
 from copy import deepcopy
 from itertools import chain
 from math import ceil, log, sqrt
 
 from logbook import Logger
 from sqlalchemy.orm import reconstructor, validates
+from sqlalchemy.orm.attributes import set_committed_value
 
 import eos.db
 from eos import capSim
+from eos.calcProfiler import CAT_CALC, CAT_CAPSIM, CAT_FIT, CAT_ITEM, CAT_RUNTIME, calcProfiler
 from eos.calc import calculateLockTime, calculateMultiplier
-from eos.const import CalcType, FitSystemSecurity, FittingHardpoint, FittingModuleState, FittingSlot, ImplantLocation
+from eos.const import CalcType, FitRevisionCategory, FitSystemSecurity, FittingHardpoint, FittingModuleState, FittingSlot, ImplantLocation
 from eos.effectHandlerHelpers import (
     HandledBoosterList, HandledDroneCargoList, HandledImplantList,
     HandledModuleList, HandledProjectedDroneList, HandledProjectedModList)
@@ -62,6 +65,17 @@ class FitLite:
         return 'FitLite(ID={})'.format(self.ID)
 
 
+class CommandBuffCollector:
+    """Stands in for boosted fit to record command bonuses a booster provides."""
+
+    def __init__(self):
+        # Format: [(warfareBuffID, value, module, effect, runTime)]
+        self.buffs = []
+
+    def addCommandBonus(self, warfareBuffID, value, module, effect, runTime="normal"):
+        self.buffs.append((warfareBuffID, value, module, effect, runTime))
+
+
 class Fit:
     """Represents a fitting, with modules, ship, implants, etc."""
 
@@ -69,6 +83,7 @@ class Fit:
 
     def __init__(self, ship=None, name=""):
         """Initialize a fit from the program"""
+        self.__initRevisions()
         self.__ship = None
         self.__mode = None
         # use @mode.setter's to set __attr and IDs. This will set mode as well
@@ -101,6 +116,7 @@ class Fit:
     @reconstructor
     def init(self):
         """Initialize a fit from the database and validate"""
+        self.__initRevisions()
         self.__ship = None
         self.__mode = None
 
@@ -159,6 +175,17 @@ class Fit:
         self.gangBoosts = None
         self.__ecmProjectedList = []
         self.commandBonuses = {}
+        # Format: {runTime: [command bonus args]}, bonuses this fit provides as booster
+        self.__commandBuffs = None
+        # Format: {(container, skills, groups): [items]}, targets of command bonuses
+        self.__commandTargetIndex = {}
+        # Format: {runTime: [modules]}, modules which have projected effects
+        self.__projectingModules = {}
+        self.__modifierAmount = 1
+        # Fit whose incoming projections and boosts apply to this one, set
+        # on scratch copies only
+        self.__linkSource = None
+        self.__linkProjectedFits = True
         # Reps received, as a list of (amount, cycle time in seconds)
         self._hullRr = []
         self._armorRr = []
@@ -166,6 +193,44 @@ class Fit:
         self._armorRrFullSpool = []
         self._shieldRr = []
 
+    def __initRevisions(self):
+        self.__revision = 0
+        # Format: {category: fit revision when category was last changed}
+        self.__categoryRevisions = {}
+        self.__temporaryChanges = 0
+
+    @property
+    def revision(self):
+        """Number which is increased each time anything on fit changes"""
+        return self.__revision
+
+    def getRevision(self, category):
+        """Fit revision at which passed FitRevisionCategory was last changed"""
+        return self.__categoryRevisions.get(category, 0)
+
+    def bumpRevision(self, *categories):
+        if self.__temporaryChanges:
+            return
+        self.__revision += 1
+        for category in categories:
+            self.__categoryRevisions[category] = self.__revision
+
+    @contextmanager
+    def temporaryChanges(self):
+        """
+        Changes done within are reverted by caller before leaving, thus
+        they neither count as fit changes nor touch modification time.
+        """
+        self.__temporaryChanges += 1
+        try:
+            yield
+        finally:
+            self.__temporaryChanges -= 1
+
+    @property
+    def hasTemporaryChanges(self):
+        return self.__temporaryChanges > 0
+
     def clearFactorReloadDependentData(self):
         # Here we clear all data known to rely on cycle parameters
         # (which, in turn, relies on factor reload flag)
@@ -200,6 +265,7 @@ class Fit:
         else:
             self.__userTargetProfile = targetProfile
             self.__builtinTargetProfileID = None
+        self.bumpRevision(FitRevisionCategory.PROFILE)
         self.__weaponDpsMap = {}
         self.__weaponVolleyMap = {}
         self.__droneDps = None
@@ -226,6 +292,7 @@ class Fit:
         else:
             self.__userDamagePattern = damagePattern
             self.__builtinDamagePatternID = None
+        self.bumpRevision(FitRevisionCategory.PROFILE)
         self.__ehp = None
         self.__effectiveTank = None
 
@@ -245,6 +312,7 @@ class Fit:
         self.modeID = mode.item.ID if mode is not None else None
         if mode is not None:
             mode.owner = self
+        self.bumpRevision(FitRevisionCategory.FIT)
 
     @property
     def modifiedCoalesce(self):
@@ -261,6 +329,7 @@ class Fit:
     @character.setter
     def character(self, char):
         self.__character = char
+        self.bumpRevision(FitRevisionCategory.CHARACTER)
 
     @property
     def calculated(self):
@@ -336,6 +405,10 @@ class Fit:
     def getCommandInfo(self, fitID):
         return self.boostedOnto.get(fitID, None)
 
+    @property
+    def __linkedFit(self):
+        return self if self.__linkSource is None else self.__linkSource
+
     @property
     def projectedDrones(self):
         return self.__projectedDrones
@@ -532,6 +605,9 @@ class Fit:
         self.__capRecharge = None
         self.__savedCapSimData.clear()
         self.__ecmProjectedList = []
+        self.__commandBuffs = None
+        self.__commandTargetIndex.clear()
+        self.__projectingModules.clear()
         # self.commandBonuses = {}
 
         del self.__calculatedTargets[:]
@@ -577,9 +653,12 @@ class Fit:
 
     # Methods to register and get the thing currently affecting the fit,
     # so we can correctly map "Affected By"
-    def register(self, currModifier, origin=None):
+    def register(self, currModifier, origin=None, amount=1):
         self.__modifier = currModifier
         self.__origin = origin
+        # How many times modifications done by the modifier have to be
+        # applied, e.g. when fit is projected multiple times
+        self.__modifierAmount = amount
         if hasattr(currModifier, "itemModifiedAttributes"):
             if hasattr(currModifier.itemModifiedAttributes, "fit"):
                 currModifier.itemModifiedAttributes.fit = origin or self
@@ -593,6 +672,9 @@ class Fit:
     def getOrigin(self):
         return self.__origin
 
+    def getModifierAmount(self):
+        return self.__modifierAmount
+
     def addCommandBonus(self, warfareBuffID, value, module, effect, runTime="normal"):
         # oh fuck this is so janky
         # @todo should we pass in min/max to this function, or is abs okay?
@@ -621,16 +703,9 @@ class Fit:
                         self.ship.boostItemAttr("shield%sDamageResonance" % damageType, value, stackingPenalties=True)
 
                 if warfareBuffID == 11:  # Shield Burst: Active Shielding: Repair Duration/Capacitor
-                    self.modules.filteredItemBoost(
-                            lambda mod: mod.item.requiresSkill("Shield Operation") or
-                                        mod.item.requiresSkill("Shield Emission Systems") or
-                                        mod.item.requiresSkill("Capital Shield Emission Systems"),
-                            "capacitorNeed", value)
-                    self.modules.filteredItemBoost(
-                            lambda mod: mod.item.requiresSkill("Shield Operation") or
-                                        mod.item.requiresSkill("Shield Emission Systems") or
-                                        mod.item.requiresSkill("Capital Shield Emission Systems"),
-                            "duration", value)
+                    skills = ("Shield Operation", "Shield Emission Systems", "Capital Shield Emission Systems")
+                    self.__boostCommandTargets(self.modules, "capacitorNeed", value, skills=skills)
+                    self.__boostCommandTargets(self.modules, "duration", value, skills=skills)
 
                 if warfareBuffID == 12:  # Shield Burst: Shield Extension: Shield HP
                     self.ship.boostItemAttr("shieldCapacity", value)
@@ -640,16 +715,9 @@ class Fit:
                         self.ship.boostItemAttr("armor%sDamageResonance" % damageType, value, stackingPenalties=True)
 
                 if warfareBuffID == 14:  # Armor Burst: Rapid Repair: Repair Duration/Capacitor
-                    self.modules.filteredItemBoost(
-                            lambda mod: mod.item.requiresSkill("Remote Armor Repair Systems") or
-                                        mod.item.requiresSkill("Repair Systems") or
-                                        mod.item.requiresSkill("Capital Remote Armor Repair Systems"),
-                            "capacitorNeed", value)
-                    self.modules.filteredItemBoost(
-                            lambda mod: mod.item.requiresSkill("Remote Armor Repair Systems") or
-                                        mod.item.requiresSkill("Repair Systems") or
-                                        mod.item.requiresSkill("Capital Remote Armor Repair Systems"),
-                            "duration", value)
+                    skills = ("Remote Armor Repair Systems", "Repair Systems", "Capital Remote Armor Repair Systems")
+                    self.__boostCommandTargets(self.modules, "capacitorNeed", value, skills=skills)
+                    self.__boostCommandTargets(self.modules, "duration", value, skills=skills)
 
                 if warfareBuffID == 15:  # Armor Burst: Armor Reinforcement: Armor HP
                     self.ship.boostItemAttr("armorHP", value)
@@ -659,27 +727,20 @@ class Fit:
 
                 if warfareBuffID == 17:  # Information Burst: Electronic Superiority: EWAR Range and Strength
                     groups = ("ECM", "Sensor Dampener", "Weapon Disruptor", "Target Painter")
-                    self.modules.filteredItemBoost(lambda mod: mod.item.group.name in groups, "maxRange", value,
-                                                   stackingPenalties=True)
-                    self.modules.filteredItemBoost(lambda mod: mod.item.group.name in groups,
-                                                   "falloffEffectiveness", value, stackingPenalties=True)
+                    self.__boostCommandTargets(self.modules, "maxRange", value, stackingPenalties=True, groups=groups)
+                    self.__boostCommandTargets(self.modules, "falloffEffectiveness", value, stackingPenalties=True, groups=groups)
 
                     for scanType in ("Magnetometric", "Radar", "Ladar", "Gravimetric"):
-                        self.modules.filteredItemBoost(lambda mod: mod.item.group.name == "ECM",
-                                                       "scan%sStrengthBonus" % scanType, value,
-                                                       stackingPenalties=True)
+                        self.__boostCommandTargets(self.modules, "scan%sStrengthBonus" % scanType, value, stackingPenalties=True, groups=("ECM",))
 
                     for attr in ("missileVelocityBonus", "explosionDelayBonus", "aoeVelocityBonus", "falloffBonus",
                                  "maxRangeBonus", "aoeCloudSizeBonus", "trackingSpeedBonus"):
-                        self.modules.filteredItemBoost(lambda mod: mod.item.group.name == "Weapon Disruptor",
-                                                       attr, value)
+                        self.__boostCommandTargets(self.modules, attr, value, groups=("Weapon Disruptor",))
 
                     for attr in ("maxTargetRangeBonus", "scanResolutionBonus"):
-                        self.modules.filteredItemBoost(lambda mod: mod.item.group.name == "Sensor Dampener",
-                                                       attr, value)
+                        self.__boostCommandTargets(self.modules, attr, value, groups=("Sensor Dampener",))
 
-                    self.modules.filteredItemBoost(lambda mod: mod.item.group.name == "Target Painter",
-                                                   "signatureRadiusBonus", value, stackingPenalties=True)
+                    self.__boostCommandTargets(self.modules, "signatureRadiusBonus", value, stackingPenalties=True, groups=("Target Painter",))
 
                 if warfareBuffID == 18:  # Information Burst: Electronic Hardening: Scan Strength
                     for scanType in ("Gravimetric", "Radar", "Ladar", "Magnetometric"):
@@ -694,37 +755,26 @@ class Fit:
 
                 if warfareBuffID == 21:  # Skirmish Burst: Interdiction Maneuvers: Tackle Range
                     groups = ("Stasis Web", "Warp Scrambler")
-                    self.modules.filteredItemBoost(lambda mod: mod.item.group.name in groups, "maxRange", value,
-                                                   stackingPenalties=True)
+                    self.__boostCommandTargets(self.modules, "maxRange", value, stackingPenalties=True, groups=groups)
 
                 if warfareBuffID == 22:  # Skirmish Burst: Rapid Deployment: AB/MWD Speed Increase
-                    self.modules.filteredItemBoost(lambda mod: mod.item.requiresSkill("Afterburner") or
-                                                               mod.item.requiresSkill("High Speed Maneuvering"),
-                                                   "speedFactor", value, stackingPenalties=True)
+                    skills = ("Afterburner", "High Speed Maneuvering")
+                    self.__boostCommandTargets(self.modules, "speedFactor", value, stackingPenalties=True, skills=skills)
 
                 if warfareBuffID == 23:  # Mining Burst: Mining Laser Field Enhancement: Mining/Survey Range
-                    self.modules.filteredItemBoost(lambda mod: mod.item.requiresSkill("Mining") or
-                                                               mod.item.requiresSkill("Ice Harvesting") or
-                                                               mod.item.requiresSkill("Gas Cloud Harvesting"),
-                                                   "maxRange", value, stackingPenalties=True)
+                    skills = ("Mining", "Ice Harvesting", "Gas Cloud Harvesting")
+                    self.__boostCommandTargets(self.modules, "maxRange", value, stackingPenalties=True, skills=skills)
 
-                    self.modules.filteredItemBoost(lambda mod: mod.item.requiresSkill("CPU Management"),
-                                                   "surveyScanRange", value, stackingPenalties=True)
+                    self.__boostCommandTargets(self.modules, "surveyScanRange", value, stackingPenalties=True, skills=("CPU Management",))
 
                 if warfareBuffID == 24:  # Mining Burst: Mining Laser Optimization: Mining Capacitor/Duration
-                    self.modules.filteredItemBoost(lambda mod: mod.item.requiresSkill("Mining") or
-                                                               mod.item.requiresSkill("Ice Harvesting") or
-                                                               mod.item.requiresSkill("Gas Cloud Harvesting"),
-                                                   "capacitorNeed", value, stackingPenalties=True)
+                    skills = ("Mining", "Ice Harvesting", "Gas Cloud Harvesting")
+                    self.__boostCommandTargets(self.modules, "capacitorNeed", value, stackingPenalties=True, skills=skills)
 
-                    self.modules.filteredItemBoost(lambda mod: mod.item.requiresSkill("Mining") or
-                                                               mod.item.requiresSkill("Ice Harvesting") or
-                                                               mod.item.requiresSkill("Gas Cloud Harvesting"),
-                                                   "duration", value, stackingPenalties=True)
+                    self.__boostCommandTargets(self.modules, "duration", value, stackingPenalties=True, skills=skills)
 
                 if warfareBuffID == 25:  # Mining Burst: Mining Equipment Preservation: Crystal Volatility
-                    self.modules.filteredChargeBoost(lambda mod: mod.item.requiresSkill("Mining"),
-                                                     "crystalVolatilityChance", value, stackingPenalties=True)
+                    self.__boostCommandTargets(self.modules, "crystalVolatilityChance", value, stackingPenalties=True, skills=("Mining",), charge=True)
 
                 if warfareBuffID == 26:  # Information Burst: Sensor Optimization: Targeting Range
                     self.ship.boostItemAttr("maxTargetRange", value, stackingPenalties=True)
@@ -782,22 +832,20 @@ class Fit:
                     self.ship.boostItemAttr("maxVelocity", value, stackingPenalties=True)
 
                 if warfareBuffID == 52:  # Erebus Effect Generator : Shield RR penalty
-                    self.modules.filteredItemBoost(lambda mod: mod.item.requiresSkill("Shield Emission Systems"), "shieldBonus", value, stackingPenalties=True)
+                    self.__boostCommandTargets(self.modules, "shieldBonus", value, stackingPenalties=True, skills=("Shield Emission Systems",))
 
                 if warfareBuffID == 53:  # Leviathan Effect Generator : Armor RR penalty
-                    self.modules.filteredItemBoost(lambda mod: mod.item.requiresSkill("Remote Armor Repair Systems"),
-                                                   "armorDamageAmount", value, stackingPenalties=True)
+                    self.__boostCommandTargets(self.modules, "armorDamageAmount", value, stackingPenalties=True, skills=("Remote Armor Repair Systems",))
 
                 if warfareBuffID == 54:  # Ragnarok Effect Generator : Laser and Hybrid Optimal penalty
                     groups = ("Energy Weapon", "Hybrid Weapon")
-                    self.modules.filteredItemBoost(lambda mod: mod.item.group.name in groups, "maxRange", value, stackingPenalties=True)
+                    self.__boostCommandTargets(self.modules, "maxRange", value, stackingPenalties=True, groups=groups)
 
                 # Localized environment effects
 
                 if warfareBuffID == 79:  # AOE_Beacon_bioluminescence_cloud
                     self.ship.boostItemAttr("signatureRadius", value, stackingPenalties=True)
-                    self.drones.filteredItemBoost(lambda mod: mod.item.requiresSkill("Drones"),
-                        "signatureRadius", value, stackingPenalties=True)
+                    self.__boostCommandTargets(self.drones, "signatureRadius", value, stackingPenalties=True, skills=("Drones",))
 
                 if warfareBuffID == 80:  # AOE_Beacon_caustic_cloud_inertia
                     self.ship.boostItemAttr("agility", value, stackingPenalties=True)
@@ -806,23 +854,19 @@ class Fit:
                     self.ship.boostItemAttr("maxVelocity", value, stackingPenalties=True)
 
                 if warfareBuffID == 88:  # AOE_Beacon_filament_cloud_shield_booster_shield_bonus
-                    self.modules.filteredItemBoost(lambda mod: mod.item.requiresSkill("Shield Operation"),
-                                                   "shieldBonus", value, stackingPenalties=True)
+                    self.__boostCommandTargets(self.modules, "shieldBonus", value, stackingPenalties=True, skills=("Shield Operation",))
 
                 if warfareBuffID == 89:  # AOE_Beacon_filament_cloud_shield_booster_duration
-                    self.modules.filteredItemBoost(lambda mod: mod.item.requiresSkill("Shield Operation"),
-                                                   "duration", value, stackingPenalties=True)
+                    self.__boostCommandTargets(self.modules, "duration", value, stackingPenalties=True, skills=("Shield Operation",))
 
                 # Abyssal Weather Effects
 
                 if warfareBuffID == 90:  # Weather_electric_storm_EM_resistance_penalty
                     for tankType in ("shield", "armor"):
                         self.ship.boostItemAttr("{}EmDamageResonance".format(tankType), value)
-                        self.drones.filteredItemBoost(lambda mod: mod.item.requiresSkill("Drones"),
-                            "{}EmDamageResonance".format(tankType), value)
+                        self.__boostCommandTargets(self.drones, "{}EmDamageResonance".format(tankType), value, skills=("Drones",))
                     self.ship.boostItemAttr("emDamageResonance", value)  # for hull
-                    self.drones.filteredItemBoost(lambda mod: mod.item.requiresSkill("Drones"),
-                        "emDamageResonance", value)  #for hull
+                    self.__boostCommandTargets(self.drones, "emDamageResonance", value, skills=("Drones",))  #for hull
 
                 if warfareBuffID == 92:  # Weather_electric_storm_capacitor_recharge_bonus
                     self.ship.boostItemAttr("rechargeRate", value, stackingPenalties=True)
@@ -830,68 +874,81 @@ class Fit:
                 if warfareBuffID == 93:  # Weather_xenon_gas_explosive_resistance_penalty
                     for tankType in ("shield", "armor"):
                         self.ship.boostItemAttr("{}ExplosiveDamageResonance".format(tankType), value)
-                        self.drones.filteredItemBoost(lambda mod: mod.item.requiresSkill("Drones"),
-                            "{}ExplosiveDamageResonance".format(tankType), value)
+                        self.__boostCommandTargets(self.drones, "{}ExplosiveDamageResonance".format(tankType), value, skills=("Drones",))
                     self.ship.boostItemAttr("explosiveDamageResonance", value)  # for hull
-                    self.drones.filteredItemBoost(lambda mod: mod.item.requiresSkill("Drones"),
-                        "explosiveDamageResonance", value)  # for hull
+                    self.__boostCommandTargets(self.drones, "explosiveDamageResonance", value, skills=("Drones",))  # for hull
 
                 if warfareBuffID == 94:  # Weather_xenon_gas_shield_hp_bonus
                     self.ship.boostItemAttr("shieldCapacity", value)
-                    self.drones.filteredItemBoost(lambda mod: mod.item.requiresSkill("Drones"),
-                        "shieldCapacity", value)
+                    self.__boostCommandTargets(self.drones, "shieldCapacity", value, skills=("Drones",))
 
                 if warfareBuffID == 95:  # Weather_infernal_thermal_resistance_penalty
                     for tankType in ("shield", "armor"):
                         self.ship.boostItemAttr("{}ThermalDamageResonance".format(tankType), value)
-                        self.drones.filteredItemBoost(lambda mod: mod.item.requiresSkill("Drones"),
-                            "{}ThermalDamageResonance".format(tankType), value)
+                        self.__boostCommandTargets(self.drones, "{}ThermalDamageResonance".format(tankType), value, skills=("Drones",))
                     self.ship.boostItemAttr("thermalDamageResonance", value)  # for hull
-                    self.drones.filteredItemBoost(lambda mod: mod.item.requiresSkill("Drones"),
-                        "thermalDamageResonance", value)  # for hull
+                    self.__boostCommandTargets(self.drones, "thermalDamageResonance", value, skills=("Drones",))  # for hull
 
                 if warfareBuffID == 96:  # Weather_infernal_armor_hp_bonus
                     self.ship.boostItemAttr("armorHP", value)
-                    self.drones.filteredItemBoost(lambda mod: mod.item.requiresSkill("Drones"),
-                        "armorHP", value)
+                    self.__boostCommandTargets(self.drones, "armorHP", value, skills=("Drones",))
 
                 if warfareBuffID == 97:  # Weather_darkness_turret_range_penalty
-                    self.modules.filteredItemBoost(lambda mod: mod.item.requiresSkill("Gunnery"),
-                                                   "maxRange", value, stackingPenalties=True)
-                    self.drones.filteredItemBoost(lambda mod: mod.item.requiresSkill("Drones"),
-                        "maxRange", value, stackingPenalties=True)
-                    self.modules.filteredItemBoost(lambda mod: mod.item.requiresSkill("Gunnery"),
-                                                   "falloff", value, stackingPenalties=True)
-                    self.drones.filteredItemBoost(lambda mod: mod.item.requiresSkill("Drones"),
-                        "falloff", value, stackingPenalties=True)
+                    self.__boostCommandTargets(self.modules, "maxRange", value, stackingPenalties=True, skills=("Gunnery",))
+                    self.__boostCommandTargets(self.drones, "maxRange", value, stackingPenalties=True, skills=("Drones",))
+                    self.__boostCommandTargets(self.modules, "falloff", value, stackingPenalties=True, skills=("Gunnery",))
+                    self.__boostCommandTargets(self.drones, "falloff", value, stackingPenalties=True, skills=("Drones",))
 
                 if warfareBuffID == 98:  # Weather_darkness_velocity_bonus
                     self.ship.boostItemAttr("maxVelocity", value)
-                    self.drones.filteredItemBoost(lambda mod: mod.item.requiresSkill("Drones"),
-                        "maxVelocity", value)
+                    self.__boostCommandTargets(self.drones, "maxVelocity", value, skills=("Drones",))
 
                 if warfareBuffID == 99:  # Weather_caustic_toxin_kinetic_resistance_penalty
                     for tankType in ("shield", "armor"):
                         self.ship.boostItemAttr("{}KineticDamageResonance".format(tankType), value)
-                        self.drones.filteredItemBoost(lambda mod: mod.item.requiresSkill("Drones"),
-                            "{}KineticDamageResonance".format(tankType), value)
+                        self.__boostCommandTargets(self.drones, "{}KineticDamageResonance".format(tankType), value, skills=("Drones",))
                     self.ship.boostItemAttr("kineticDamageResonance", value)  # for hull
-                    self.drones.filteredItemBoost(lambda mod: mod.item.requiresSkill("Drones"),
-                        "kineticDamageResonance", value)  # for hull
+                    self.__boostCommandTargets(self.drones, "kineticDamageResonance", value, skills=("Drones",))  # for hull
 
                 if warfareBuffID == 100:  # Weather_caustic_toxin_scan_resolution_bonus
                     self.ship.boostItemAttr("scanResolution", value, stackingPenalties=True)
 
                 if warfareBuffID == 2405:  # Insurgency Suppression Bonus: Interdiction Range
-                    self.modules.filteredItemBoost(
-                        lambda mod: mod.item.requiresSkill("Navigation"),
-                        "maxRange", value, stackingPenalties=True)
-                    self.modules.filteredItemBoost(
-                        lambda mod: mod.item.group.name == "Stasis Web",
-                        "maxRange", value, stackingPenalties=True)
+                    self.__boostCommandTargets(self.modules, "maxRange", value, stackingPenalties=True, skills=("Navigation",))
+                    self.__boostCommandTargets(self.modules, "maxRange", value, stackingPenalties=True, groups=("Stasis Web",))
 
             del self.commandBonuses[warfareBuffID]
 
+    def __boostCommandTargets(self, container, attributeName, value, skills=(), groups=(), charge=False, **kwargs):
+        # Many bursts boost several attributes of the same items, so items
+        # matching each selector are looked up only once per calculation
+        key = ('drones' if container is self.drones else 'modules', skills, groups)
+        targets = self.__commandTargetIndex.get(key)
+        if targets is None:
+            targets = self.__commandTargetIndex[key] = [
+                element for element in container
+                if element.item is not None and (
+                    element.item.requiresAnySkill(skills) or element.item.group.name in groups)]
+        for element in targets:
+            try:
+                if charge:
+                    element.boostChargeAttr(attributeName, value, **kwargs)
+                else:
+                    element.boostItemAttr(attributeName, value, **kwargs)
+            except AttributeError:
+                pass
+
+    def __collectCommandBuffs(self):
+        # Gang effects do nothing but register command bonuses, so running
+        # them against a collector gets everything this fit provides
+        commandBuffs = {}
+        for runTime in ("early", "normal", "late"):
+            collector = CommandBuffCollector()
+            for mod in self.modules:
+                mod.calculateModifiedAttributes(collector, runTime, False, True)
+            commandBuffs[runTime] = collector.buffs
+        return commandBuffs
+
     def __resetDependentCalcs(self):
         self.calculated = False
         for value in list(self.projectedOnto.values()):
@@ -912,6 +969,14 @@ class Fit:
                 The type of calculation our current iteration is in. This helps us determine the interactions between
                 fits that rely on others for proper calculations
         """
+        if calcProfiler.enabled:
+            with calcProfiler.timed(CAT_CALC, CalcType(type).name, CalcType(type).name):
+                with calcProfiler.timed(CAT_FIT, self.ID, self.name):
+                    self.__calculateModifiedAttributes(targetFit, type)
+        else:
+            self.__calculateModifiedAttributes(targetFit, type)
+
+    def __calculateModifiedAttributes(self, targetFit, type):
         pyfalog.info("Starting fit calculation on: {0}, calc: {1}", repr(self), CalcType(type).name)
 
         # If we are projecting this fit onto another one, collect the projection info for later use
@@ -933,17 +998,18 @@ class Fit:
 
         if targetFit and type == CalcType.PROJECTED:
             pyfalog.debug("Calculating projections from {0} to target {1}", repr(self), repr(targetFit))
-            projectionInfo = self.getProjectionInfo(targetFit.ID)
+            projectionInfo = self.getProjectionInfo(targetFit.__linkedFit.ID)
 
         # Start applying any command fits that we may have.
         # We run the command calculations first so that they can calculate fully and store the command effects on the
         # target fit to be used later on in the calculation. This does not apply when we're already calculating a
         # command fit.
-        if type != CalcType.COMMAND and self.commandFits and not self.__calculated:
-            for fit in self.commandFits:
-                commandInfo = fit.getCommandInfo(self.ID)
+        linkedFit = self.__linkedFit
+        if type != CalcType.COMMAND and linkedFit.commandFits and not self.__calculated:
+            for fit in linkedFit.commandFits:
+                commandInfo = fit.getCommandInfo(linkedFit.ID)
                 # Continue loop if we're trying to apply ourselves or if this fit isn't active
-                if not commandInfo.active or self == commandInfo.booster_fit:
+                if not commandInfo.active or linkedFit == commandInfo.booster_fit:
                     continue
 
                 commandInfo.booster_fit.calculateModifiedAttributes(self, CalcType.COMMAND)
@@ -972,8 +1038,18 @@ class Fit:
             pyfalog.info("Fit is not yet calculated; will be running local calcs for {}".format(repr(self)))
             self.clear()
 
+        # Bonuses of already calculated booster do not depend on the fit it
+        # boosts, so they are collected once and replayed onto every boosted
+        # fit instead of running gang effects for each of them
+        replayCommandBuffs = type == CalcType.COMMAND and self.__calculated
+        if replayCommandBuffs and self.__commandBuffs is None:
+            self.__commandBuffs = self.__collectCommandBuffs()
+
+        profile = calcProfiler.enabled
         # Loop through our run times here. These determine which effects are run in which order.
         for runTime in ("early", "normal", "late"):
+            if profile:
+                phaseStart = time.perf_counter()
             # pyfalog.debug("Run time: {0}", runTime)
             # Items that are unrestricted. These items are run on the local fit
             # first and then projected onto the target fit it one is designated
@@ -1005,14 +1081,23 @@ class Fit:
                     # apply effects locally if this is first time running them on fit
                     if not self.__calculated:
                         self.register(item)
-                        item.calculateModifiedAttributes(self, runTime, False)
+                        if profile:
+                            itemKey, itemName = calcProfiler.getItemKey(item)
+                            with calcProfiler.timed(CAT_ITEM, itemKey, itemName):
+                                item.calculateModifiedAttributes(self, runTime, False)
+                        else:
+                            item.calculateModifiedAttributes(self, runTime, False)
 
                     # Run command effects against target fit. We only have to worry about modules
-                    if type == CalcType.COMMAND and item in self.modules:
+                    if type == CalcType.COMMAND and not replayCommandBuffs and item in self.modules:
                         # Apply the gang boosts to target fit
                         # targetFit.register(item, origin=self)
                         item.calculateModifiedAttributes(targetFit, runTime, False, True)
 
+            if replayCommandBuffs:
+                for commandBuff in self.__commandBuffs[runTime]:
+                    targetFit.addCommandBonus(*commandBuff)
+
             # pyfalog.debug("Command Bonuses: {}".format(self.commandBonuses))
 
             # If we are calculating our local or projected fit and have command bonuses, apply them
@@ -1024,19 +1109,22 @@ class Fit:
             if type == CalcType.PROJECTED and projectionInfo:
                 self.__runProjectionEffects(runTime, targetFit, projectionInfo)
 
+            if profile:
+                calcProfiler.record(CAT_RUNTIME, runTime, runTime, time.perf_counter() - phaseStart)
+
         # Recursive command ships (A <-> B) get marked as calculated, which means that they aren't recalced when changing
         # tabs. See GH issue 1193
-        if type == CalcType.COMMAND and targetFit in self.commandFits:
+        if type == CalcType.COMMAND and targetFit.__linkedFit in self.commandFits:
             pyfalog.debug("{} is in the command listing for COMMAND ({}), do not mark self as calculated (recursive)".format(repr(targetFit), repr(self)))
         else:
             self.__calculated = True
 
         # Only apply projected fits if fit it not projected itself.
-        if type == CalcType.LOCAL:
-            for fit in self.projectedFits:
-                projInfo = fit.getProjectionInfo(self.ID)
+        if type == CalcType.LOCAL and self.__linkProjectedFits:
+            for fit in linkedFit.projectedFits:
+                projInfo = fit.getProjectionInfo(linkedFit.ID)
                 if projInfo.active:
-                    if fit == self:
+                    if fit == linkedFit:
                         # If doing self projection, no need to run through the recursion process. Simply run the
                         # projection effects on ourselves
                         pyfalog.debug("Running self-projection for {0}", repr(self))
@@ -1052,20 +1140,46 @@ class Fit:
         To support a simpler way of doing self projections (so that we don't have to make a copy of the fit and
         recalculate), this function was developed to be a common source of projected effect application.
         """
-        for item in chain(self.drones, self.fighters):
-            if item is not None:
-                # apply effects onto target fit x amount of times
-                for _ in range(projectionInfo.amount):
-                    targetFit.register(item, origin=self)
-                    item.calculateModifiedAttributes(
-                            targetFit, runTime, forceProjected=True,
-                            forcedProjRange=0)
-        for mod in self.modules:
-            for _ in range(projectionInfo.amount):
-                targetFit.register(mod, origin=self)
-                mod.calculateModifiedAttributes(
-                        targetFit, runTime, forceProjected=True,
-                        forcedProjRange=projectionInfo.projectionRange)
+        # Effects are run once per item, and target fit applies whatever they do
+        # as many times as the fit is projected
+        try:
+            for item in chain(self.drones, self.fighters):
+                if item is not None:
+                    self.__runProjectedItem(item, runTime, targetFit, 0, projectionInfo.amount)
+            for mod in self.__getProjectingModules(runTime):
+                self.__runProjectedItem(mod, runTime, targetFit, projectionInfo.projectionRange, projectionInfo.amount)
+        finally:
+            # Local effects which run later must not be multiplied
+            targetFit.__modifierAmount = 1
+
+    def __getProjectingModules(self, runTime):
+        # Only a few modules have projected effects; they are found once per
+        # calculation of this fit and then reused for every fit it projects onto
+        try:
+            return self.__projectingModules[runTime]
+        except KeyError:
+            pass
+        modules = self.__projectingModules[runTime] = [
+            mod for mod in self.modules
+            if mod.item is not None and any(
+                effect.runTime == runTime and effect.isType("projected")
+                for effect in mod.item.effects.values())]
+        return modules
+
+    def __runProjectedItem(self, item, runTime, targetFit, projectionRange, amount):
+        targetFit.register(item, origin=self, amount=amount)
+        # Attribute modifications take amount into account on their own, while
+        # reps, drains and ECM jams added by effects are repeated here
+        projectionLists = (
+            targetFit._hullRr, targetFit._armorRr, targetFit._armorRrPreSpool, targetFit._armorRrFullSpool,
+            targetFit._shieldRr, targetFit.__extraDrains, targetFit.__ecmProjectedList)
+        sizes = [len(l) for l in projectionLists]
+        item.calculateModifiedAttributes(targetFit, runTime, forceProjected=True, forcedProjRange=projectionRange)
+        if amount > 1:
+            for projectionList, size in zip(projectionLists, sizes):
+                added = projectionList[size:]
+                if added:
+                    projectionList.extend(added * (amount - 1))
 
     def fill(self):
         """
@@ -1434,6 +1548,10 @@ class Fit:
         else:
             tMax *= 1000
         if len(drains) > 0:
+            # Profiling can be toggled from another thread meanwhile
+            profile = calcProfiler.enabled
+            if profile:
+                capSimStart = time.perf_counter()
             sim = capSim.CapSimulator()
             sim.init(drains)
             sim.capacitorCapacity = self.ship.getModifiedItemAttr("capacitorCapacity")
@@ -1445,6 +1563,8 @@ class Fit:
             sim.reload = self.factorReload
             sim.optimize_repeats = optimizeRepeats
             sim.run()
+            if profile:
+                calcProfiler.record(CAT_CAPSIM, self.ID, self.name, time.perf_counter() - capSimStart)
             # We do not want to store partial results
             if not sim.result_optimized_repeats:
                 self.__savedCapSimData[startingCap] = sim.saved_changes
@@ -1813,10 +1933,46 @@ class Fit:
 
 
     def __deepcopy__(self, memo=None):
+        fitCopy = self.__copyState(scratch=False)
+        # Infos are set on the copy's side of associations. Collections of
+        # linked fits are keyed by copy's ID, which is assigned only when copy
+        # gets saved - those fits have to be refreshed afterwards
+        for fit in self.commandFits:
+            fitCopy.commandFitDict[fit.ID] = fit
+            fitCopy.boostedOf[fit.ID].active = self.boostedOf[fit.ID].active
+        for fit in self.projectedFits:
+            fitCopy.projectedFitDict[fit.ID] = fit
+            originalProjectionInfo = self.victimOf[fit.ID]
+            copyProjectionInfo = fitCopy.victimOf[fit.ID]
+            copyProjectionInfo.active = originalProjectionInfo.active
+            copyProjectionInfo.amount = originalProjectionInfo.amount
+            copyProjectionInfo.projectionRange = originalProjectionInfo.projectionRange
+        return fitCopy
+
+    def scratchCopy(self, projectedFits=True):
+        """
+        Return copy of fit which is kept out of database session, meant for
+        evaluating variants of the fit which are never saved. Gamedata items
+        are shared with this fit. Fits boosting this fit boost the copy too,
+        and so do fits projected onto it unless projectedFits is False; copy
+        itself does not project onto or boost anything.
+        """
+        fitCopy = self.__copyState(scratch=True)
+        fitCopy.__linkSource = self.__linkedFit
+        fitCopy.__linkProjectedFits = projectedFits
+        return fitCopy
+
+    def __copyState(self, scratch):
         fitCopy = Fit()
         # Character and owner are not copied
-        fitCopy.character = self.__character
-        fitCopy.owner = self.owner
+        if scratch:
+            # Regular assignment would append copy to their fit lists, and
+            # it would get into session along with them
+            set_committed_value(fitCopy, '_Fit__character', self.__character)
+            set_committed_value(fitCopy, 'owner', self.owner)
+        else:
+            fitCopy.character = self.__character
+            fitCopy.owner = self.owner
         fitCopy.ship = deepcopy(self.ship)
         fitCopy.mode = deepcopy(self.mode)
         fitCopy.name = "%s copy" % self.name
@@ -1842,30 +1998,6 @@ class Fit:
             c = getattr(fitCopy, name)
             for i in orig:
                 c.append(deepcopy(i))
-
-        # this bit is required -- see GH issue # 83
-        def forceUpdateSavedata(fit):
-            eos.db.saveddata_session.flush()
-            eos.db.saveddata_session.refresh(fit)
-
-        for fit in self.commandFits:
-            fitCopy.commandFitDict[fit.ID] = fit
-            forceUpdateSavedata(fit)
-            copyCommandInfo = fit.getCommandInfo(fitCopy.ID)
-            originalCommandInfo = fit.getCommandInfo(self.ID)
-            copyCommandInfo.active = originalCommandInfo.active
-            forceUpdateSavedata(fit)
-
-        for fit in self.projectedFits:
-            fitCopy.projectedFitDict[fit.ID] = fit
-            forceUpdateSavedata(fit)
-            copyProjectionInfo = fit.getProjectionInfo(fitCopy.ID)
-            originalProjectionInfo = fit.getProjectionInfo(self.ID)
-            copyProjectionInfo.active = originalProjectionInfo.active
-            copyProjectionInfo.amount = originalProjectionInfo.amount
-            copyProjectionInfo.projectionRange = originalProjectionInfo.projectionRange
-            forceUpdateSavedata(fit)
-
         return fitCopy
 
     def __repr__(self):
@@ -0,0 +1,74 @@
+# ===============================================================================
+# Copyright (C) 2011 Anton Vorobyov
+#
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+class FitStats:
+    """
+    Stored summary of main fit stats, for places where fits are listed
+    without being loaded and calculated. Summary is tied to state it was
+    calculated for, and is valid only as long as that state stays the same.
+    """
+
+    def __init__(self, fitID):
+        self.fitID = fitID
+        self.fitModified = None
+        self.characterID = None
+        self.gamedataVersion = None
+        self.dps = 0
+        self.volley = 0
+        self.ehp = 0
+        self.maxSpeed = 0
+        self.capStable = False
+        self.capState = 0
+        self.price = 0
+
+    def isValid(self, fitModified, characterID, gamedataVersion):
+        return (
+            self.fitModified == fitModified and
+            self.characterID == characterID and
+            self.gamedataVersion == gamedataVersion)
+
+    def update(self, fit, fitModified, gamedataVersion):
+        self.fitModified = fitModified
+        self.characterID = fit.characterID
+        self.gamedataVersion = gamedataVersion
+        self.dps = fit.getTotalDps().total
+        self.volley = fit.getTotalVolley().total
+        self.ehp = sum(fit.ehp.values())
+        self.maxSpeed = fit.maxSpeed
+        self.capStable = bool(fit.capStable)
+        self.capState = fit.capState
+        self.price = self.__getPrice(fit)
+
+    @staticmethod
+    def __getPrice(fit):
+        # Only prices which were fetched already are used, summary does not wait for network
+        price = fit.ship.item.price.price
+        for module in fit.modules:
+            if not module.isEmpty:
+                price += module.item.price.price
+        for drone in fit.drones:
+            price += drone.item.price.price * drone.amount
+        for fighter in fit.fighters:
+            price += fighter.item.price.price * fighter.amount
+        return price
+
+    def __repr__(self):
+        return "FitStats(fitID={}, dps={:.1f}, ehp={:.0f}, price={:.0f})".format(
+            self.fitID, self.dps, self.ehp, self.price)
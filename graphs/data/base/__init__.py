@@ -17,7 +17,8 @@
 # along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
 # =============================================================================
 
-from .cache import FitDataCache
+from .cache import FitDataCache, PlotDataCache
 from .defs import XDef, YDef, VectorDef, Input, InputCheckbox
-from .getter import PointGetter, SmoothPointGetter
+from .getter import CalcInterrupted, PointGetter, SmoothPointGetter, checkInterrupted, interruptibleBy
 from .graph import FitGraph
+from .timeSeries import TimeSeries
@@ -18,6 +18,9 @@
 # =============================================================================
 
 
+from collections import OrderedDict
+
+
 class FitDataCache:
 
     def __init__(self):
@@ -29,3 +32,74 @@ class FitDataCache:
 
     def clearAll(self):
         self._data.clear()
+
+
+class PlotDataCache:
+    """
+    LRU cache of plot data, bounded by estimated size of data it holds.
+    Values are stored with their size, which is provided by caller.
+    """
+
+    def __init__(self, maxSize):
+        self.maxSize = maxSize
+        self.size = 0
+        # Format: {key: (value, size)}, least recently used first
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        try:
+            value, _ = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key, default=None):
+        """Get value without affecting statistics and eviction order."""
+        try:
+            return self._data[key][0]
+        except KeyError:
+            return default
+
+    def set(self, key, value, size):
+        self.remove(key)
+        self._data[key] = (value, size)
+        self.size += size
+        while self.size > self.maxSize and len(self._data) > 1:
+            _, (_, evictedSize) = self._data.popitem(last=False)
+            self.size -= evictedSize
+            self.evictions += 1
+
+    def remove(self, key):
+        try:
+            _, size = self._data.pop(key)
+        except KeyError:
+            return
+        self.size -= size
+
+    def removeWhere(self, predicate):
+        for key in [k for k in self._data if predicate(k)]:
+            self.remove(key)
+
+    def clearAll(self):
+        self._data.clear()
+        self.size = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def getStats(self):
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._data),
+            'size': self.size,
+            'maxSize': self.maxSize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRate': self.hits / total if total else 0,
+            'evictions': self.evictions}
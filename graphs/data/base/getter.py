@@ -19,7 +19,33 @@
 
 
 import math
+import threading
 from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
+
+
+class CalcInterrupted(Exception):
+    """Raised by point loops when results they calculate are not needed anymore."""
+
+
+_interruptState = threading.local()
+
+
+@contextmanager
+def interruptibleBy(check):
+    """Point loops run by this thread within the block stop once check() is true."""
+    prevCheck = getattr(_interruptState, 'check', None)
+    _interruptState.check = check
+    try:
+        yield
+    finally:
+        _interruptState.check = prevCheck
+
+
+def checkInterrupted():
+    check = getattr(_interruptState, 'check', None)
+    if check is not None and check():
+        raise CalcInterrupted
 
 
 class PointGetter(metaclass=ABCMeta):
@@ -35,13 +61,31 @@ class PointGetter(metaclass=ABCMeta):
     def getPoint(self, x, miscParams, src, tgt):
         raise NotImplementedError
 
+    def getCoarseRange(self, xRange, miscParams, src, tgt):
+        """Quick low-resolution preview of range; None if getter has none."""
+        return None
+
 
 class SmoothPointGetter(PointGetter, metaclass=ABCMeta):
 
     _baseResolution = 200
     _extraDepth = 0
+    # Amount of ranges between points used for previews
+    _coarseResolution = 20
 
     def getRange(self, xRange, miscParams, src, tgt):
+        return self._getRange(
+            xRange=xRange, miscParams=miscParams, src=src, tgt=tgt,
+            resolution=self._baseResolution, extraDepth=self._extraDepth)
+
+    def getCoarseRange(self, xRange, miscParams, src, tgt):
+        if self._coarseResolution >= self._baseResolution:
+            return None
+        return self._getRange(
+            xRange=xRange, miscParams=miscParams, src=src, tgt=tgt,
+            resolution=self._coarseResolution, extraDepth=0)
+
+    def _getRange(self, xRange, miscParams, src, tgt, resolution, extraDepth):
         xs = []
         ys = []
         commonData = self._getCommonData(miscParams=miscParams, src=src, tgt=tgt)
@@ -50,6 +94,7 @@ class SmoothPointGetter(PointGetter, metaclass=ABCMeta):
             if depth <= 0 or y1 == y2:
                 return
             newX = (x1 + x2) / 2
+            checkInterrupted()
             newY = self._calculatePoint(x=newX, miscParams=miscParams, src=src, tgt=tgt, commonData=commonData)
             addExtraPoints(x1=prevX, y1=prevY, x2=newX, y2=newY, depth=depth - 1)
             xs.append(newX)
@@ -59,12 +104,13 @@ class SmoothPointGetter(PointGetter, metaclass=ABCMeta):
         prevX = None
         prevY = None
         # Go through X points defined by our resolution setting
-        for x in self._xIterLinear(xRange):
+        for x in self._xIterLinear(xRange, resolution=resolution):
+            checkInterrupted()
             y = self._calculatePoint(x=x, miscParams=miscParams, src=src, tgt=tgt, commonData=commonData)
             if prevX is not None and prevY is not None:
                 # And if Y values of adjacent data points are not equal, add extra points
                 # depending on extra depth setting
-                addExtraPoints(x1=prevX, y1=prevY, x2=x, y2=y, depth=self._extraDepth)
+                addExtraPoints(x1=prevX, y1=prevY, x2=x, y2=y, depth=extraDepth)
             prevX = x
             prevY = y
             xs.append(x)
@@ -75,16 +121,18 @@ class SmoothPointGetter(PointGetter, metaclass=ABCMeta):
         commonData = self._getCommonData(miscParams=miscParams, src=src, tgt=tgt)
         return self._calculatePoint(x=x, miscParams=miscParams, src=src, tgt=tgt, commonData=commonData)
 
-    def _xIterLinear(self, xRange):
+    def _xIterLinear(self, xRange, resolution=None):
+        if resolution is None:
+            resolution = self._baseResolution
         xLow = min(xRange)
         xHigh = max(xRange)
         # Resolution defines amount of ranges between points here,
         # not amount of points
-        step = (xHigh - xLow) / self._baseResolution
+        step = (xHigh - xLow) / resolution
         if step == 0 or math.isnan(step):
             yield xLow
         else:
-            for i in range(self._baseResolution + 1):
+            for i in range(resolution + 1):
                 yield xLow + step * i
 
     def _getCommonData(self, miscParams, src, tgt):
@@ -19,11 +19,22 @@
 
 
 import math
+import threading
 from abc import ABCMeta, abstractmethod
 from collections import OrderedDict
 
 from eos.utils.float import floatUnerr
 from service.const import GraphCacheCleanupReason
+from service.fit import Fit
+from .cache import PlotDataCache
+
+
+# Cache sizes are in bytes, per-entry sizes are rough estimates
+PLOT_CACHE_SIZE = 32 * 1024 ** 2
+POINT_CACHE_SIZE = 1024 ** 2
+ENTRY_OVERHEAD = 512
+POINT_SIZE = 32
+_missing = object()
 
 
 class FitGraph(metaclass=ABCMeta):
@@ -38,11 +49,19 @@ class FitGraph(metaclass=ABCMeta):
         FitGraph.views.append(cls)
         FitGraph.viewMap[cls.internalName] = cls
 
-    def __init__(self):
-        # Format: {(fit ID, target type, target ID): {(xSpec, ySpec): (xs, ys)}}
-        self._plotCache = {}
-        # Format: {(fit ID, target type, target ID): {(xSpec, ySpec): {x: y}}}
-        self._pointCache = {}
+    # Plot data of all graphs is kept in shared caches, keyed by graph, full
+    # set of inputs and revisions of fits involved. Format:
+    # {(graph name, fit ID, target type, target ID, ySpec, xSpec, inputs, revisions): (xs, ys)}
+    _plotCache = PlotDataCache(maxSize=PLOT_CACHE_SIZE)
+    # Format: {(graph name, fit ID, target type, target ID, ySpec, xSpec, inputs, revisions, x): y}
+    _pointCache = PlotDataCache(maxSize=POINT_CACHE_SIZE)
+    # Caches are shared between main thread and graph worker thread, this
+    # lock is held only while they are accessed. Calculations themselves hold
+    # fit lock of fit service instead, which keeps fits intact meanwhile
+    cacheLock = threading.Lock()
+    # Incremented on every cache cleanup; calculation started before cleanup
+    # might have used data which was cleaned up, and its results are not stored
+    _cacheGeneration = 0
 
     @property
     @abstractmethod
@@ -93,66 +112,94 @@ class FitGraph(metaclass=ABCMeta):
     tgtExtraCols = ()
     usesHpEffectivity = False
 
-    def getPlotPoints(self, mainInput, miscInputs, xSpec, ySpec, src, tgt=None):
-        cacheKey = self._makeCacheKey(src=src, tgt=tgt)
-        try:
-            plotData = self._plotCache[cacheKey][(ySpec, xSpec)]
-        except KeyError:
-            plotData = self._calcPlotPoints(
-                mainInput=mainInput, miscInputs=miscInputs,
-                xSpec=xSpec, ySpec=ySpec, src=src, tgt=tgt)
-            self._plotCache.setdefault(cacheKey, {})[(ySpec, xSpec)] = plotData
-        return plotData
+    def getPlotPoints(self, mainInput, miscInputs, xSpec, ySpec, src, tgt=None, coarse=False):
+        """
+        Return plot data for passed inputs. When coarse preview is requested,
+        it is never cached, and None is returned if graph cannot provide it.
+        """
+        with Fit.getInstance().fitLock:
+            if coarse:
+                return self._calcPlotPoints(
+                    mainInput=mainInput, miscInputs=miscInputs,
+                    xSpec=xSpec, ySpec=ySpec, src=src, tgt=tgt, coarse=True)
+            cacheKey = self._makeCacheKey(src=src, tgt=tgt) + (ySpec, xSpec, (mainInput, tuple(miscInputs)), self._getRevisions(src, tgt))
+            with self.cacheLock:
+                plotData = self._plotCache.get(cacheKey)
+                generation = FitGraph._cacheGeneration
+            if plotData is None:
+                plotData = self._calcPlotPoints(
+                    mainInput=mainInput, miscInputs=miscInputs,
+                    xSpec=xSpec, ySpec=ySpec, src=src, tgt=tgt)
+                xs, ys = plotData
+                self.__store(self._plotCache, cacheKey, plotData, ENTRY_OVERHEAD + POINT_SIZE * (len(xs) + len(ys)), generation)
+            return plotData
+
+    def getCachedPlotPoints(self, mainInput, miscInputs, xSpec, ySpec, src, tgt=None):
+        cacheKey = self._makeCacheKey(src=src, tgt=tgt) + (ySpec, xSpec, (mainInput, tuple(miscInputs)), self._getRevisions(src, tgt))
+        with self.cacheLock:
+            return self._plotCache.get(cacheKey)
 
     def getPoint(self, x, miscInputs, xSpec, ySpec, src, tgt=None):
-        cacheKey = self._makeCacheKey(src=src, tgt=tgt)
-        try:
-            y = self._pointCache[cacheKey][(ySpec, xSpec)][x]
-        except KeyError:
-            y = self._calcPoint(x=x, miscInputs=miscInputs, xSpec=xSpec, ySpec=ySpec, src=src, tgt=tgt)
-            self._pointCache.setdefault(cacheKey, {}).setdefault((ySpec, xSpec), {})[x] = y
-        return y
+        with Fit.getInstance().fitLock:
+            cacheKey = self._makeCacheKey(src=src, tgt=tgt) + (ySpec, xSpec, tuple(miscInputs), self._getRevisions(src, tgt), x)
+            with self.cacheLock:
+                y = self._pointCache.get(cacheKey, default=_missing)
+                generation = FitGraph._cacheGeneration
+            if y is _missing:
+                y = self._calcPoint(x=x, miscInputs=miscInputs, xSpec=xSpec, ySpec=ySpec, src=src, tgt=tgt)
+                self.__store(self._pointCache, cacheKey, y, ENTRY_OVERHEAD + POINT_SIZE, generation)
+            return y
+
+    def __store(self, cache, cacheKey, value, size, generation):
+        with self.cacheLock:
+            if generation == FitGraph._cacheGeneration:
+                cache.set(cacheKey, value, size=size)
+
+    @classmethod
+    def getCacheStats(cls):
+        with cls.cacheLock:
+            return {'plot': cls._plotCache.getStats(), 'point': cls._pointCache.getStats()}
 
     def clearCache(self, reason, extraData=None):
-        caches = (self._plotCache, self._pointCache)
-        plotKeysToClear = set()
-        # If fit changed - clear plots which concern this fit
-        if reason in (GraphCacheCleanupReason.fitChanged, GraphCacheCleanupReason.fitRemoved):
-            for cache in caches:
-                for cacheKey in cache:
-                    cacheFitID, cacheTgtType, cacheTgtID = cacheKey
-                    if extraData == cacheFitID:
-                        plotKeysToClear.add(cacheKey)
-                    elif cacheTgtType == 'fit' and extraData == cacheTgtID:
-                        plotKeysToClear.add(cacheKey)
+        with self.cacheLock:
+            FitGraph._cacheGeneration += 1
+            self._clearCache(reason, extraData)
+        # Internal caches are filled by calculations as they go
+        with Fit.getInstance().fitLock:
+            self._clearInternalCache(reason, extraData)
+
+    def _clearCache(self, reason, extraData):
+        # Cache keys contain all inputs, so those do not need cleanup; graph
+        # switch keeps data of previous graph around in case user goes back
+        if reason in (GraphCacheCleanupReason.inputChanged, GraphCacheCleanupReason.graphSwitched):
+            predicate = None
+        # If fit changed - clear plots which concern this fit. Revisions take
+        # care of it too, but there is no point in keeping outdated data around
+        elif reason in (GraphCacheCleanupReason.fitChanged, GraphCacheCleanupReason.fitRemoved):
+            def predicate(cacheKey):
+                _, cacheFitID, cacheTgtType, cacheTgtID = cacheKey[:4]
+                return extraData == cacheFitID or (cacheTgtType == 'fit' and extraData == cacheTgtID)
         # Same for profile
         elif reason in (GraphCacheCleanupReason.profileChanged, GraphCacheCleanupReason.profileRemoved):
-            for cache in caches:
-                for cacheKey in cache:
-                    cacheFitID, cacheTgtType, cacheTgtID = cacheKey
-                    if cacheTgtType == 'profile' and extraData == cacheTgtID:
-                        plotKeysToClear.add(cacheKey)
+            def predicate(cacheKey):
+                _, cacheFitID, cacheTgtType, cacheTgtID = cacheKey[:4]
+                return cacheTgtType == 'profile' and extraData == cacheTgtID
         # Target fit resist mode changed
         elif reason == GraphCacheCleanupReason.resistModeChanged:
-            for cache in caches:
-                for cacheKey in cache:
-                    cacheFitID, cacheTgtType, cacheTgtID = cacheKey
-                    if cacheTgtType == 'fit' and extraData == cacheTgtID:
-                        plotKeysToClear.add(cacheKey)
-        # Wipe out whole plot cache otherwise
+            def predicate(cacheKey):
+                _, cacheFitID, cacheTgtType, cacheTgtID = cacheKey[:4]
+                return cacheTgtType == 'fit' and extraData == cacheTgtID
+        # Wipe out plots of all graphs otherwise. Graph options are shared by
+        # graphs, and HP effectivity is switched on all of them at once, while
+        # neither is part of cache key
         else:
-            for cache in caches:
-                for cacheKey in cache:
-                    plotKeysToClear.add(cacheKey)
+            for cache in (self._plotCache, self._pointCache):
+                cache.clearAll()
+            return
         # Do actual cleanup
-        for cache in caches:
-            for cacheKey in plotKeysToClear:
-                try:
-                    del cache[cacheKey]
-                except KeyError:
-                    pass
-        # Process any internal caches graphs might have
-        self._clearInternalCache(reason, extraData)
+        if predicate is not None:
+            for cache in (self._plotCache, self._pointCache):
+                cache.removeWhere(predicate)
 
     def _makeCacheKey(self, src, tgt):
         if tgt is not None and tgt.isFit:
@@ -164,21 +211,33 @@ class FitGraph(metaclass=ABCMeta):
         else:
             tgtType = None
             tgtItemID = None
-        cacheKey = (src.item.ID, tgtType, tgtItemID)
+        cacheKey = (self.internalName, src.item.ID, tgtType, tgtItemID)
         return cacheKey
 
+    @staticmethod
+    def _getRevisions(src, tgt):
+        # Each change to fit is followed by its recalc, amount of recalcs
+        # tells us if cached data might be outdated
+        scheduler = Fit.getInstance().recalcScheduler
+        srcRevision = scheduler.getRecalcCount(src.item.ID)
+        tgtRevision = scheduler.getRecalcCount(tgt.item.ID) if tgt is not None and tgt.isFit else None
+        return srcRevision, tgtRevision
+
     def _clearInternalCache(self, reason, extraData):
         return
 
     # Calculation stuff
-    def _calcPlotPoints(self, mainInput, miscInputs, xSpec, ySpec, src, tgt):
+    def _calcPlotPoints(self, mainInput, miscInputs, xSpec, ySpec, src, tgt, coarse=False):
         mainParamRange = self._normalizeMain(mainInput=mainInput, src=src, tgt=tgt)
         miscParams = self._normalizeMisc(miscInputs=miscInputs, src=src, tgt=tgt)
         mainParamRange = self._limitMain(mainParamRange=mainParamRange, src=src, tgt=tgt)
         miscParams = self._limitMisc(miscParams=miscParams, src=src, tgt=tgt)
-        xs, ys = self._getPlotPoints(
+        plotData = self._getPlotPoints(
             xRange=mainParamRange[1], miscParams=miscParams,
-            xSpec=xSpec, ySpec=ySpec, src=src, tgt=tgt)
+            xSpec=xSpec, ySpec=ySpec, src=src, tgt=tgt, coarse=coarse)
+        if plotData is None:
+            return None
+        xs, ys = plotData
         ys = self._denormalizeValues(values=ys, axisSpec=ySpec, src=src, tgt=tgt)
         # Sometimes x denormalizer may fail (e.g. during conversion of 0 ship speed to %).
         # If both inputs and outputs are in %, do some extra processing to at least have
@@ -264,13 +323,15 @@ class FitGraph(metaclass=ABCMeta):
 
     _getters = {}
 
-    def _getPlotPoints(self, xRange, miscParams, xSpec, ySpec, src, tgt):
+    def _getPlotPoints(self, xRange, miscParams, xSpec, ySpec, src, tgt, coarse=False):
         try:
             getterClass = self._getters[(xSpec.handle, ySpec.handle)]
         except KeyError:
-            return [], []
+            return None if coarse else ([], [])
         else:
             getter = getterClass(graph=self)
+            if coarse:
+                return getter.getCoarseRange(xRange=xRange, miscParams=miscParams, src=src, tgt=tgt)
             return getter.getRange(xRange=xRange, miscParams=miscParams, src=src, tgt=tgt)
 
     def _getPoint(self, x, miscParams, xSpec, ySpec, src, tgt):
@@ -0,0 +1,87 @@
+# =============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# =============================================================================
+
+
+import numpy as np
+
+from eos.utils.float import floatUnerr
+
+
+class TimeSeries:
+    """
+    Values of multiple keys (modules, drones, fighter abilities) changing
+    over time. Every key stores only times at which its value changes,
+    in sorted array, so value at arbitrary time is found via binary search
+    and memory stays proportional to amount of changes.
+    """
+
+    def __init__(self, pointsPerKey):
+        # Format: {key: array of change times}, with float error rounded off
+        self.__keyTimes = {}
+        # Format: {key: [value since change time]}
+        self.__keyValues = {}
+        # Format: {time: {key: new value}}
+        changesByTime = {}
+        for key, points in pointsPerKey.items():
+            times = sorted(points)
+            if not times:
+                continue
+            self.__keyTimes[key] = np.array([floatUnerr(t) for t in times], dtype=np.float64)
+            self.__keyValues[key] = [points[t] for t in times]
+            for time in times:
+                changesByTime.setdefault(time, {})[key] = points[time]
+        self.times = np.array(sorted(changesByTime), dtype=np.float64)
+        self.__changes = [changesByTime[t] for t in sorted(changesByTime)]
+
+    @classmethod
+    def fromPoints(cls, pointsPerKey):
+        """Make series out of {key: {time: value since that time}} map."""
+        return cls(pointsPerKey)
+
+    @classmethod
+    def fromIncrements(cls, incrementsPerKey):
+        """
+        Make series out of {key: {time: value added at that time}} map,
+        values of series are running totals for each key.
+        """
+        pointsPerKey = {}
+        for key, increments in incrementsPerKey.items():
+            points = pointsPerKey[key] = {}
+            total = None
+            for time in sorted(increments):
+                total = increments[time] if total is None else total + increments[time]
+                points[time] = total
+        return cls(pointsPerKey)
+
+    def getDataPoint(self, time):
+        """Return values by specified time in {key: value} format."""
+        time = floatUnerr(time)
+        data = {}
+        for key, keyTimes in self.__keyTimes.items():
+            index = int(np.searchsorted(keyTimes, time, side='right')) - 1
+            if index >= 0:
+                data[key] = self.__keyValues[key][index]
+        return data
+
+    def iterChanges(self):
+        """Iterate over (time, {key: new value}) in time order."""
+        return zip(self.times.tolist(), self.__changes)
+
+    def __len__(self):
+        return len(self.__changes)
@@ -20,11 +20,17 @@
 
 import math
 
-from graphs.data.base import SmoothPointGetter
+from graphs.data.base import SmoothPointGetter, checkInterrupted
 
 
 class Time2CapAmountGetter(SmoothPointGetter):
 
+    def getCoarseRange(self, xRange, miscParams, src, tgt):
+        # Regen-only preview would look nothing like cap sim graph
+        if miscParams['useCapsim']:
+            return None
+        return super().getCoarseRange(xRange=xRange, miscParams=miscParams, src=src, tgt=tgt)
+
     def getRange(self, xRange, miscParams, src, tgt):
         # Use smooth getter when we're not using cap sim
         if not miscParams['useCapsim']:
@@ -80,6 +86,7 @@ class Time2CapAmountGetter(SmoothPointGetter):
         xs.append(prevTime)
         ys.append(prevCap)
         for currentTime in sorted(capSimDataInRange):
+            checkInterrupted()
             if currentTime > prevTime:
                 plotCapRegen(prevTime=prevTime, prevCap=prevCap, currentTime=currentTime)
             currentCap = capSimDataInRange[currentTime]
@@ -18,27 +18,25 @@
 # =============================================================================
 
 
-from copy import copy
-
 from eos.utils.float import floatUnerr
 from eos.utils.spoolSupport import SpoolOptions, SpoolType
 from eos.utils.stats import DmgTypes
-from graphs.data.base import FitDataCache
+from graphs.data.base import FitDataCache, TimeSeries
 
 
 class TimeCache(FitDataCache):
 
     # Whole data getters
     def getDpsData(self, src):
-        """Return DPS data in {time: {key: dps}} format."""
+        """Return DPS data as time series of {key: dps}."""
         return self._data[src.item.ID]['finalDps']
 
     def getVolleyData(self, src):
-        """Return volley data in {time: {key: volley}} format."""
+        """Return volley data as time series of {key: volley}."""
         return self._data[src.item.ID]['finalVolley']
 
     def getDmgData(self, src):
-        """Return inflicted damage data in {time: {key: damage}} format."""
+        """Return inflicted damage data as time series of {key: damage}."""
         return self._data[src.item.ID]['finalDmg']
 
     # Specific data point getters
@@ -71,24 +69,9 @@ class TimeCache(FitDataCache):
         # Final cache has been generated already, don't do anything
         if 'finalDmg' in fitCache:
             return
-        intCache = fitCache['internalDmg']
-        changesByTime = {}
-        for key, dmgMap in intCache.items():
-            for time in dmgMap:
-                changesByTime.setdefault(time, []).append(key)
-        # Here we convert cache to following format:
-        # {time: {key: damage done by key at this time}}
-        finalCache = fitCache['finalDmg'] = {}
-        timeDmgData = {}
-        for time in sorted(changesByTime):
-            timeDmgData = copy(timeDmgData)
-            for key in changesByTime[time]:
-                keyDmg = intCache[key][time]
-                if key in timeDmgData:
-                    timeDmgData[key] = timeDmgData[key] + keyDmg
-                else:
-                    timeDmgData[key] = keyDmg
-            finalCache[time] = timeDmgData
+        # Here we convert cache to time series of total damage done by
+        # each key by given time
+        fitCache['finalDmg'] = TimeSeries.fromIncrements(fitCache['internalDmg'])
         # We do not need internal cache once we have final
         del fitCache['internalDmg']
 
@@ -127,25 +110,11 @@ class TimeCache(FitDataCache):
                 prevTimeEnd = timeEnd
         # We have data in another form, do not need old one any longer
         del fitCache['internalDpsVolley']
-        changesByTime = {}
-        for key, dmgMap in pointCache.items():
-            for time in dmgMap:
-                changesByTime.setdefault(time, []).append(key)
-        # Here we convert cache to following format:
-        # {time: {key: (dps, volley}}
-        finalDpsCache = fitCache['finalDps'] = {}
-        finalVolleyCache = fitCache['finalVolley'] = {}
-        timeDpsData = {}
-        timeVolleyData = {}
-        for time in sorted(changesByTime):
-            timeDpsData = copy(timeDpsData)
-            timeVolleyData = copy(timeVolleyData)
-            for key in changesByTime[time]:
-                dps, volley = pointCache[key][time]
-                timeDpsData[key] = dps
-                timeVolleyData[key] = volley
-            finalDpsCache[time] = timeDpsData
-            finalVolleyCache[time] = timeVolleyData
+        # Here we convert cache to time series of dps and volley of each key
+        fitCache['finalDps'] = TimeSeries.fromPoints(
+            {k: {t: v[0] for t, v in points.items()} for k, points in pointCache.items()})
+        fitCache['finalVolley'] = TimeSeries.fromPoints(
+            {k: {t: v[1] for t, v in points.items()} for k, points in pointCache.items()})
 
     def _generateInternalForm(self, src, maxTime):
         if self._isTimeCacheValid(src=src, maxTime=maxTime):
@@ -244,11 +213,4 @@ class TimeCache(FitDataCache):
         return maxTime <= cacheMaxTime
 
     def _getDataPoint(self, src, time, dataFunc):
-        data = dataFunc(src)
-        timesBefore = [t for t in data if floatUnerr(t) <= floatUnerr(time)]
-        try:
-            time = max(timesBefore)
-        except ValueError:
-            return {}
-        else:
-            return data[time]
+        return dataFunc(src).getDataPoint(time)
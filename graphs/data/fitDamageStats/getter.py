@@ -21,7 +21,7 @@
 import eos.config
 from eos.utils.spoolSupport import SpoolOptions, SpoolType
 from eos.utils.stats import DmgTypes
-from graphs.data.base import PointGetter, SmoothPointGetter
+from graphs.data.base import PointGetter, SmoothPointGetter, checkInterrupted
 from service.settings import GraphSettings
 from .calc.application import getApplicationPerKey
 from .calc.projected import getScramRange, getScrammables, getTackledSpeed, getSigRadiusMult
@@ -245,10 +245,14 @@ class XTimeMixin(PointGetter):
         # Custom iteration for time graph to show all data points
         currentDmg = None
         currentTime = None
-        for currentTime in sorted(timeCache):
+        # Format: {key: applied damage}, updated only for keys which change
+        dmgPerKey = {}
+        for currentTime, changedDmgData in timeCache.iterChanges():
+            checkInterrupted()
             prevDmg = currentDmg
-            currentDmgData = timeCache[currentTime]
-            currentDmg = applyDamage(dmgMap=currentDmgData, applicationMap=applicationMap, tgtResists=tgtResists).total
+            for key, dmg in changedDmgData.items():
+                dmgPerKey[key] = applyDamage(dmgMap={key: dmg}, applicationMap=applicationMap, tgtResists=tgtResists).total
+            currentDmg = sum(dmgPerKey.values())
             if currentTime < minTime:
                 continue
             # First set of data points
@@ -18,23 +18,21 @@
 # =============================================================================
 
 
-from copy import copy
-
 from eos.utils.float import floatUnerr
 from eos.utils.spoolSupport import SpoolOptions, SpoolType
 from eos.utils.stats import RRTypes
-from graphs.data.base import FitDataCache
+from graphs.data.base import FitDataCache, TimeSeries
 
 
 class TimeCache(FitDataCache):
 
     # Whole data getters
     def getRpsData(self, src, ancReload):
-        """Return RPS data in {time: {key: rps}} format."""
+        """Return RPS data as time series of {key: rps}."""
         return self._data[src.item.ID][ancReload]['finalRps']
 
     def getRepAmountData(self, src, ancReload):
-        """Return rep amount data in {time: {key: amount}} format."""
+        """Return rep amount data as time series of {key: amount}."""
         return self._data[src.item.ID][ancReload]['finalRepAmount']
 
     # Specific data point getters
@@ -79,19 +77,8 @@ class TimeCache(FitDataCache):
                 prevTimeEnd = timeEnd
         # We have data in another form, do not need old one any longer
         del fitCache['internalRps']
-        changesByTime = {}
-        for key, rpsMap in pointCache.items():
-            for time in rpsMap:
-                changesByTime.setdefault(time, []).append(key)
-        # Here we convert cache to following format:
-        # {time: {key: rps}
-        finalRpsCache = fitCache['finalRps'] = {}
-        timeRpsData = {}
-        for time in sorted(changesByTime):
-            timeRpsData = copy(timeRpsData)
-            for key in changesByTime[time]:
-                timeRpsData[key] = pointCache[key][time]
-            finalRpsCache[time] = timeRpsData
+        # Here we convert cache to time series of rps of each key
+        fitCache['finalRps'] = TimeSeries.fromPoints(pointCache)
 
     def prepareRepAmountData(self, src, ancReload, maxTime):
         # Time is none means that time parameter has to be ignored,
@@ -103,24 +90,9 @@ class TimeCache(FitDataCache):
         # Final cache has been generated already, don't do anything
         if 'finalRepAmount' in fitCache:
             return
-        intCache = fitCache['internalRepAmount']
-        changesByTime = {}
-        for key, remAmountMap in intCache.items():
-            for time in remAmountMap:
-                changesByTime.setdefault(time, []).append(key)
-        # Here we convert cache to following format:
-        # {time: {key: hp repaired by key at this time}}
-        finalCache = fitCache['finalRepAmount'] = {}
-        timeRepAmountData = {}
-        for time in sorted(changesByTime):
-            timeRepAmountData = copy(timeRepAmountData)
-            for key in changesByTime[time]:
-                keyRepAmount = intCache[key][time]
-                if key in timeRepAmountData:
-                    timeRepAmountData[key] = timeRepAmountData[key] + keyRepAmount
-                else:
-                    timeRepAmountData[key] = keyRepAmount
-            finalCache[time] = timeRepAmountData
+        # Here we convert cache to time series of total hp repaired by
+        # each key by given time
+        fitCache['finalRepAmount'] = TimeSeries.fromIncrements(fitCache['internalRepAmount'])
         # We do not need internal cache once we have final
         del fitCache['internalRepAmount']
 
@@ -208,11 +180,4 @@ class TimeCache(FitDataCache):
         return maxTime <= cacheMaxTime
 
     def _getDataPoint(self, src, ancReload, time, dataFunc):
-        data = dataFunc(src=src, ancReload=ancReload)
-        timesBefore = [t for t in data if floatUnerr(t) <= floatUnerr(time)]
-        try:
-            time = max(timesBefore)
-        except ValueError:
-            return {}
-        else:
-            return data[time]
+        return dataFunc(src=src, ancReload=ancReload).getDataPoint(time)
@@ -21,7 +21,7 @@
 import eos.config
 from eos.utils.spoolSupport import SpoolOptions, SpoolType
 from eos.utils.stats import RRTypes
-from graphs.data.base import PointGetter, SmoothPointGetter
+from graphs.data.base import PointGetter, SmoothPointGetter, checkInterrupted
 from .calc import getApplicationPerKey
 
 
@@ -120,10 +120,14 @@ class XTimeMixin(PointGetter):
         # Custom iteration for time graph to show all data points
         currentRepAmount = None
         currentTime = None
-        for currentTime in sorted(timeCache):
+        # Format: {key: applied rep amount}, updated only for keys which change
+        repAmountPerKey = {}
+        for currentTime, changedRepAmountData in timeCache.iterChanges():
+            checkInterrupted()
             prevRepAmount = currentRepAmount
-            currentRepAmountData = timeCache[currentTime]
-            currentRepAmount = applyReps(rrMap=currentRepAmountData, applicationMap=applicationMap)
+            for key, repAmount in changedRepAmountData.items():
+                repAmountPerKey[key] = applyReps(rrMap={key: repAmount}, applicationMap=applicationMap)
+            currentRepAmount = sum(repAmountPerKey.values())
             if currentTime < minTime:
                 continue
             # First set of data points
@@ -20,6 +20,7 @@
 
 from eos.const import FittingModuleState
 from graphs.data.base import FitDataCache
+from service.whatIf import FitOverrides, WhatIf
 
 
 class SubwarpSpeedCache(FitDataCache):
@@ -28,7 +29,6 @@ class SubwarpSpeedCache(FitDataCache):
         try:
             subwarpSpeed = self._data[src.item.ID]
         except KeyError:
-            modStates = {}
             disallowedGroups = (
                 # Active modules which affect ship speed and cannot be used in warp
                 'Propulsion Module',
@@ -40,43 +40,12 @@ class SubwarpSpeedCache(FitDataCache):
                 'Cynosural Field Generator',
                 'Clone Vat Bay',
                 'Jump Portal Generator')
+            modStates = {}
             for mod in src.item.activeModulesIter():
                 if mod.item is not None and mod.item.group.name in disallowedGroups:
-                    modStates[mod] = mod.state
-                    mod.state = FittingModuleState.ONLINE
-            projFitStates = {}
-            for projFit in src.item.projectedFits:
-                projectionInfo = projFit.getProjectionInfo(src.item.ID)
-                if projectionInfo is not None and projectionInfo.active:
-                    projFitStates[projectionInfo] = projectionInfo.active
-                    projectionInfo.active = False
-            projModStates = {}
-            for mod in src.item.projectedModules:
-                if not mod.isExclusiveSystemEffect and mod.state >= FittingModuleState.ACTIVE:
-                    projModStates[mod] = mod.state
-                    mod.state = FittingModuleState.ONLINE
-            projDroneStates = {}
-            for drone in src.item.projectedDrones:
-                if drone.amountActive > 0:
-                    projDroneStates[drone] = drone.amountActive
-                    drone.amountActive = 0
-            projFighterStates = {}
-            for fighter in src.item.projectedFighters:
-                if fighter.active:
-                    projFighterStates[fighter] = fighter.active
-                    fighter.active = False
-            src.item.calculateModifiedAttributes()
-            subwarpSpeed = src.getMaxVelocity()
+                    modStates[mod.position] = FittingModuleState.ONLINE
+            subwarpSpeed = WhatIf.getInstance().evaluate(
+                src.item, 'subwarpSpeed', lambda fit: fit.ship.getModifiedItemAttr('maxVelocity'),
+                FitOverrides(moduleStates=modStates, disableProjections=True))
             self._data[src.item.ID] = subwarpSpeed
-            for projInfo, state in projFitStates.items():
-                projInfo.active = state
-            for mod, state in modStates.items():
-                mod.state = state
-            for mod, state in projModStates.items():
-                mod.state = state
-            for drone, amountActive in projDroneStates.items():
-                drone.amountActive = amountActive
-            for fighter, state in projFighterStates.items():
-                fighter.active = state
-            src.item.calculateModifiedAttributes()
         return subwarpSpeed
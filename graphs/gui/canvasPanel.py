@@ -30,6 +30,7 @@ import wx
 from logbook import Logger
 
 
+from graphs.gui.worker import GraphCalcRequest
 from graphs.style import BASE_COLORS, LIGHTNESSES, STYLES, hsl_to_hsv
 from gui.utils.numberFormatter import roundToPrec
 
@@ -37,6 +38,9 @@ from gui.utils.numberFormatter import roundToPrec
 pyfalog = Logger(__name__)
 
 
+# Delay between arrival of calculated line and redraw, to batch lines together
+RENDER_DELAY = 50
+
 try:
     import matplotlib as mpl
 
@@ -101,19 +105,22 @@ class GraphCanvasPanel(wx.Panel):
         self.mplOnDragHandler = None
         self.mplOnReleaseHandler = None
 
-    def draw(self, accurateMarks=True):
-        self.subplot.clear()
-        self.subplot.grid(True)
-        allXs = set()
-        allYs = set()
-        plotData = {}
-        legendData = []
-        chosenX = self.graphFrame.ctrlPanel.xType
-        chosenY = self.graphFrame.ctrlPanel.yType
-        self.subplot.set(
-            xlabel=self.graphFrame.ctrlPanel.formatLabel(chosenX),
-            ylabel=self.graphFrame.ctrlPanel.formatLabel(chosenY))
-
+        # Current calculation request and data it has delivered so far
+        self.request = None
+        # Format: {(source, target): ((xs, ys) or None, coarse)}
+        self.lineData = {}
+        # Format: {(source, target): (color, line style)}
+        self.lineStyles = {}
+        self.renderTimer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.OnRenderTimer, self.renderTimer)
+
+    def draw(self):
+        """Request recalculation of all lines; they are rendered as they arrive."""
+        if self.request is not None:
+            self.request.cancel()
+        self.renderTimer.Stop()
+        self.lineData.clear()
+        self.lineStyles.clear()
         mainInput, miscInputs = self.graphFrame.ctrlPanel.getValues()
         view = self.graphFrame.getView()
         sources = self.graphFrame.ctrlPanel.sources
@@ -122,9 +129,8 @@ class GraphCanvasPanel(wx.Panel):
         else:
             iterList = tuple((f, None) for f in sources)
 
-        # Draw plot lines and get data for legend
+        # Get line style data
         for source, target in iterList:
-            # Get line style data
             try:
                 colorData = BASE_COLORS[source.colorID]
             except KeyError:
@@ -146,39 +152,98 @@ class GraphCanvasPanel(wx.Panel):
                     continue
                 lineStyle = lineStyleData.mplSpec
             color = hsv_to_rgb(hsl_to_hsv(color))
+            self.lineStyles[(source, target)] = (color, lineStyle)
+
+        self.request = GraphCalcRequest(
+            view=view,
+            lines=[l for l in iterList if l in self.lineStyles],
+            mainInput=mainInput,
+            miscInputs=miscInputs,
+            xSpec=self.graphFrame.ctrlPanel.xType,
+            ySpec=self.graphFrame.ctrlPanel.yType,
+            onLine=self.OnLineCalculated,
+            onDone=self.OnRequestDone)
+        self.graphFrame.calcWorker.trigger(self.request)
+
+    def cancelDraw(self):
+        if self.request is not None:
+            self.request.cancel()
+        self.renderTimer.Stop()
+
+    def OnLineCalculated(self, request, source, target, plotData, coarse):
+        self.lineData[(source, target)] = (plotData, coarse)
+        # Coalesce lines which arrive in quick succession into single render
+        if not self.renderTimer.IsRunning():
+            self.renderTimer.Start(RENDER_DELAY, True)
+
+    def OnRequestDone(self, request):
+        self.renderTimer.Stop()
+        self.render(accurateMarks=True)
+        for cacheName, stats in request.view.getCacheStats().items():
+            pyfalog.debug(
+                'Graph {} cache: {entries} entries, {size}/{maxSize} bytes, {hits} hits, '
+                '{misses} misses ({hitRate:.0%} hit rate), {evictions} evictions'.format(cacheName, **stats))
+
+    def OnRenderTimer(self, event):
+        event.Skip()
+        self.render(accurateMarks=False)
+
+    def render(self, accurateMarks=True):
+        self.subplot.clear()
+        self.subplot.grid(True)
+        request = self.request
+        if request is None:
+            self.canvas.draw()
+            self.Refresh()
+            return
+        # Accurate marks need fit lock, which worker holds while request is
+        # processed - do not block UI on it and interpolate meanwhile
+        if not request.finished:
+            accurateMarks = False
+        allXs = set()
+        allYs = set()
+        plotData = {}
+        legendData = []
+        chosenX = request.xSpec
+        chosenY = request.ySpec
+        self.subplot.set(
+            xlabel=self.graphFrame.ctrlPanel.formatLabel(chosenX),
+            ylabel=self.graphFrame.ctrlPanel.formatLabel(chosenY))
+
+        miscInputs = request.miscInputs
+        view = request.view
+        # Lines which got only preview so far
+        coarseLines = set()
 
-            # Get point data
+        # Draw plot lines and get data for legend, in the same order
+        # regardless of order in which they were calculated
+        for source, target in request.lines:
             try:
-                xs, ys = view.getPlotPoints(
-                    mainInput=mainInput,
-                    miscInputs=miscInputs,
-                    xSpec=chosenX,
-                    ySpec=chosenY,
-                    src=source,
-                    tgt=target)
-                if not self.__checkNumbers(xs, ys):
-                    pyfalog.warning('Failed to plot "{}" vs "{}" due to inf or NaN in values'.format(source.name, '' if target is None else target.name))
-                    continue
-                plotData[(source, target)] = (xs, ys)
-                allXs.update(xs)
-                allYs.update(ys)
-                # If we have single data point, show marker - otherwise line won't be shown
-                if len(xs) == 1 and len(ys) == 1:
-                    self.subplot.plot(xs, ys, color=color, linestyle=lineStyle, marker='.')
-                else:
-                    self.subplot.plot(xs, ys, color=color, linestyle=lineStyle)
-                # Fill data for legend
-                if target is None:
-                    legendData.append((color, lineStyle, source.shortName))
-                else:
-                    legendData.append((color, lineStyle, '{} vs {}'.format(source.shortName, target.shortName)))
-            except (KeyboardInterrupt, SystemExit):
-                raise
-            except Exception:
-                pyfalog.warning('Failed to plot "{}" vs "{}"'.format(source.name, '' if target is None else target.name))
-                self.canvas.draw()
-                self.Refresh()
-                return
+                lineData, coarse = self.lineData[(source, target)]
+            except KeyError:
+                continue
+            if lineData is None:
+                continue
+            color, lineStyle = self.lineStyles[(source, target)]
+            xs, ys = lineData
+            if not self.__checkNumbers(xs, ys):
+                pyfalog.warning('Failed to plot "{}" vs "{}" due to inf or NaN in values'.format(source.name, '' if target is None else target.name))
+                continue
+            if coarse:
+                coarseLines.add((source, target))
+            plotData[(source, target)] = (xs, ys)
+            allXs.update(xs)
+            allYs.update(ys)
+            # If we have single data point, show marker - otherwise line won't be shown
+            if len(xs) == 1 and len(ys) == 1:
+                self.subplot.plot(xs, ys, color=color, linestyle=lineStyle, marker='.')
+            else:
+                self.subplot.plot(xs, ys, color=color, linestyle=lineStyle)
+            # Fill data for legend
+            if target is None:
+                legendData.append((color, lineStyle, source.shortName))
+            else:
+                legendData.append((color, lineStyle, '{} vs {}'.format(source.shortName, target.shortName)))
 
         # Setting Y limits for canvas
         if self.graphFrame.ctrlPanel.showY0:
@@ -232,12 +297,12 @@ class GraphCanvasPanel(wx.Panel):
                     if minY <= val <= maxY or minY <= rounded <= maxY:
                         yMarks.add(rounded)
 
-                for source, target in iterList:
-                    xs, ys = plotData[(source, target)]
+                for (source, target), (xs, ys) in plotData.items():
                     if not xs or xMark < min(xs) or xMark > max(xs):
                         continue
-                    # Fetch values from graphs when we're asked to provide accurate data
-                    if accurateMarks:
+                    # Fetch values from graphs when we're asked to provide accurate data,
+                    # previews are not accurate anyway
+                    if accurateMarks and (source, target) not in coarseLines:
                         try:
                             y = view.getPoint(
                                 x=xMark,
@@ -288,11 +353,11 @@ class GraphCanvasPanel(wx.Panel):
     def markXApproximate(self, x):
         if x is not None:
             self.xMark = x
-            self.draw(accurateMarks=False)
+            self.render(accurateMarks=False)
 
     def unmarkX(self):
         self.xMark = None
-        self.draw()
+        self.render()
 
     @staticmethod
     def _getLimits(vals, minExtra=0, maxExtra=0):
@@ -351,4 +416,4 @@ class GraphCanvasPanel(wx.Panel):
             # sometimes when you release button, x coordinate changes. To avoid that,
             # we just re-use coordinates set on click/drag and just request to redraw
             # using accurate data
-            self.draw(accurateMarks=True)
+            self.render(accurateMarks=True)
@@ -33,6 +33,7 @@ from service.const import GraphCacheCleanupReason
 from service.settings import GraphSettings
 from . import canvasPanel
 from .ctrlPanel import GraphControlPanel
+from .worker import GraphCalcWorkerThread
 
 pyfalog = Logger(__name__)
 _t = wx.GetTranslation
@@ -54,6 +55,9 @@ class GraphFrame(AuxiliaryFrame):
 
         self.SetIcon(wx.Icon(BitmapLoader.getBitmap('graphs_small', 'gui')))
 
+        self.calcWorker = GraphCalcWorkerThread()
+        self.calcWorker.start()
+
         mainSizer = wx.BoxSizer(wx.VERTICAL)
 
         # Layout - graph selector
@@ -132,6 +136,8 @@ class GraphFrame(AuxiliaryFrame):
 
     def OnFitChanged(self, event):
         event.Skip()
+        # Whatever is being calculated now is outdated
+        self.canvasPanel.cancelDraw()
         for fitID in event.fitIDs:
             self.clearCache(reason=GraphCacheCleanupReason.fitChanged, extraData=fitID)
         self.ctrlPanel.OnFitChanged(event)
@@ -229,6 +235,8 @@ class GraphFrame(AuxiliaryFrame):
         self.mainFrame.Unbind(RESIST_MODE_CHANGED, handler=self.OnResistModeChanged)
         self.mainFrame.Unbind(GE.GRAPH_OPTION_CHANGED, handler=self.OnGraphOptionChanged)
         self.mainFrame.Unbind(GE.EFFECTIVE_HP_TOGGLED, handler=self.OnEffectiveHpToggled)
+        self.canvasPanel.cancelDraw()
+        self.calcWorker.stop()
         event.Skip()
 
     def getView(self, idx=None):
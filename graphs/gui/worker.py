@@ -0,0 +1,188 @@
+# =============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# =============================================================================
+
+
+import queue
+import threading
+import time
+
+# noinspection PyPackageRequirements
+import wx
+from logbook import Logger
+
+from graphs.data.base import CalcInterrupted, interruptibleBy
+from service.fit import Fit
+
+
+pyfalog = Logger(__name__)
+
+
+# Seconds between checks if fit changes worker has let through are done
+CHANGE_WAIT = 0.01
+
+
+class GraphCalcRequest:
+    """
+    Set of lines to calculate for single graph draw. Request is cancelled
+    by its owner as soon as inputs change; worker checks for it between points
+    of lines, and results of cancelled requests are never delivered. If any fit
+    changes while request is processed, line being calculated is dropped to let
+    the change through, and request is processed again from scratch, so that
+    all delivered lines match the same state of fits.
+    """
+
+    def __init__(self, view, lines, mainInput, miscInputs, xSpec, ySpec, onLine, onDone):
+        self.view = view
+        # Fit changes made before request, see Fit.changingFits
+        self.changeCount = Fit.getInstance().changeCount
+        # Format: [(source, target)]
+        self.lines = lines
+        self.mainInput = mainInput
+        self.miscInputs = miscInputs
+        self.xSpec = xSpec
+        self.ySpec = ySpec
+        # Called as onLine(request, source, target, plotData, coarse) on main thread,
+        # plotData is None when calculation failed
+        self.onLine = onLine
+        # Called as onDone(request) on main thread
+        self.onDone = onDone
+        self.cancelled = False
+        # Set by worker once it is done with request
+        self.finished = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    @property
+    def outdated(self):
+        sFit = Fit.getInstance()
+        return self.changeCount != sFit.changeCount or sFit.changesPending > 0
+
+    def isInterrupted(self):
+        return self.cancelled or self.outdated
+
+    def deliverLine(self, source, target, plotData, coarse):
+        if not self.cancelled:
+            self.onLine(self, source, target, plotData, coarse)
+
+    def deliverDone(self):
+        if not self.cancelled:
+            self.onDone(self)
+
+
+class GraphCalcWorkerThread(threading.Thread):
+    """
+    Calculates graph lines off main thread. Lines without cached data get
+    low-resolution preview first, then all lines are calculated in full.
+    """
+
+    def __init__(self):
+        threading.Thread.__init__(self)
+        self.name = "GraphCalcWorker"
+        self.daemon = True
+        self.queue = queue.Queue()
+        self.running = True
+
+    def run(self):
+        while self.running:
+            request = self.queue.get()
+            # Skip to the most recent request, older ones are superseded anyway
+            while not self.queue.empty():
+                if request is not None:
+                    request.cancel()
+                request = self.queue.get()
+            if request is None:
+                break
+            sFit = Fit.getInstance()
+            try:
+                while not self.processRequest(request):
+                    pyfalog.debug('Fits changed during graph calculation, restarting it')
+                    # Let pending changes through before starting over
+                    while sFit.changesPending > 0 and not request.cancelled:
+                        time.sleep(CHANGE_WAIT)
+                    request.changeCount = sFit.changeCount
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except Exception:
+                pyfalog.error('Failed to process graph request', exc_info=True)
+                request.finished = True
+                wx.CallAfter(request.deliverDone)
+
+    def processRequest(self, request):
+        """Process request, returns False if it was interrupted by fit change."""
+        view = request.view
+        sFit = Fit.getInstance()
+        pending = []
+        # Cached lines are available right away, the rest gets preview
+        for source, target in request.lines:
+            if request.cancelled:
+                return True
+            plotData = view.getCachedPlotPoints(
+                mainInput=request.mainInput, miscInputs=request.miscInputs,
+                xSpec=request.xSpec, ySpec=request.ySpec, src=source, tgt=target)
+            if plotData is not None:
+                wx.CallAfter(request.deliverLine, source, target, plotData, False)
+            else:
+                pending.append((source, target))
+        failed = set()
+        for coarse in (True, False):
+            for source, target in pending:
+                if request.cancelled:
+                    return True
+                if (source, target) in failed:
+                    continue
+                try:
+                    # Fits cannot be changed while line is calculated, but
+                    # they could have been changed since request was made.
+                    # Change waiting for the lock interrupts calculation
+                    with sFit.fitLock, interruptibleBy(request.isInterrupted):
+                        if request.outdated:
+                            return False
+                        plotData = view.getPlotPoints(
+                            mainInput=request.mainInput,
+                            miscInputs=request.miscInputs,
+                            xSpec=request.xSpec,
+                            ySpec=request.ySpec,
+                            src=source,
+                            tgt=target,
+                            coarse=coarse)
+                except CalcInterrupted:
+                    return request.cancelled
+                except (KeyboardInterrupt, SystemExit):
+                    raise
+                except Exception:
+                    pyfalog.warning('Failed to plot "{}" vs "{}"'.format(source.name, '' if target is None else target.name), exc_info=True)
+                    # Do not try it again at full resolution
+                    failed.add((source, target))
+                    wx.CallAfter(request.deliverLine, source, target, None, False)
+                    continue
+                # Preview is optional
+                if coarse and plotData is None:
+                    continue
+                wx.CallAfter(request.deliverLine, source, target, plotData, coarse)
+        request.finished = True
+        wx.CallAfter(request.deliverDone)
+        return True
+
+    def trigger(self, request):
+        self.queue.put(request)
+
+    def stop(self):
+        self.running = False
+        self.queue.put(None)
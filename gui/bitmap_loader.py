@@ -19,6 +19,8 @@
 
 import io
 import os.path
+import queue
+import threading
 import zipfile
 from collections import OrderedDict
 
@@ -45,11 +47,23 @@ class BitmapLoader:
             pyfalog.info("Using local image files.")
             archive = None
 
+    # Format: {path: (bitmap, size in bytes)}, least recently used first
     cached_bitmaps = OrderedDict()
+    cached_bytes = 0
     dont_use_cached_bitmaps = False
-    max_cached_bitmaps = 500
+    max_cached_bytes = 48 * 1024 * 1024
+    # Rough size of entry itself, on top of pixel data
+    entry_overhead = 256
+
+    # Keep images rescaled for current scaling factor on disk, so that next
+    # time they are loaded without rescaling large variant again
+    use_disk_cache = True
+    disk_cache_dir = None
+
+    cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'prefetched': 0, 'diskHits': 0}
 
     scaling_factor = None
+    prefetch_thread = None
 
     @classmethod
     def getStaticBitmap(cls, name, parent, location):
@@ -67,17 +81,68 @@ class BitmapLoader:
 
         path = "%s%s" % (name, location)
 
-        if len(cls.cached_bitmaps) == cls.max_cached_bitmaps:
-            cls.cached_bitmaps.popitem(False)
-
-        if path not in cls.cached_bitmaps:
-            bmp = cls.loadBitmap(name, location)
-            cls.cached_bitmaps[path] = bmp
-        else:
-            bmp = cls.cached_bitmaps[path]
+        if path in cls.cached_bitmaps:
+            cls.cached_bitmaps.move_to_end(path)
+            cls.cache_stats['hits'] += 1
+            return cls.cached_bitmaps[path][0]
 
+        cls.cache_stats['misses'] += 1
+        bmp = cls.loadBitmap(name, location)
+        cls.storeBitmap(path, bmp)
         return bmp
 
+    @classmethod
+    def storeBitmap(cls, path, bmp):
+        size = cls.entry_overhead
+        if bmp is not None:
+            size += bmp.GetWidth() * bmp.GetHeight() * 4
+        old = cls.cached_bitmaps.pop(path, None)
+        if old is not None:
+            cls.cached_bytes -= old[1]
+        cls.cached_bitmaps[path] = (bmp, size)
+        cls.cached_bytes += size
+        while cls.cached_bytes > cls.max_cached_bytes and len(cls.cached_bitmaps) > 1:
+            _, (_, evictedSize) = cls.cached_bitmaps.popitem(False)
+            cls.cached_bytes -= evictedSize
+            cls.cache_stats['evictions'] += 1
+
+    @classmethod
+    def getCacheStats(cls):
+        stats = dict(cls.cache_stats)
+        requests = stats['hits'] + stats['misses']
+        stats['hitRate'] = stats['hits'] / requests if requests else 0
+        stats['entries'] = len(cls.cached_bitmaps)
+        stats['bytes'] = cls.cached_bytes
+        stats['maxBytes'] = cls.max_cached_bytes
+        return stats
+
+    @classmethod
+    def prefetch(cls, icons):
+        """
+        Load bitmaps in background, so that they are cached by the time they are
+        requested. Accepts iterable of (name, location) pairs.
+        """
+        if cls.dont_use_cached_bitmaps:
+            return
+        icons = [(name, location) for name, location in icons
+                 if name and "%s%s" % (name, location) not in cls.cached_bitmaps]
+        if not icons:
+            return
+        # Scaling factor can be detected only in main thread
+        scale = cls.getScalingFactor()
+        if cls.prefetch_thread is None:
+            cls.prefetch_thread = IconPrefetchThread()
+            cls.prefetch_thread.start()
+        cls.prefetch_thread.trigger(icons, scale)
+
+    @classmethod
+    def storePrefetched(cls, name, location, img):
+        path = "%s%s" % (name, location)
+        if path in cls.cached_bitmaps:
+            return
+        cls.cache_stats['prefetched'] += 1
+        cls.storeBitmap(path, img.ConvertToBitmap() if img is not None else None)
+
     @classmethod
     def getImage(cls, name, location):
         bmp = cls.getBitmap(name, location)
@@ -87,10 +152,27 @@ class BitmapLoader:
             return None
 
     @classmethod
-    def loadBitmap(cls, name, location):
+    def getScalingFactor(cls):
         if cls.scaling_factor is None:
             cls.scaling_factor = 1 if 'wxGTK' in wx.PlatformInfo else int(wx.GetApp().GetTopWindow().GetContentScaleFactor())
-        scale = cls.scaling_factor
+        return cls.scaling_factor
+
+    @classmethod
+    def loadBitmap(cls, name, location):
+        img = cls.loadFinalImage(name, location, cls.getScalingFactor())
+        if img is None:
+            return None
+        return img.ConvertToBitmap()
+
+    @classmethod
+    def loadFinalImage(cls, name, location, scale):
+        """Load image as it is going to be shown, can be used outside of main thread."""
+        cachedPath = cls.getDiskCachePath(name, location, scale)
+        if cachedPath is not None and os.path.exists(cachedPath):
+            img = wx.Image(cachedPath)
+            if img.IsOk():
+                cls.cache_stats['diskHits'] += 1
+                return img
 
         filename, img = cls.loadScaledBitmap(name, location, scale)
 
@@ -104,8 +186,33 @@ class BitmapLoader:
             return None
 
         if scale > 1:
-            return img.Scale(round(img.GetWidth() // scale), round(img.GetHeight() // scale)).ConvertToBitmap()
-        return img.ConvertToBitmap()
+            img = img.Scale(round(img.GetWidth() // scale), round(img.GetHeight() // scale))
+            if cachedPath is not None:
+                cls.saveToDiskCache(img, cachedPath)
+        return img
+
+    @classmethod
+    def getDiskCachePath(cls, name, location, scale):
+        # Only images from archive are cached, local ones may change any moment
+        if not cls.use_disk_cache or cls.archive is None or scale <= 1 or config.savePath is None:
+            return None
+        if cls.disk_cache_dir is None:
+            try:
+                stamp = int(os.path.getmtime(config.imgsZIP))
+            except (OSError, TypeError):
+                return None
+            cls.disk_cache_dir = os.path.join(config.savePath, "cache", "icons", str(stamp))
+        return os.path.join(cls.disk_cache_dir, "{}x".format(scale), location, "{}.png".format(name))
+
+    @staticmethod
+    def saveToDiskCache(img, path):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            img.SaveFile(path, wx.BITMAP_TYPE_PNG)
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except Exception:
+            pyfalog.warning("Failed to save rescaled icon to {0}".format(path))
 
     @classmethod
     def loadScaledBitmap(cls, name, location, scale=0):
@@ -144,3 +251,32 @@ class BitmapLoader:
                 return wx.Image(path)
             else:
                 return None
+
+
+class IconPrefetchThread(threading.Thread):
+    """Decodes images off main thread; bitmaps are made from them on main thread."""
+
+    def __init__(self):
+        threading.Thread.__init__(self)
+        self.name = "IconPrefetch"
+        self.daemon = True
+        self.queue = queue.Queue()
+
+    def run(self):
+        while True:
+            icons, scale = self.queue.get()
+            for name, location in icons:
+                # Might have been loaded while we were busy with other icons
+                if "%s%s" % (name, location) in BitmapLoader.cached_bitmaps:
+                    continue
+                try:
+                    img = BitmapLoader.loadFinalImage(name, location, scale)
+                except (KeyboardInterrupt, SystemExit):
+                    raise
+                except Exception:
+                    pyfalog.warning("Failed to prefetch icon {0}/{1}".format(location, name), exc_info=True)
+                    continue
+                wx.CallAfter(BitmapLoader.storePrefetched, name, location, img)
+
+    def trigger(self, icons, scale):
+        self.queue.put((icons, scale))
@@ -98,6 +98,9 @@ class BoosterView(d.Display):
             self.removeBoosters(boosters)
         event.Skip()
 
+    def getRefreshStamp(self):
+        return self.getFitRefreshStamp(self.mainFrame.getActiveFit())
+
     def fitChanged(self, event):
         event.Skip()
         activeFitID = self.mainFrame.getActiveFit()
@@ -198,6 +198,9 @@ class DroneView(Display):
         groupName = Market.getInstance().getMarketGroupByItem(drone.item).marketGroupName
         return (DRONE_ORDER.index(groupName), drone.isMutated, drone.fullName)
 
+    def getRefreshStamp(self):
+        return self.getFitRefreshStamp(self.mainFrame.getActiveFit())
+
     def fitChanged(self, event):
         event.Skip()
         activeFitID = self.mainFrame.getActiveFit()
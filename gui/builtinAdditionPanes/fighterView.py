@@ -268,6 +268,9 @@ class FighterDisplay(d.Display):
             abilityEffectIDs = sorted(a.effectID for a in fighter.abilities)
         return orderPos, abilityEffectIDs, fighter.item.name
 
+    def getRefreshStamp(self):
+        return self.getFitRefreshStamp(self.mainFrame.getActiveFit())
+
     def fitChanged(self, event):
         event.Skip()
         activeFitID = self.mainFrame.getActiveFit()
@@ -1,7 +1,9 @@
 import wx
 
+from gui.bitmap_loader import BitmapLoader
 from gui.cachingImageList import CachingImageList
 from gui.builtinMarketBrowser.events import RECENTLY_USED_MODULES
+from service.itemPrefetch import ItemPrefetch
 
 from logbook import Logger
 
@@ -10,6 +12,8 @@ _t = wx.GetTranslation
 
 
 class MarketTree(wx.TreeCtrl):
+    # Max amount of icons to prefetch per expanded market group
+    PREFETCH_LIMIT = 200
 
     def __init__(self, parent, marketBrowser):
         wx.TreeCtrl.__init__(self, parent, style=wx.TR_DEFAULT_STYLE | wx.TR_HIDE_ROOT)
@@ -56,6 +60,8 @@ class MarketTree(wx.TreeCtrl):
             # And add real market group contents
             sMkt = self.sMkt
             currentMktGrp = sMkt.getMarketGroup(self.GetItemData(root), eager="children")
+            # Groups with items, their icons are likely to be requested next
+            prefetchGroups = []
 
             for childMktGrp in sMkt.getMarketGroupChildren(currentMktGrp):
                 # If market should have items but it doesn't, do not show it
@@ -73,8 +79,24 @@ class MarketTree(wx.TreeCtrl):
                     continue
                 if sMkt.marketGroupHasTypesCheck(childMktGrp) is False:
                     self.AppendItem(childId, "dummy")
+                else:
+                    prefetchGroups.append(childMktGrp)
 
             self.SortChildren(root)
+            self.prefetchIcons(prefetchGroups)
+            ItemPrefetch.getInstance().prefetchMarketGroup(currentMktGrp.ID)
+
+    def prefetchIcons(self, mktGrps):
+        """Warm up icon cache with icons of items in passed market groups"""
+        # Icon IDs come from market index, no items are loaded here
+        index = self.sMkt.index
+        icons = []
+        for mktGrp in mktGrps:
+            for iconID in index.getItemIconIDs(mktGrp.ID):
+                icons.append((iconID, "icons"))
+            if len(icons) >= self.PREFETCH_LIMIT:
+                break
+        BitmapLoader.prefetch(icons[:self.PREFETCH_LIMIT])
 
     def OnCollapsed(self, event):
         self.CollapseAllChildren(event.Item)
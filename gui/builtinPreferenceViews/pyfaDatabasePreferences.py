@@ -5,6 +5,7 @@ from eos.db.saveddata.queries import clearPrices, clearDamagePatterns, clearTarg
 from gui.bitmap_loader import BitmapLoader
 from gui.preferenceView import PreferenceView
 from gui.utils import helpers_wxPython as wxHelpers
+from service.settings import DatabaseSettings
 
 _t = wx.GetTranslation
 
@@ -73,6 +74,13 @@ class PFGeneralPref(PreferenceView):
         self.m_staticline3 = wx.StaticLine(panel, wx.ID_ANY, wx.DefaultPosition, wx.DefaultSize, wx.LI_HORIZONTAL)
         mainSizer.Add(self.m_staticline3, 0, wx.EXPAND | wx.TOP | wx.BOTTOM, 5)
 
+        self.dbSettings = DatabaseSettings.getInstance()
+        self.cbBackgroundValidation = wx.CheckBox(
+            panel, wx.ID_ANY, _t("Validate Fitting Database in Background after Unclean Shutdown"), wx.DefaultPosition, wx.DefaultSize, 0)
+        self.cbBackgroundValidation.SetValue(self.dbSettings.get('backgroundValidation'))
+        self.cbBackgroundValidation.Bind(wx.EVT_CHECKBOX, self.onCBBackgroundValidation)
+        mainSizer.Add(self.cbBackgroundValidation, 0, wx.ALL | wx.EXPAND, 5)
+
         btnSizer = wx.BoxSizer(wx.VERTICAL)
         btnSizer.AddStretchSpacer()
 
@@ -118,6 +126,9 @@ class PFGeneralPref(PreferenceView):
         config.saveInRoot = self.cbsaveInRoot.GetValue()
         '''
 
+    def onCBBackgroundValidation(self, event):
+        self.dbSettings.set('backgroundValidation', self.cbBackgroundValidation.GetValue())
+
     def getImage(self):
         return BitmapLoader.getBitmap("settings_database", "gui")
 
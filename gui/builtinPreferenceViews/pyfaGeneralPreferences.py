@@ -141,6 +141,10 @@ class PFGeneralPref(PreferenceView):
                                                     wx.DefaultPosition, wx.DefaultSize, 0)
         mainSizer.Add(self.cbShowShipBrowserTooltip, 0, wx.ALL | wx.EXPAND, 5)
 
+        self.cbShowShipBrowserFitStats = wx.CheckBox(panel, wx.ID_ANY, _t("Show fit stats in ship browser"),
+                                                     wx.DefaultPosition, wx.DefaultSize, 0)
+        mainSizer.Add(self.cbShowShipBrowserFitStats, 0, wx.ALL | wx.EXPAND, 5)
+
         self.cbReloadAll = wx.CheckBox(panel, wx.ID_ANY, _t("Change charge in all modules of the same type"),
                                        wx.DefaultPosition, wx.DefaultSize, 0)
         if "wxGTK" not in wx.PlatformInfo:
@@ -162,6 +166,11 @@ class PFGeneralPref(PreferenceView):
         mainSizer.Add(self.rbAddLabels, 0, wx.EXPAND | wx.TOP | wx.RIGHT | wx.BOTTOM, 10)
         self.rbAddLabels.Bind(wx.EVT_RADIOBOX, self.OnAddLabelsChange)
 
+        self.rbFitSort = wx.RadioBox(panel, -1, _t("Order of fits in ship browser"), wx.DefaultPosition, wx.DefaultSize,
+                                     [_t("Name"), _t("DPS"), _t("EHP"), _t("Speed"), _t("Price")], 5, wx.RA_SPECIFY_COLS)
+        mainSizer.Add(self.rbFitSort, 0, wx.EXPAND | wx.TOP | wx.RIGHT | wx.BOTTOM, 10)
+        self.rbFitSort.Bind(wx.EVT_RADIOBOX, self.OnFitSortChange)
+
         self.sFit = Fit.getInstance()
 
         self.cbGlobalChar.SetValue(self.sFit.serviceFittingOptions["useGlobalCharacter"])
@@ -176,9 +185,11 @@ class PFGeneralPref(PreferenceView):
         self.cbGaugeAnimation.SetValue(self.sFit.serviceFittingOptions["enableGaugeAnimation"])
         self.cbOpenFitInNew.SetValue(self.sFit.serviceFittingOptions["openFitInNew"])
         self.cbShowShipBrowserTooltip.SetValue(self.sFit.serviceFittingOptions["showShipBrowserTooltip"])
+        self.cbShowShipBrowserFitStats.SetValue(self.sFit.serviceFittingOptions["showShipBrowserFitStats"])
         self.cbReloadAll.SetValue(self.sFit.serviceFittingOptions["ammoChangeAll"])
         self.cbExpMutants.SetValue(self.sFit.serviceFittingOptions["expandedMutantNames"])
         self.rbAddLabels.SetSelection(self.sFit.serviceFittingOptions["additionsLabels"])
+        self.rbFitSort.SetSelection(self.sFit.serviceFittingOptions["shipBrowserFitSort"])
 
         self.cbGlobalChar.Bind(wx.EVT_CHECKBOX, self.OnCBGlobalCharStateChange)
         self.cbDefaultCharImplants.Bind(wx.EVT_CHECKBOX, self.OnCBDefaultCharImplantsStateChange)
@@ -192,6 +203,7 @@ class PFGeneralPref(PreferenceView):
         self.cbGaugeAnimation.Bind(wx.EVT_CHECKBOX, self.onCBGaugeAnimation)
         self.cbOpenFitInNew.Bind(wx.EVT_CHECKBOX, self.onCBOpenFitInNew)
         self.cbShowShipBrowserTooltip.Bind(wx.EVT_CHECKBOX, self.onCBShowShipBrowserTooltip)
+        self.cbShowShipBrowserFitStats.Bind(wx.EVT_CHECKBOX, self.onCBShowShipBrowserFitStats)
         self.cbReloadAll.Bind(wx.EVT_CHECKBOX, self.onCBReloadAll)
         self.cbExpMutants.Bind(wx.EVT_CHECKBOX, self.onCBExpMutants)
 
@@ -273,6 +285,10 @@ class PFGeneralPref(PreferenceView):
     def onCBShowShipBrowserTooltip(self, event):
         self.sFit.serviceFittingOptions["showShipBrowserTooltip"] = self.cbShowShipBrowserTooltip.GetValue()
 
+    def onCBShowShipBrowserFitStats(self, event):
+        self.sFit.serviceFittingOptions["showShipBrowserFitStats"] = self.cbShowShipBrowserFitStats.GetValue()
+        self.mainFrame.shipBrowser.RefreshContent()
+
     def onCBReloadAll(self, event):
         self.sFit.serviceFittingOptions["ammoChangeAll"] = self.cbReloadAll.GetValue()
 
@@ -288,6 +304,11 @@ class PFGeneralPref(PreferenceView):
         wx.PostEvent(self.mainFrame, GE.FitChanged(fitIDs=(fitID,)))
         event.Skip()
 
+    def OnFitSortChange(self, event):
+        self.sFit.serviceFittingOptions["shipBrowserFitSort"] = event.GetInt()
+        self.mainFrame.shipBrowser.RefreshContent()
+        event.Skip()
+
     def getImage(self):
         return BitmapLoader.getBitmap("prefs_settings", "gui")
 
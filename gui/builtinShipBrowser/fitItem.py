@@ -16,6 +16,7 @@ import gui.utils.draw as drawUtils
 import gui.utils.fonts as fonts
 from gui.bitmap_loader import BitmapLoader
 from gui.builtinShipBrowser.pfBitmapFrame import PFBitmapFrame
+from gui.utils.numberFormatter import formatAmount
 from service.fit import Fit
 from .events import BoosterListUpdated, FitSelected, ImportSelected, SearchSelected, Stage3Selected
 
@@ -25,7 +26,7 @@ _t = wx.GetTranslation
 
 class FitItem(SFItem.SFBrowserItem):
     def __init__(self, parent, fitID=None, shipFittingInfo=("Test", "TestTrait", "cnc's avatar", 0, 0, None), shipID=None,
-                 itemData=None, graphicID=None,
+                 itemData=None, graphicID=None, fitStats=None,
                  id=wx.ID_ANY, pos=wx.DefaultPosition,
                  size=(0, 40), style=0):
 
@@ -46,6 +47,8 @@ class FitItem(SFItem.SFBrowserItem):
 
         self.shipID = shipID
 
+        self.fitStats = fitStats
+
         self.shipBrowser = self.Parent.Parent
 
         self.shipBmp = None
@@ -164,6 +167,21 @@ class FitItem(SFItem.SFBrowserItem):
                 notes = '─' * 20 + "\nNotes: {}\n".format(self.notes[:197] + '...' if len(self.notes) > 200 else self.notes)
             self.SetToolTip(wx.ToolTip('{}\n{}{}\n{}'.format(self.shipName, notes, '─' * 20, self.shipTrait)))
 
+    def SetFitStats(self, fitStats):
+        self.fitStats = fitStats
+        self.Refresh()
+
+    def GetFitStatsText(self):
+        if self.fitStats is None or not Fit.getInstance().serviceFittingOptions["showShipBrowserFitStats"]:
+            return None
+        stats = self.fitStats
+        return "{} DPS, {} EHP, {} m/s, {}, {} ISK".format(
+            formatAmount(stats.dps, 3, 0, 0),
+            formatAmount(stats.ehp, 3, 0, 9),
+            formatAmount(stats.maxSpeed, 3, 0, 0),
+            _t("cap stable") if stats.capStable else _t("cap unstable"),
+            formatAmount(stats.price, 3, 3, 9, currency=True))
+
     def OnKeyUp(self, event):
         if event.GetKeyCode() in (32, 13):  # space and enter
             self.selectFit(event)
@@ -510,6 +528,9 @@ class FitItem(SFItem.SFBrowserItem):
 
         fitDate = self.timestamp.strftime("%m/%d/%Y %H:%M")
         fitLocalDate = fitDate  # "%d/%02d/%02d %02d:%02d" % (fitDate[0], fitDate[1], fitDate[2], fitDate[3], fitDate[4])
+        fitStatsText = self.GetFitStatsText()
+        if fitStatsText:
+            fitLocalDate = "{} | {}".format(fitLocalDate, fitStatsText)
         pfdate = drawUtils.GetPartialText(mdc, fitLocalDate,
                                           self.toolbarx - self.textStartx - self.padding * 2 - self.thoverw)
 
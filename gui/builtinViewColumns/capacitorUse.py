@@ -39,6 +39,7 @@ regenGroups = (
 class CapacitorUse(ViewColumn):
 
     name = 'Capacitor Usage'
+    cacheable = True
 
     def __init__(self, fittingView, params):
         ViewColumn.__init__(self, fittingView)
@@ -29,6 +29,7 @@ from gui.utils.numberFormatter import formatAmount, roundToPrec
 
 class MaxRange(ViewColumn):
     name = "Max Range"
+    cacheable = True
 
     def __init__(self, fittingView, params=None):
         if params is None:
@@ -33,6 +33,7 @@ import eos.config
 
 class Miscellanea(ViewColumn):
     name = "Miscellanea"
+    cacheable = True
 
     def __init__(self, fittingView, params=None):
         if params is None:
@@ -55,6 +56,13 @@ class Miscellanea(ViewColumn):
     def getText(self, stuff):
         return self.__getData(stuff)[0]
 
+    def getCacheStamp(self):
+        try:
+            useEhp = self.mainFrame.statsPane.nameViewMap["resistancesViewFull"].showEffective
+        except KeyError:
+            useEhp = False
+        return eos.config.settings['globalDefaultSpoolupPercentage'], useEhp
+
     def getToolTip(self, mod):
         return self.__getData(mod)[1]
 
@@ -41,6 +41,7 @@ from gui.contextMenu import ContextMenu
 from gui.utils.staticHelpers import DragDropHelper
 from gui.utils.dark import isDark
 from service.fit import Fit
+from service.itemPrefetch import ItemPrefetch
 from service.market import Market
 from config import slotColourMap, slotColourMapDark, errColor, errColorDark
 from gui.fitCommands.helpers import getSimilarModPositions
@@ -611,6 +612,7 @@ class FittingView(d.Display):
                     self.populate(self.mods)
                 self.refresh(self.mods)
                 self.Refresh()
+                ItemPrefetch.getInstance().prefetchFitVariations(Fit.getInstance().getFit(self.activeFitID))
 
             self.Show(self.activeFitID is not None and self.activeFitID == activeFitID)
         except RuntimeError:
@@ -735,6 +737,9 @@ class FittingView(d.Display):
         else:
             return slotColourMap.get(slot) or self.GetBackgroundColour()
 
+    def getRefreshStamp(self):
+        return self.getFitRefreshStamp(self.activeFitID)
+
     def refresh(self, stuff):
         """
         Displays fitting
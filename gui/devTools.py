@@ -18,6 +18,7 @@
 # =============================================================================
 
 import gc
+import os
 import threading
 import time
 
@@ -25,9 +26,13 @@ import time
 import wx
 from logbook import Logger
 
+import config
 import eos.db
+from eos.calcProfiler import calcProfiler
 from gui.auxWindow import AuxiliaryFrame
+from gui.bitmap_loader import BitmapLoader
 from gui.builtinShipBrowser.events import FitSelected
+from service.fit import Fit
 
 pyfalog = Logger(__name__)
 
@@ -39,7 +44,7 @@ class DevTools(AuxiliaryFrame):
     def __init__(self, parent):
         super().__init__(
             parent, id=wx.ID_ANY, title="Development Tools", resizeable=True,
-            size=wx.Size(400, 320) if "wxGTK" in wx.PlatformInfo else wx.Size(400, 240))
+            size=wx.Size(400, 490) if "wxGTK" in wx.PlatformInfo else wx.Size(400, 370))
         self.mainFrame = parent
         self.block = False
         self.SetSizeHints(wx.DefaultSize, wx.DefaultSize)
@@ -68,6 +73,27 @@ class DevTools(AuxiliaryFrame):
 
         self.cmdPrint.Bind(wx.EVT_BUTTON, self.cmd_print)
 
+        self.recalcStats = wx.Button(self, wx.ID_ANY, "Recalc Stats", wx.DefaultPosition, wx.DefaultSize, 0)
+        mainSizer.Add(self.recalcStats, 0, wx.EXPAND | wx.TOP | wx.BOTTOM, 5)
+
+        self.recalcStats.Bind(wx.EVT_BUTTON, self.recalc_stats)
+
+        self.iconStats = wx.Button(self, wx.ID_ANY, "Icon Cache Stats", wx.DefaultPosition, wx.DefaultSize, 0)
+        mainSizer.Add(self.iconStats, 0, wx.EXPAND | wx.TOP | wx.BOTTOM, 5)
+
+        self.iconStats.Bind(wx.EVT_BUTTON, self.icon_stats)
+
+        self.calcProfile = wx.ToggleButton(self, wx.ID_ANY, "Profile Calcs", wx.DefaultPosition, wx.DefaultSize, 0)
+        self.calcProfile.SetValue(calcProfiler.enabled)
+        mainSizer.Add(self.calcProfile, 0, wx.EXPAND | wx.TOP | wx.BOTTOM, 5)
+
+        self.calcProfile.Bind(wx.EVT_TOGGLEBUTTON, self.calc_profile)
+
+        self.calcReport = wx.Button(self, wx.ID_ANY, "Calc Profile Report", wx.DefaultPosition, wx.DefaultSize, 0)
+        mainSizer.Add(self.calcReport, 0, wx.EXPAND | wx.TOP | wx.BOTTOM, 5)
+
+        self.calcReport.Bind(wx.EVT_BUTTON, self.calc_report)
+
         self.SetSizer(mainSizer)
 
         self.Layout()
@@ -96,6 +122,30 @@ class DevTools(AuxiliaryFrame):
         for x in self.mainFrame.command.GetCommands():
             print("{}{} {}".format("==> " if x == self.mainFrame.command.GetCurrentCommand() else "", x.GetName(), x))
 
+    def recalc_stats(self, evt):
+        stats = Fit.getInstance().recalcScheduler.getStats()
+        print("Recalcs requested: {requested}, performed: {performed}, skipped: {skipped}".format(**stats))
+
+    def icon_stats(self, evt):
+        stats = BitmapLoader.getCacheStats()
+        print("Icon cache: {entries} bitmaps, {bytes} of {maxBytes} bytes, hit rate {hitRate:.1%} "
+              "({hits} hits, {misses} misses), {evictions} evictions, {prefetched} prefetched, "
+              "{diskHits} loaded from disk cache".format(**stats))
+
+    def calc_profile(self, evt):
+        if self.calcProfile.GetValue():
+            calcProfiler.start()
+            print("Calc profiling started")
+        else:
+            calcProfiler.stop()
+            print("Calc profiling stopped")
+
+    def calc_report(self, evt):
+        print(calcProfiler.formatReport())
+        path = os.path.join(config.savePath, "calcProfile.json")
+        calcProfiler.exportReport(path)
+        print("Full calc profile saved to {}".format(path))
+
     def gc_collect(self, evt):
         print(gc.collect())
         print(gc.get_debug())
@@ -22,6 +22,12 @@ import wx
 import gui.mainFrame
 from gui.viewColumn import ViewColumn
 from gui.cachingImageList import CachingImageList
+from service.fit import Fit
+
+
+# Lists longer than this get only visible rows refreshed right away, the
+# rest is refreshed in batches of this size when UI is idle
+DEFERRED_REFRESH_ROWS = 50
 
 
 class Display(wx.ListCtrl):
@@ -46,6 +52,9 @@ class Display(wx.ListCtrl):
 
         self.imageListBase = self.imageList.ImageCount
 
+        # Format: {(column, id(row object)): (row object, stamp, text, image ID)}
+        self.__cellCache = {}
+        self.__refreshGeneration = 0
 
     # Override native HitTestSubItem (doesn't work as it should on GTK)
     # Source: ObjectListView
@@ -204,27 +213,104 @@ class Display(wx.ListCtrl):
                         self.DeleteItem(self.getLastItem())
                     self.Refresh()
 
+    def getRefreshStamp(self):
+        """
+        Return value which changes whenever data shown by cacheable columns
+        might change. None disables caching of column data.
+        """
+        return None
+
+    @staticmethod
+    def getFitRefreshStamp(fitID):
+        """Refresh stamp for views which show items of single fit."""
+        if fitID is None:
+            return None
+        sFit = Fit.getInstance()
+        fit = sFit.getFit(fitID, basic=True)
+        if fit is None:
+            return None
+        return fit.ID, fit.revision, sFit.recalcScheduler.getRecalcCount(fit.ID)
+
+    def getCellData(self, col, st, stamp):
+        """Return text and image ID of cell, reusing them if allowed by stamp."""
+        if stamp is None or not col.cacheable:
+            return col.getText(st), col.getImageId(st)
+        stamp = (stamp, col.getCacheStamp())
+        key = (col, id(st))
+        cached = self.__cellCache.get(key)
+        # Keep reference to row object, so that its ID is not reused while in cache
+        if cached is not None and cached[0] is st and cached[1] == stamp:
+            return cached[2], cached[3]
+        text = col.getText(st)
+        imageId = col.getImageId(st)
+        # Delayed text is not known yet, do not cache it
+        if text is not False:
+            self.__cellCache[key] = (st, stamp, text, imageId)
+        return text, imageId
+
     def refresh(self, stuff):
         if stuff is None:
             return
-        item = -1
-        for id_, st in enumerate(stuff):
+        self.__refreshGeneration += 1
+        stamp = self.getRefreshStamp()
+        if stamp is None:
+            self.__cellCache.clear()
+        else:
+            self.__dropStaleCache(stuff)
+        rows = list(enumerate(stuff))
+        if len(rows) > DEFERRED_REFRESH_ROWS:
+            # Visible rows first, the rest when we get back to event loop
+            topRow = max(self.GetTopItem(), 0)
+            visibleRows = rows[topRow:topRow + self.GetCountPerPage() + 1]
+            self.__refreshRows(visibleRows, stamp)
+            visibleIds = set(id_ for id_, st in visibleRows)
+            otherRows = [r for r in rows if r[0] not in visibleIds]
+            for id_, st in otherRows:
+                self.SetItemData(id_, id_)
+            wx.CallAfter(self.__refreshDeferred, self.__refreshGeneration, otherRows, stamp)
+            return
+        self.__refreshRows(rows, stamp)
+        self.__resizeColumns()
 
-            item = self.GetNextItem(item)
+    def __refreshDeferred(self, generation, rows, stamp):
+        # Display got destroyed or refreshed again meanwhile
+        if not self or generation != self.__refreshGeneration:
+            return
+        batch = rows[:DEFERRED_REFRESH_ROWS]
+        rest = rows[DEFERRED_REFRESH_ROWS:]
+        self.Freeze()
+        try:
+            self.__refreshRows(batch, stamp)
+        finally:
+            self.Thaw()
+        if rest:
+            wx.CallAfter(self.__refreshDeferred, generation, rest, stamp)
+        else:
+            self.__resizeColumns()
+
+    def __dropStaleCache(self, stuff):
+        ids = set(id(st) for st in stuff)
+        for key in [k for k in self.__cellCache if k[1] not in ids]:
+            del self.__cellCache[key]
+
+    def __refreshRows(self, rows, stamp):
+        itemCount = self.GetItemCount()
+        for id_, st in rows:
+            item = id_
+            if item >= itemCount:
+                break
 
             for i, col in enumerate(self.activeColumns):
                 colItem = self.GetItem(item, i)
                 oldText = colItem.GetText()
                 oldImageId = colItem.GetImage()
                 oldColour = colItem.GetBackgroundColour()
-                newText = col.getText(st)
+                newText, newImageId = self.getCellData(col, st, stamp)
                 if newText is False:
                     col.delayedText(st, self, colItem)
                     newText = "\u21bb"
                 newColour = self.columnBackground(colItem, st)
 
-                newImageId = col.getImageId(st)
-
                 colItem.SetText(newText)
                 colItem.SetImage(newImageId)
                 colItem.SetBackgroundColour(newColour)
@@ -247,6 +333,7 @@ class Display(wx.ListCtrl):
 
                 self.SetItemData(item, id_)
 
+    def __resizeColumns(self):
         for i, col in enumerate(self.activeColumns):
             if not col.resized:
                 if col.size == wx.LIST_AUTOSIZE_USEHEADER:
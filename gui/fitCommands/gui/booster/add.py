@@ -23,7 +23,7 @@ class GuiAddBoosterCommand(wx.Command):
         Market.getInstance().storeRecentlyUsed(self.itemID)
         eos.db.flush()
         sFit = Fit.getInstance()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
@@ -33,7 +33,7 @@ class GuiAddBoosterCommand(wx.Command):
         success = self.internalHistory.undoAll()
         eos.db.flush()
         sFit = Fit.getInstance()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
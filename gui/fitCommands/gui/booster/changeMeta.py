@@ -29,7 +29,7 @@ class GuiChangeBoosterMetaCommand(wx.Command):
         cmd = CalcAddBoosterCommand(fitID=self.fitID, boosterInfo=info)
         success = self.internalHistory.submit(cmd)
         eos.db.flush()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         self.newPosition = cmd.newPosition
@@ -45,7 +45,7 @@ class GuiChangeBoosterMetaCommand(wx.Command):
         oldBooster = fit.boosters[self.newPosition]
         success = self.internalHistory.undoAll()
         eos.db.flush()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         newBooster = fit.boosters[self.position]
@@ -24,7 +24,7 @@ class GuiImportBoostersCommand(wx.Command):
         success = any(results)
         eos.db.flush()
         sFit = Fit.getInstance()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
@@ -34,7 +34,7 @@ class GuiImportBoostersCommand(wx.Command):
         success = self.internalHistory.undoAll()
         eos.db.flush()
         sFit = Fit.getInstance()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
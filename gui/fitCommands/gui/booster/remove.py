@@ -27,7 +27,7 @@ class GuiRemoveBoostersCommand(wx.Command):
         success = any(results)
         eos.db.flush()
         sFit = Fit.getInstance()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
@@ -37,7 +37,7 @@ class GuiRemoveBoostersCommand(wx.Command):
         success = self.internalHistory.undoAll()
         eos.db.flush()
         sFit = Fit.getInstance()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
@@ -22,7 +22,7 @@ class GuiToggleBoosterSideEffectStateCommand(wx.Command):
         success = self.internalHistory.submit(cmd)
         eos.db.flush()
         sFit = Fit.getInstance()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
@@ -32,7 +32,7 @@ class GuiToggleBoosterSideEffectStateCommand(wx.Command):
         success = self.internalHistory.undoAll()
         eos.db.flush()
         sFit = Fit.getInstance()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
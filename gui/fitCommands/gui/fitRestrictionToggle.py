@@ -31,7 +31,7 @@ class GuiToggleFittingRestrictionsCommand(wx.Command):
                 success = any(results)
 
         eos.db.flush()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
@@ -43,7 +43,7 @@ class GuiToggleFittingRestrictionsCommand(wx.Command):
         fit.ignoreRestrictions = not fit.ignoreRestrictions
         success = self.internalHistory.undoAll()
         eos.db.flush()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
@@ -29,7 +29,7 @@ class GuiChangeImplantMetaCommand(wx.Command):
         cmd = CalcAddImplantCommand(fitID=self.fitID, implantInfo=info)
         success = self.internalHistory.submit(cmd)
         eos.db.flush()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         self.newPosition = cmd.newPosition
@@ -46,7 +46,7 @@ class GuiChangeImplantMetaCommand(wx.Command):
         success = self.internalHistory.undoAll()
         eos.db.flush()
         sFit = Fit.getInstance()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         newImplant = fit.implants[self.position]
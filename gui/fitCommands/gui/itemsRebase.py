@@ -71,7 +71,7 @@ class GuiRebaseItemsCommand(wx.Command):
         sFit = Fit.getInstance()
         success = self.internalHistory.undoAll()
         eos.db.flush()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
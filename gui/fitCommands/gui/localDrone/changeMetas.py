@@ -3,16 +3,16 @@ import math
 import wx
 
 import eos.db
-import gui.mainFrame
-from gui import globalEvents as GE
 from gui.fitCommands.calc.drone.localAdd import CalcAddLocalDroneCommand
 from gui.fitCommands.calc.drone.localRemove import CalcRemoveLocalDroneCommand
-from gui.fitCommands.helpers import DroneInfo, InternalCommandHistory
+from gui.fitCommands.helpers import DroneInfo, FitChangedCoalescer, InternalCommandHistory
 from service.fit import Fit
 
 
 class GuiChangeLocalDroneMetasCommand(wx.Command):
 
+    localStateOnly = True
+
     def __init__(self, fitID, positions, newItemID):
         wx.Command.__init__(self, True, 'Change Local Drone Meta')
         self.internalHistory = InternalCommandHistory()
@@ -42,18 +42,18 @@ class GuiChangeLocalDroneMetasCommand(wx.Command):
             results.append(self.internalHistory.submitBatch(cmdRemove, cmdAdd))
         success = any(results)
         eos.db.flush()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
-        wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
+        FitChangedCoalescer.getInstance().post((self.fitID,))
         return success
 
     def Undo(self):
         success = self.internalHistory.undoAll()
         eos.db.flush()
         sFit = Fit.getInstance()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
-        wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
+        FitChangedCoalescer.getInstance().post((self.fitID,))
         return success
@@ -25,7 +25,7 @@ class GuiAddLocalModuleCommand(wx.Command):
         sFit = Fit.getInstance()
         if cmd.needsGuiRecalc:
             eos.db.flush()
-            sFit.recalc(self.fitID)
+            sFit.recalcIfDirty(self.fitID)
         self.savedRemovedDummies = sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(
@@ -41,7 +41,7 @@ class GuiAddLocalModuleCommand(wx.Command):
         restoreRemovedDummies(fit, self.savedRemovedDummies)
         success = self.internalHistory.undoAll()
         eos.db.flush()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(
@@ -1,15 +1,15 @@
 import wx
 
 import eos.db
-import gui.mainFrame
-from gui import globalEvents as GE
 from gui.fitCommands.calc.module.changeCharges import CalcChangeModuleChargesCommand
-from gui.fitCommands.helpers import InternalCommandHistory
+from gui.fitCommands.helpers import FitChangedCoalescer, InternalCommandHistory
 from service.fit import Fit
 
 
 class GuiChangeLocalModuleChargesCommand(wx.Command):
 
+    localStateOnly = True
+
     def __init__(self, fitID, positions, chargeItemID):
         wx.Command.__init__(self, True, 'Change Local Module Charges')
         self.internalHistory = InternalCommandHistory()
@@ -23,18 +23,18 @@ class GuiChangeLocalModuleChargesCommand(wx.Command):
         sFit = Fit.getInstance()
         if cmd.needsGuiRecalc:
             eos.db.flush()
-            sFit.recalc(self.fitID)
+            sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
-        wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
+        FitChangedCoalescer.getInstance().post((self.fitID,))
         return success
 
     def Undo(self):
         success = self.internalHistory.undoAll()
         eos.db.flush()
         sFit = Fit.getInstance()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
-        wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
+        FitChangedCoalescer.getInstance().post((self.fitID,))
         return success
@@ -4,12 +4,14 @@ import eos.db
 import gui.mainFrame
 from gui import globalEvents as GE
 from gui.fitCommands.calc.module.localReplace import CalcReplaceLocalModuleCommand
-from gui.fitCommands.helpers import InternalCommandHistory, ModuleInfo, restoreRemovedDummies
+from gui.fitCommands.helpers import FitChangedCoalescer, InternalCommandHistory, ModuleInfo, restoreRemovedDummies
 from service.fit import Fit
 
 
 class GuiChangeLocalModuleMetasCommand(wx.Command):
 
+    localStateOnly = True
+
     def __init__(self, fitID, positions, newItemID):
         wx.Command.__init__(self, True, 'Change Local Module Metas')
         self.internalHistory = InternalCommandHistory()
@@ -47,7 +49,7 @@ class GuiChangeLocalModuleMetasCommand(wx.Command):
         success = any(results)
         if lastSuccessfulCmd is not None and lastSuccessfulCmd.needsGuiRecalc:
             eos.db.flush()
-            sFit.recalc(self.fitID)
+            sFit.recalcIfDirty(self.fitID)
         self.savedRemovedDummies = sFit.fill(self.fitID)
         eos.db.commit()
         newModMap = self._getPositionMap(fit)
@@ -57,7 +59,7 @@ class GuiChangeLocalModuleMetasCommand(wx.Command):
         if success:
             events.append(GE.FitChanged(fitIDs=(self.fitID,), action='modadd', typeID=self.newItemID))
         if not events:
-            events.append(GE.FitChanged(fitIDs=(self.fitID,)))
+            FitChangedCoalescer.getInstance().post((self.fitID,))
         if success:
             for position in self.positions:
                 oldMod = oldModMap.get(position)
@@ -77,7 +79,7 @@ class GuiChangeLocalModuleMetasCommand(wx.Command):
         restoreRemovedDummies(fit, self.savedRemovedDummies)
         success = self.internalHistory.undoAll()
         eos.db.flush()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         newModMap = self._getPositionMap(fit)
@@ -87,7 +89,7 @@ class GuiChangeLocalModuleMetasCommand(wx.Command):
         if success and self.replacedItemIDs:
             events.append(GE.FitChanged(fitIDs=(self.fitID,), action='modadd', typeID=self.replacedItemIDs))
         if not events:
-            events.append(GE.FitChanged(fitIDs=(self.fitID,)))
+            FitChangedCoalescer.getInstance().post((self.fitID,))
         if success:
             for position in self.positions:
                 oldMod = oldModMap.get(position)
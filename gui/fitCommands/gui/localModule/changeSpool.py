@@ -1,15 +1,15 @@
 import wx
 
 import eos.db
-import gui.mainFrame
-from gui import globalEvents as GE
 from gui.fitCommands.calc.module.changeSpool import CalcChangeModuleSpoolCommand
-from gui.fitCommands.helpers import InternalCommandHistory
+from gui.fitCommands.helpers import FitChangedCoalescer, InternalCommandHistory
 from service.fit import Fit
 
 
 class GuiChangeLocalModuleSpoolCommand(wx.Command):
 
+    localStateOnly = True
+
     def __init__(self, fitID, position, spoolType, spoolAmount):
         wx.Command.__init__(self, True, 'Change Local Module Spool')
         self.internalHistory = InternalCommandHistory()
@@ -28,18 +28,18 @@ class GuiChangeLocalModuleSpoolCommand(wx.Command):
         success = self.internalHistory.submit(cmd)
         eos.db.flush()
         sFit = Fit.getInstance()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
-        wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
+        FitChangedCoalescer.getInstance().post((self.fitID,))
         return success
 
     def Undo(self):
         success = self.internalHistory.undoAll()
         eos.db.flush()
         sFit = Fit.getInstance()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
-        wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
+        FitChangedCoalescer.getInstance().post((self.fitID,))
         return success
@@ -1,15 +1,15 @@
 import wx
 
 import eos.db
-import gui.mainFrame
-from gui import globalEvents as GE
 from gui.fitCommands.calc.module.localChangeStates import CalcChangeLocalModuleStatesCommand
-from gui.fitCommands.helpers import InternalCommandHistory, restoreRemovedDummies
+from gui.fitCommands.helpers import FitChangedCoalescer, InternalCommandHistory, restoreRemovedDummies
 from service.fit import Fit
 
 
 class GuiChangeLocalModuleStatesCommand(wx.Command):
 
+    localStateOnly = True
+
     def __init__(self, fitID, mainPosition, positions, click):
         wx.Command.__init__(self, True, 'Change Local Module States')
         self.internalHistory = InternalCommandHistory()
@@ -29,10 +29,10 @@ class GuiChangeLocalModuleStatesCommand(wx.Command):
         sFit = Fit.getInstance()
         if cmd.needsGuiRecalc:
             eos.db.flush()
-            sFit.recalc(self.fitID)
+            sFit.recalcIfDirty(self.fitID)
         self.savedRemovedDummies = sFit.fill(self.fitID)
         eos.db.commit()
-        wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
+        FitChangedCoalescer.getInstance().post((self.fitID,))
         return success
 
     def Undo(self):
@@ -41,8 +41,8 @@ class GuiChangeLocalModuleStatesCommand(wx.Command):
         restoreRemovedDummies(fit, self.savedRemovedDummies)
         success = self.internalHistory.undoAll()
         eos.db.flush()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
-        wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
+        FitChangedCoalescer.getInstance().post((self.fitID,))
         return success
@@ -28,7 +28,7 @@ class GuiCloneLocalModuleCommand(wx.Command):
         fit = sFit.getFit(self.fitID)
         if cmd.needsGuiRecalc:
             eos.db.flush()
-            sFit.recalc(self.fitID)
+            sFit.recalcIfDirty(self.fitID)
         self.savedRemovedDummies = sFit.fill(self.fitID)
         eos.db.commit()
         self.savedItemID = fit.modules[self.srcPosition].itemID
@@ -45,7 +45,7 @@ class GuiCloneLocalModuleCommand(wx.Command):
         restoreRemovedDummies(fit, self.savedRemovedDummies)
         success = self.internalHistory.undoAll()
         eos.db.flush()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         if success and self.savedItemID is not None:
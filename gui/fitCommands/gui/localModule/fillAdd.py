@@ -31,7 +31,7 @@ class GuiFillWithNewLocalModulesCommand(wx.Command):
         # Only last command decides if we need to recalc here or not
         if cmd.needsGuiRecalc:
             eos.db.flush()
-            sFit.recalc(self.fitID)
+            sFit.recalcIfDirty(self.fitID)
         self.savedRemovedDummies = sFit.fill(self.fitID)
         eos.db.commit()
         success = added_modules > 0
@@ -48,7 +48,7 @@ class GuiFillWithNewLocalModulesCommand(wx.Command):
         restoreRemovedDummies(fit, self.savedRemovedDummies)
         success = self.internalHistory.undoAll()
         eos.db.flush()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(
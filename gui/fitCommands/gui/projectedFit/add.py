@@ -25,7 +25,7 @@ class GuiAddProjectedFitsCommand(wx.Command):
         success = any(results)
         sFit = Fit.getInstance()
         eos.db.flush()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
@@ -35,7 +35,7 @@ class GuiAddProjectedFitsCommand(wx.Command):
         success = self.internalHistory.undoAll()
         sFit = Fit.getInstance()
         eos.db.flush()
-        sFit.recalc(self.fitID)
+        sFit.recalcIfDirty(self.fitID)
         sFit.fill(self.fitID)
         eos.db.commit()
         wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=(self.fitID,)))
@@ -1,9 +1,12 @@
 import math
+from contextlib import contextmanager
 
 import wx
 from logbook import Logger
 
 import eos.db
+import gui.mainFrame
+from gui import globalEvents as GE
 from eos.const import FittingModuleState
 from eos.saveddata.booster import Booster
 from eos.saveddata.cargo import Cargo
@@ -11,6 +14,7 @@ from eos.saveddata.drone import Drone
 from eos.saveddata.fighter import Fighter
 from eos.saveddata.implant import Implant
 from eos.saveddata.module import Module
+from service.fit import Fit
 from service.market import Market
 from utils.repr import makeReprStr
 
@@ -24,27 +28,37 @@ class InternalCommandHistory:
         self.__buffer = wx.CommandProcessor()
 
     def submit(self, command):
-        return self.__buffer.Submit(command)
+        # Let recalc scheduler know if command left fit it changed uncalculated
+        scheduler = Fit.getInstance().recalcScheduler
+        recalcCount = scheduler.getRecalcCount(getattr(command, 'fitID', None))
+        success = self.__buffer.Submit(command)
+        scheduler.processDo(command, success, recalcCount)
+        return success
 
     def submitBatch(self, *commands):
+        scheduler = Fit.getInstance().recalcScheduler
         for command in commands:
-            if not self.__buffer.Submit(command):
+            if not self.submit(command):
                 # Undo what we already submitted
                 for commandToUndo in reversed(self.__buffer.Commands):
                     if commandToUndo in commands:
                         self.__buffer.Undo()
+                        scheduler.processUndo(commandToUndo)
                 return False
         return True
 
     def undoAll(self):
+        scheduler = Fit.getInstance().recalcScheduler
         undoneCommands = []
         # Undo commands one by one, starting from the last
         for commandToUndo in reversed(self.__buffer.Commands):
+            scheduler.processUndo(commandToUndo)
             if commandToUndo.Undo():
                 undoneCommands.append(commandToUndo)
             # If undoing fails, redo already undone commands, starting from the last undone
             else:
                 for commandToRedo in reversed(undoneCommands):
+                    scheduler.processUndo(commandToRedo)
                     if not commandToRedo.Do():
                         break
                 self.__buffer.ClearCommands()
@@ -56,6 +70,45 @@ class InternalCommandHistory:
         return len(self.__buffer.Commands)
 
 
+class FitChangedCoalescer:
+    """
+    Posts plain fit changed events of commands. While history steps are
+    replayed in batch, those events are collected instead, and single event
+    for all changed fits is posted once batch is over. Events which carry
+    extra data are not coalesced, commands post them on their own.
+    """
+    instance = None
+
+    @classmethod
+    def getInstance(cls):
+        if cls.instance is None:
+            cls.instance = FitChangedCoalescer()
+        return cls.instance
+
+    def __init__(self):
+        self.__depth = 0
+        self.__fitIDs = []
+
+    def post(self, fitIDs):
+        if self.__depth:
+            for fitID in fitIDs:
+                if fitID not in self.__fitIDs:
+                    self.__fitIDs.append(fitID)
+            return
+        wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=tuple(fitIDs)))
+
+    @contextmanager
+    def coalescing(self):
+        self.__depth += 1
+        try:
+            yield
+        finally:
+            self.__depth -= 1
+            if not self.__depth and self.__fitIDs:
+                fitIDs, self.__fitIDs = tuple(self.__fitIDs), []
+                wx.PostEvent(gui.mainFrame.MainFrame.getInstance(), GE.FitChanged(fitIDs=fitIDs))
+
+
 class ModuleInfo:
 
     def __init__(
@@ -18,6 +18,7 @@
 # =============================================================================
 
 import datetime
+import itertools
 import os.path
 import threading
 import time
@@ -50,6 +51,7 @@ from gui.chrome_tabs import ChromeNotebook
 from gui.copySelectDialog import CopySelectDialog
 from gui.devTools import DevTools
 from gui.esiFittings import EveFittings, ExportToEve, SsoCharacterMgmt
+from gui.fitCommands.helpers import FitChangedCoalescer
 from gui.mainMenuBar import MainMenuBar
 from gui.marketBrowser import MarketBrowser
 from gui.multiSwitch import MultiSwitch
@@ -144,6 +146,9 @@ class MainFrame(wx.Frame):
         super().__init__(None, wx.ID_ANY, self.title)
 
         self.supress_left_up = False
+        # Undo/redo steps requested since last time history was applied;
+        # negative for undo
+        self.pendingHistorySteps = []
 
         MainFrame.__instance = self
 
@@ -367,6 +372,31 @@ class MainFrame(wx.Frame):
         m = getattr(p, "getActiveFit", None)
         return m() if m is not None else None
 
+    def queueHistorySteps(self, step):
+        # Undo/redo requests which pile up while we are busy (e.g. with key
+        # held down) are applied together, with single recalc. They are not
+        # netted against each other: undo with nothing to undo followed by
+        # redo still has to redo
+        if not self.pendingHistorySteps:
+            wx.CallAfter(self.applyHistorySteps)
+        self.pendingHistorySteps.append(step)
+
+    def applyHistorySteps(self):
+        steps, self.pendingHistorySteps = self.pendingHistorySteps, []
+        fitID = self.getActiveFit()
+        if not steps or fitID is None:
+            return
+        # Each step reports its own change of the same fit, there is no
+        # need to refresh everything that many times
+        with FitChangedCoalescer.getInstance().coalescing():
+            # Runs of steps in the same direction are applied in one go
+            for undo, run in itertools.groupby(steps, key=lambda s: s < 0):
+                count = len(list(run))
+                if undo:
+                    self.command.undoSteps(count)
+                else:
+                    self.command.redoSteps(count)
+
     def getActiveView(self):
         self.fitMultiSwitch.GetSelectedPage()
 
@@ -531,9 +561,9 @@ class MainFrame(wx.Frame):
         # User guide
         self.Bind(wx.EVT_MENU, self.goWiki, id=menuBar.wikiId)
 
-        self.Bind(wx.EVT_MENU, lambda evt: MainFrame.getInstance().command.Undo(), id=wx.ID_UNDO)
+        self.Bind(wx.EVT_MENU, lambda evt: self.queueHistorySteps(-1), id=wx.ID_UNDO)
 
-        self.Bind(wx.EVT_MENU, lambda evt: MainFrame.getInstance().command.Redo(), id=wx.ID_REDO)
+        self.Bind(wx.EVT_MENU, lambda evt: self.queueHistorySteps(1), id=wx.ID_REDO)
         # EVE Forums
         self.Bind(wx.EVT_MENU, self.goForums, id=menuBar.forumId)
         # Save current character
@@ -8,6 +8,8 @@ from gui.builtinShipBrowser.categoryItem import CategoryItem
 from gui.builtinShipBrowser.fitItem import FitItem
 from gui.builtinShipBrowser.shipItem import ShipItem
 from service.fit import Fit
+from service.fitStats import FitStats
+from service.itemPrefetch import ItemPrefetch
 from service.market import Market
 
 from gui.builtinShipBrowser.events import EVT_SB_IMPORT_SEL, EVT_SB_STAGE1_SEL, EVT_SB_STAGE2_SEL, EVT_SB_STAGE3_SEL, EVT_SB_SEARCH_SEL
@@ -20,6 +22,9 @@ pyfalog = Logger(__name__)
 
 
 class ShipBrowser(wx.Panel):
+    # Summary attributes fits can be sorted by, in order of sorting setting values
+    FIT_SORT_ATTRS = (None, 'dps', 'ehp', 'maxSpeed', 'price')
+
     def __init__(self, parent):
         wx.Panel.__init__(self, parent, style=0)
 
@@ -97,6 +102,9 @@ class ShipBrowser(wx.Panel):
 
     def RefreshList(self, event):
         event.Skip()
+        if self.__fitStatsEnabled():
+            # Changes are committed by now, keep stored summaries of changed fits fresh
+            FitStats.getInstance().scheduleUpdate(event.fitIDs, self.OnFitStatsCalculated)
         activeFitID = self.mainFrame.getActiveFit()
         if activeFitID is not None and activeFitID not in event.fitIDs:
             return
@@ -207,6 +215,8 @@ class ShipBrowser(wx.Panel):
         sFit = Fit.getInstance()
 
         ships.sort(key=self.raceNameKey)
+        # Ship objects come from worker thread, warm up ones UI will look up on click
+        ItemPrefetch.getInstance().prefetchShips([ship.ID for ship in ships])
         racesList = []
         subRacesFilter = {}
         t_fits = 0  # total number of fits in this category
@@ -285,6 +295,33 @@ class ShipBrowser(wx.Panel):
     def nameKey(info):
         return info[1]
 
+    @staticmethod
+    def __fitStatsEnabled():
+        options = Fit.getInstance().serviceFittingOptions
+        return options["showShipBrowserFitStats"] or options["shipBrowserFitSort"] != 0
+
+    def getFitStats(self, fitIDs):
+        """Get stored stats summaries of listed fits, missing ones are calculated in background"""
+        sFitStats = FitStats.getInstance()
+        # Summaries requested for previously listed fits are not needed anymore
+        sFitStats.cancelUpdates(self.OnFitStatsCalculated)
+        if not self.__fitStatsEnabled():
+            return {}
+        return sFitStats.getSummaries(fitIDs, self.OnFitStatsCalculated)
+
+    def fitStatsKey(self, fitStats, fitID, name):
+        """Sort fits by summary attribute chosen in settings, highest first; fits without summary go last"""
+        attr = self.FIT_SORT_ATTRS[Fit.getInstance().serviceFittingOptions["shipBrowserFitSort"]]
+        summary = fitStats.get(fitID)
+        if attr is None or summary is None:
+            return 1, 0, name
+        return 0, -getattr(summary, attr), name
+
+    def OnFitStatsCalculated(self, fitID, summary):
+        for widget in self.lpane.GetWidgetList():
+            if isinstance(widget, FitItem) and widget.fitID == fitID:
+                widget.SetFitStats(summary)
+
     def stage3(self, event):
         self.navpanel.ToggleRecentShips(False, False)
         self.lpane.ShowLoading(False)
@@ -329,7 +366,8 @@ class ShipBrowser(wx.Panel):
             self.raceselect.Show(False)
             self.Layout()
 
-        fitList.sort(key=self.nameKey)
+        fitStats = self.getFitStats([f[0] for f in fitList])
+        fitList.sort(key=lambda f: self.fitStatsKey(fitStats, f[0], f[1]))
         shipName = ship.name
 
         self._stage3ShipName = shipName
@@ -338,7 +376,8 @@ class ShipBrowser(wx.Panel):
         shipTrait = ship.traits.display if (ship.traits is not None) else ""  # empty string if no traits
 
         for ID, name, booster, timestamp, notes, graphicID in fitList:
-            self.lpane.AddWidget(FitItem(self.lpane, ID, (shipName, shipTrait, name, booster, timestamp, notes), shipID, graphicID=graphicID))
+            self.lpane.AddWidget(FitItem(self.lpane, ID, (shipName, shipTrait, name, booster, timestamp, notes), shipID,
+                                         graphicID=graphicID, fitStats=fitStats.get(ID)))
 
         self.lpane.RefreshList()
         self.lpane.Thaw()
@@ -370,6 +409,9 @@ class ShipBrowser(wx.Panel):
         if query:
             ships = sMkt.searchShips(query)
             fitList = sFit.searchFits(query)
+            fitStats = self.getFitStats([f[0] for f in fitList])
+            if sFit.serviceFittingOptions["shipBrowserFitSort"] != 0:
+                fitList.sort(key=lambda f: self.fitStatsKey(fitStats, f[0], f[1]))
 
             for ship in ships:
                 shipTrait = ship.traits.display if (ship.traits is not None) else ""  # empty string if no traits
@@ -386,7 +428,8 @@ class ShipBrowser(wx.Panel):
 
                 shipTrait = ship.traits.display if (ship.traits is not None) else ""  # empty string if no traits
 
-                self.lpane.AddWidget(FitItem(self.lpane, ID, (shipName, shipTrait, name, booster, timestamp, notes), shipID, graphicID=ship.graphicID))
+                self.lpane.AddWidget(FitItem(self.lpane, ID, (shipName, shipTrait, name, booster, timestamp, notes), shipID,
+                                             graphicID=ship.graphicID, fitStats=fitStats.get(ID)))
             if len(ships) == 0 and len(fitList) == 0:
                 self.lpane.AddWidget(PFStaticText(self.lpane, label="No matching results."))
             self.lpane.RefreshList(doFocus=False)
@@ -420,6 +463,8 @@ class ShipBrowser(wx.Panel):
         self.lpane.Freeze()
         self.lpane.RemoveAllChildren()
 
+        fitStats = self.getFitStats([fit[0] for fit in fits or ()])
+
         if fits:
             for fit in fits:
                 shipItem = fit[3]
@@ -437,7 +482,8 @@ class ShipBrowser(wx.Panel):
                         fit[4]
                     ),
                     shipItem.ID,
-                    graphicID=shipItem.graphicID
+                    graphicID=shipItem.graphicID,
+                    fitStats=fitStats.get(fit[0])
                 ))
             self.lpane.RefreshList(doFocus=False)
         self.lpane.Thaw()
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import threading
 import time
 # noinspection PyPackageRequirements
@@ -13,6 +15,14 @@ from eos.db import getFit
 pyfalog = Logger(__name__)
 
 
+EFT_OPTIONS = {
+    PortEftOptions.IMPLANTS: True,
+    PortEftOptions.MUTATIONS: True,
+    PortEftOptions.LOADED_CHARGES: True,
+    PortEftOptions.BOOSTERS: True,
+    PortEftOptions.CARGO: True}
+
+
 class exportHtml:
     _instance = None
 
@@ -24,23 +34,28 @@ class exportHtml:
         return cls._instance
 
     def __init__(self):
-        self.thread = exportHtmlThread()
+        # Rendered export text per fit, {fitID: (fitStamp, minimal, text)}. Shared
+        # between export runs so that only fits modified since the last run get
+        # loaded and exported again
+        self.fitCache = {}
+        self.thread = exportHtmlThread(fitCache=self.fitCache)
 
     def refreshFittingHtml(self, force=False, progress=None):
         settings = HTMLExportSettings.getInstance()
 
         if force or settings.getEnabled():
             self.thread.stop()
-            self.thread = exportHtmlThread(progress)
+            self.thread = exportHtmlThread(progress, fitCache=self.fitCache)
             self.thread.start()
 
 
 class exportHtmlThread(threading.Thread):
-    def __init__(self, progress=False):
+    def __init__(self, progress=False, fitCache=None):
         threading.Thread.__init__(self)
         self.name = "HTMLExport"
         self.progress = progress
         self.stopRunning = False
+        self.fitCache = fitCache if fitCache is not None else {}
 
     def stop(self):
         self.stopRunning = True
@@ -57,18 +72,33 @@ class exportHtmlThread(threading.Thread):
 
         minimal = settings.getMinimalEnabled()
         dnaUrl = "https://o.smium.org/loadout/dna/"
-
-        if minimal:
-            HTML = self.generateMinimalHTML(sMkt, sFit, dnaUrl)
-        else:
-            HTML = self.generateFullHTML(sMkt, sFit, dnaUrl)
+        path = settings.getPath()
+        tmpPath = None
+        replaced = False
 
         try:
-            FILE = open(settings.getPath(), "w", encoding='utf-8')
-            FILE.write(HTML)
-            FILE.close()
+            groups = self.getFitGroups(sMkt, sFit)
+            if minimal:
+                chunks = self.generateMinimalHTML(groups, dnaUrl)
+            else:
+                chunks = self.generateFullHTML(groups, dnaUrl)
+            # Stream into a temporary file next to the target, and swap it in only
+            # once it is complete, so that readers never see a half-written export.
+            # Every run gets its own file, as runs may overlap
+            fd, tmpPath = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+            with os.fdopen(fd, "w", encoding='utf-8') as FILE:
+                for chunk in chunks:
+                    if self.stopRunning:
+                        break
+                    FILE.write(chunk)
+            if self.stopRunning:
+                return
+            # Temporary files are readable only by their owner
+            os.chmod(tmpPath, 0o644)
+            os.replace(tmpPath, path)
+            replaced = True
         except IOError as ex:
-            pyfalog.warning("Failed to write to " + settings.getPath())
+            pyfalog.warning("Failed to write to " + path)
             pass
         except (KeyboardInterrupt, SystemExit):
             raise
@@ -76,16 +106,65 @@ class exportHtmlThread(threading.Thread):
             if self.progress:
                 self.progress.error = f'{e}'
         finally:
+            if tmpPath is not None and not replaced:
+                try:
+                    os.remove(tmpPath)
+                except OSError:
+                    pass
             if self.progress:
                 self.progress.current += 1
                 self.progress.workerWorking = False
 
-    def generateFullHTML(self, sMkt, sFit, dnaUrl):
-        """ Generate the complete HTML with styling and javascript """
+    def getFitGroups(self, sMkt, sFit):
+        """
+        Collect fits to export as [(group, [(ship, fits), ...]), ...], sorted by
+        name and skipping ships and groups without fits
+        """
+        groups = []
+        categoryList = list(sMkt.getShipRoot())
+        categoryList.sort(key=lambda _ship: _ship.name)
+        for group in categoryList:
+            ships = list(sMkt.getShipList(group.ID))
+            ships.sort(key=lambda _ship: _ship.name)
+            shipFits = []
+            for ship in ships:
+                fits = sFit.getFitsWithShip(ship.ID)
+                if len(fits) > 0:
+                    shipFits.append((ship, fits))
+            if shipFits:
+                groups.append((group, shipFits))
+        # Forget fits which are gone since the last export
+        fitIDs = set(fit[0] for _, shipFits in groups for _, fits in shipFits for fit in fits)
+        for fitID in set(self.fitCache).difference(fitIDs):
+            del self.fitCache[fitID]
+        return groups
+
+    def getFitExport(self, fitInfo, minimal):
+        """
+        Return EFT (or DNA for minimal export) text for fit, loading and exporting
+        the fit only if it has been modified since it was last cached
+        """
+        fitID, stamp = fitInfo[0], fitInfo[3]
+        cached = self.fitCache.get(fitID)
+        if cached is not None and cached[0] == stamp and cached[1] == minimal:
+            return cached[2]
+        if minimal:
+            text = Port.exportDna(getFit(fitID))
+        else:
+            text = Port.exportEft(getFit(fitID), options=EFT_OPTIONS)
+        self.fitCache[fitID] = (stamp, minimal, text)
+        return text
+
+    def updateProgress(self, count):
+        if self.progress:
+            self.progress.current = count
+
+    def generateFullHTML(self, groups, dnaUrl):
+        """ Generate the complete HTML with styling and javascript, yielding it in chunks """
         timestamp = time.localtime(time.time())
         localDate = "%d/%02d/%02d %02d:%02d" % (timestamp[0], timestamp[1], timestamp[2], timestamp[3], timestamp[4])
 
-        HTML = """
+        yield """
 <!DOCTYPE html>
 <html>
   <head>
@@ -179,185 +258,118 @@ class exportHtmlThread(threading.Thread):
   </div>
   <div data-role="content">
 """ % (time.time(), dnaUrl, localDate)
-        
-        HTML += '  <ul data-role="listview" class="ui-listview-outer" data-inset="true" data-filter="true">\n'
-        categoryList = list(sMkt.getShipRoot())
-        categoryList.sort(key=lambda _ship: _ship.name)
+
+        yield '  <ul data-role="listview" class="ui-listview-outer" data-inset="true" data-filter="true">\n'
 
         count = 0
+        # Fit entries rendered for the first section, reused for the second one
+        fitEntries = {}
 
-        for group in categoryList:
+        for group, shipFits in groups:
             # init market group string to give ships something to attach to
             HTMLgroup = ''
 
-            ships = list(sMkt.getShipList(group.ID))
-            ships.sort(key=lambda _ship: _ship.name)
-
             # Keep track of how many ships per group
             groupFits = 0
-            for ship in ships:
-                fits = sFit.getFitsWithShip(ship.ID)
-
-                if len(fits) > 0:
-                    groupFits += len(fits)
-                    HTMLship = (
-                        '        <li data-role="collapsible" data-iconpos="right" data-shadow="false" '
-                        'data-corners="false">\n'
-                        '        <h2>' + ship.name + ' <span class="ui-li-count">' + str(
-                            len(fits)) + '</span></h2>\n'
-                                         '          <ul data-role="listview" data-shadow="false" data-inset="true" '
-                                         'data-corners="false">\n'
-                    )
-
-                    for fit in fits:
-                        if self.stopRunning:
-                            return
-                        try:
-                            eftFit = Port.exportEft(getFit(fit[0]), options={
-                                PortEftOptions.IMPLANTS: True,
-                                PortEftOptions.MUTATIONS: True,
-                                PortEftOptions.LOADED_CHARGES: True,
-                                PortEftOptions.BOOSTERS: True,
-                                PortEftOptions.CARGO: True})
-
-                            HTMLfit = (
-                                    '           <li data-role="collapsible" data-iconpos="right" data-shadow="false" '
-                                    'data-corners="false">\n'
-                                    '           <h2>' + fit[1] + '</h2>\n'
-                                    '               <ul data-role="listview" data-shadow="false" data-inset="true" '
-                                                                 'data-corners="false">\n'
-                            )
-
-                            HTMLfit += '                   <li><pre>' + eftFit + '\n                   </pre></li>\n'
-
-                            HTMLfit += '              </ul>\n          </li>\n'
-                            HTMLship += HTMLfit
-                        except (KeyboardInterrupt, SystemExit):
-                            raise
-                        except:
-                            pyfalog.warning("Failed to export line")
-                            continue
-                        finally:
-                            if self.progress:
-                                self.progress.current = count
-                            count += 1
-                    HTMLgroup += HTMLship + ('          </ul>\n'
-                                             '        </li>\n')
-
-            if groupFits > 0:
-                # Market group header
-                HTML += (
-                    '    <li data-role="collapsible" data-iconpos="right" data-shadow="false" data-corners="false">\n'
-                    '      <h2>' + group.name + ' <span class="ui-li-count">' + str(groupFits) + '</span></h2>\n'
-                    '      <ul data-role="listview" data-shadow="false" data-inset="true" data-corners="false">\n' +
-                    HTMLgroup +
-                    '      </ul>\n'
-                    '    </li>'
+            for ship, fits in shipFits:
+                groupFits += len(fits)
+                HTMLship = (
+                    '        <li data-role="collapsible" data-iconpos="right" data-shadow="false" '
+                    'data-corners="false">\n'
+                    '        <h2>' + ship.name + ' <span class="ui-li-count">' + str(
+                        len(fits)) + '</span></h2>\n'
+                                     '          <ul data-role="listview" data-shadow="false" data-inset="true" '
+                                     'data-corners="false">\n'
                 )
 
-        HTML += """
+                for fit in fits:
+                    if self.stopRunning:
+                        return
+                    try:
+                        eftFit = self.getFitExport(fit, False)
+                        HTMLbody = (
+                            '               <ul data-role="listview" data-shadow="false" data-inset="true" '
+                            'data-corners="false">\n'
+                            '                   <li><pre>' + eftFit + '\n                   </pre></li>\n'
+                            '              </ul>\n          </li>\n'
+                        )
+                        fitEntries[fit[0]] = HTMLbody
+
+                        HTMLship += (
+                            '           <li data-role="collapsible" data-iconpos="right" data-shadow="false" '
+                            'data-corners="false">\n'
+                            '           <h2>' + fit[1] + '</h2>\n' + HTMLbody
+                        )
+                    except (KeyboardInterrupt, SystemExit):
+                        raise
+                    except:
+                        pyfalog.warning("Failed to export line")
+                        continue
+                    finally:
+                        self.updateProgress(count)
+                        count += 1
+                HTMLgroup += HTMLship + ('          </ul>\n'
+                                         '        </li>\n')
+
+            # Market group header
+            yield (
+                '    <li data-role="collapsible" data-iconpos="right" data-shadow="false" data-corners="false">\n'
+                '      <h2>' + group.name + ' <span class="ui-li-count">' + str(groupFits) + '</span></h2>\n'
+                '      <ul data-role="listview" data-shadow="false" data-inset="true" data-corners="false">\n' +
+                HTMLgroup +
+                '      </ul>\n'
+                '    </li>'
+            )
+
+        yield """
   </ul>
  </div>
   <div data-role="header">
     <h1>Pyfa fits by Name</h1>
   </div>
   <div data-role="content">
-""" 
-        HTML += '  <ul data-role="listview" class="ui-listview-outer" data-inset="true" data-filter="true">\n'
-        categoryList = list(sMkt.getShipRoot())
-        categoryList.sort(key=lambda _ship: _ship.name)
-
-        count = 0
-
-        for group in categoryList:
-            # init market group string to give ships something to attach to
-            HTMLgroup = ''
+"""
+        yield '  <ul data-role="listview" class="ui-listview-outer" data-inset="true" data-filter="true">\n'
 
-            ships = list(sMkt.getShipList(group.ID))
-            ships.sort(key=lambda _ship: _ship.name)
-
-            # Keep track of how many ships per group
-            groupFits = 0
-            for ship in ships:
-                fits = sFit.getFitsWithShip(ship.ID)
+        for group, shipFits in groups:
+            for ship, fits in shipFits:
+                for fit in fits:
+                    if self.stopRunning:
+                        return
+                    HTMLbody = fitEntries.get(fit[0])
+                    if HTMLbody is None:
+                        continue
+                    yield (
+                        '           <li data-role="collapsible" data-iconpos="right" data-shadow="false" '
+                        'data-corners="false">\n'
+                        '           <h2>' + ship.name + " - " + fit[1] + '</h2>\n' + HTMLbody
+                    )
 
-                if len(fits) > 0:
-                    groupFits += len(fits)
-
-                    for fit in fits:
-                        if self.stopRunning:
-                            return
-                        try:
-                            eftFit = Port.exportEft(getFit(fit[0]), options={
-                                PortEftOptions.IMPLANTS: True,
-                                PortEftOptions.MUTATIONS: True,
-                                PortEftOptions.LOADED_CHARGES: True,
-                                PortEftOptions.BOOSTERS: True,
-                                PortEftOptions.CARGO: True})
-
-                            HTMLfit = (
-                                    '           <li data-role="collapsible" data-iconpos="right" data-shadow="false" '
-                                    'data-corners="false">\n'
-                                    '           <h2>' + ship.name + " - " + fit[1] + '</h2>\n'
-                                    '               <ul data-role="listview" data-shadow="false" data-inset="true" '
-                                                                 'data-corners="false">\n'
-                            )
-
-                            HTMLfit += '                   <li><pre>' + eftFit + '\n                   </pre></li>\n'
-
-                            HTMLfit += '              </ul>\n          </li>\n'
-                            HTML += HTMLfit
-                        except (KeyboardInterrupt, SystemExit):
-                            raise
-                        except:
-                            pyfalog.warning("Failed to export line")
-                            continue
-                        finally:
-                            if self.progress:
-                                self.progress.current = count
-                            count += 1
-
-        HTML += """
+        yield """
   </ul>
  </div>
 </div>
 </body>
 </html>"""
 
-        return HTML
-
-    def generateMinimalHTML(self, sMkt, sFit, dnaUrl):
-        """ Generate a minimal HTML version of the fittings, without any javascript or styling"""
-        categoryList = list(sMkt.getShipRoot())
-        categoryList.sort(key=lambda _ship: _ship.name)
-
+    def generateMinimalHTML(self, groups, dnaUrl):
+        """ Generate a minimal HTML version of the fittings, without any javascript or styling, yielding it in chunks """
         count = 0
-        HTML = ''
-        for group in categoryList:
-            # init market group string to give ships something to attach to
-
-            ships = list(sMkt.getShipList(group.ID))
-            ships.sort(key=lambda _ship: _ship.name)
-
-            ships.sort(key=lambda _ship: _ship.name)
-
-            for ship in ships:
-                fits = sFit.getFitsWithShip(ship.ID)
+        for group, shipFits in groups:
+            for ship, fits in shipFits:
                 for fit in fits:
                     if self.stopRunning:
                         return
                     try:
-                        dnaFit = Port.exportDna(getFit(fit[0]))
-                        HTML += '<a class="outOfGameBrowserLink" target="_blank" href="' + dnaUrl + dnaFit + '">' \
-                                + ship.name + ': ' + \
-                                fit[1] + '</a><br> \n'
+                        dnaFit = self.getFitExport(fit, True)
+                        yield '<a class="outOfGameBrowserLink" target="_blank" href="' + dnaUrl + dnaFit + '">' \
+                              + ship.name + ': ' + \
+                              fit[1] + '</a><br> \n'
                     except (KeyboardInterrupt, SystemExit):
                         raise
                     except:
                         pyfalog.error("Failed to export line")
                         continue
                     finally:
-                        if self.progress:
-                            self.progress.current = count
+                        self.updateProgress(count)
                         count += 1
-        return HTML
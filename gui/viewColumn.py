@@ -29,6 +29,9 @@ class ViewColumn:
     """
     columns = {}
     proportionWidth = 1
+    # Cacheable columns show data which depends only on row item and fit
+    # it belongs to, and can be reused by display until that fit changes
+    cacheable = False
 
     def __init__(self, fittingView):
         self.fittingView = fittingView
@@ -59,6 +62,10 @@ class ViewColumn:
     def getImageId(self, mod):
         return -1
 
+    def getCacheStamp(self):
+        """Return value reflecting settings which affect text of cacheable column."""
+        return None
+
     @staticmethod
     def getParameters():
         return tuple()
@@ -25,6 +25,7 @@ import sys
 from optparse import AmbiguousOptionError, BadOptionError, OptionParser
 
 import config
+from utils.startupProfile import StartupProfile
 from service.prereqsCheck import PreCheckException, PreCheckMessage, version_block, version_precheck
 from db_update import db_needs_update, update_db
 
@@ -72,16 +73,20 @@ parser.add_option("-d", "--debug", action="store_true", dest="debug", help="Set
 parser.add_option("-t", "--title", action="store", dest="title", help="Set Window Title", default=None)
 parser.add_option("-s", "--savepath", action="store", dest="savepath", help="Set the folder for savedata", default=None)
 parser.add_option("-l", "--logginglevel", action="store", dest="logginglevel", help="Set desired logging level [Critical|Error|Warning|Info|Debug]", default="Error")
-parser.add_option("-p", "--profile", action="store", dest="profile_path", help="Set location to save profileing.", default=None)
+parser.add_option("-p", "--profile", action="store", dest="profile_path", help="Set location to save profileing and startup profile report.", default=None)
 parser.add_option("-i", "--language", action="store", dest="language", help="Sets the language for pyfa. Overrides user's saved settings. Format: xx_YY (eg: en_US). If translation doesn't exist, defaults to en_US", default=None)
 
 (options, args) = parser.parse_args()
 
 if __name__ == "__main__":
 
+    startupProfile = StartupProfile.getInstance()
+    startupProfile.installImportHook()
+
     try:
         # first and foremost - check required libraries
-        version_precheck()
+        with startupProfile.phase("library check"):
+            version_precheck()
     except PreCheckException as ex:
         # do not pass GO, go directly to jail (and then die =/)
         PreCheckMessage(str(ex))
@@ -107,8 +112,9 @@ if __name__ == "__main__":
 
     config.language = options.language
 
-    config.defPaths(options.savepath)
-    config.defLogging()
+    with startupProfile.phase("configuration"):
+        config.defPaths(options.savepath)
+        config.defLogging()
 
     with config.logging_setup.threadbound():
 
@@ -122,33 +128,53 @@ if __name__ == "__main__":
         else:
             pyfalog.info("Running in a thawed state.")
 
-        if db_needs_update() is True:
-            update_db()
+        with startupProfile.phase("gamedata update check"):
+            if db_needs_update() is True:
+                update_db()
 
         # Lets get to the good stuff, shall we?
-        import eos.db
-        import eos.events  # todo: move this to eos initialization?
+        with startupProfile.phase("database setup"):
+            import eos.db
+            import eos.events  # todo: move this to eos initialization?
+
+            # noinspection PyUnresolvedReferences
+            import service.prefetch  # noqa: F401
+
+            # Make sure the saveddata db exists
+            if not os.path.exists(config.savePath):
+                os.mkdir(config.savePath)
 
-        # noinspection PyUnresolvedReferences
-        import service.prefetch  # noqa: F401
+            eos.db.saveddata_meta.create_all()
 
-        # Make sure the saveddata db exists
-        if not os.path.exists(config.savePath):
-            os.mkdir(config.savePath)
+        with startupProfile.phase("application init"):
+            from gui.app import PyfaApp
 
-        eos.db.saveddata_meta.create_all()
-        from gui.app import PyfaApp
+            # set title if it wasn't supplied by argument
+            if options.title is None:
+                options.title = "pyfa %s - Python Fitting Assistant" % (config.getVersion())
 
-        # set title if it wasn't supplied by argument
-        if options.title is None:
-            options.title = "pyfa %s - Python Fitting Assistant" % (config.getVersion())
+            pyfa = PyfaApp(False)
 
-        pyfa = PyfaApp(False)
+        with startupProfile.phase("main window"):
+            from gui.mainFrame import MainFrame
 
-        from gui.mainFrame import MainFrame
+            mf = MainFrame(options.title)
+            ErrorHandler.SetParent(mf)
 
-        mf = MainFrame(options.title)
-        ErrorHandler.SetParent(mf)
+        def reportStartup():
+            # Called once main loop processes its first events, i.e. when window is interactive
+            startupProfile.removeImportHook()
+            report = startupProfile.report()
+            pyfalog.info(report)
+            if options.profile_path:
+                report_path = os.path.join(options.profile_path, 'pyfa-startup-{}.txt'.format(datetime.datetime.now().strftime('%Y%m%d_%H%M%S')))
+                try:
+                    with open(report_path, 'w') as f:
+                        f.write(report + '\n')
+                except IOError:
+                    pyfalog.warning("Failed to write startup profile to {}", report_path)
+
+        wx.CallAfter(reportStartup)
 
         if options.profile_path:
             profile_path = os.path.join(options.profile_path, 'pyfa-{}.profile'.format(datetime.datetime.now().strftime('%Y%m%d_%H%M%S')))
@@ -172,5 +198,12 @@ if __name__ == "__main__":
         for t in stoppableThreads:
             t.join(timeout=timer.remainder())
 
+        # Everything is written, let next start know it can skip database
+        # validation - unless background validation is still running
+        if not any(t.name == "DatabaseValidation" for t in threading.enumerate()):
+            from eos.db import migration
+            from eos.db.saveddata.databaseRepair import IntegrityMarker
+            IntegrityMarker(config.saveDB).write(migration.getVersion(eos.db.saveddata_engine))
+
         # Nah, just kidding, no way to terminate threads - just try to exit
         sys.exit()
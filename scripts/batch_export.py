@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Export EFS data and ship stats of many fits at once, using worker processes.
+
+Results are written as JSON lines, one object per fit. Exports all fits
+unless fit IDs are given.
+
+    python scripts/batch_export.py [-s savepath] [-o fits.jsonl] [-w 4] [-f efs,stats] [fitID ...]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+# Add pyfa root path to sys.path so we can import ourselves
+path = os.path.dirname(__file__)
+sys.path.append(os.path.realpath(os.path.join(path, "..")))
+
+
+def main(args):
+    import config
+    config.saveInRoot = args.root
+    config.defPaths(args.savepath)
+    from service.port.batchExport import ALL_FORMATS, exportFits, getFitIDsByShip
+
+    formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+    unknown = set(formats).difference(ALL_FORMATS)
+    if unknown:
+        sys.exit('Unknown formats: {}'.format(', '.join(sorted(unknown))))
+    fitIDs = getFitIDsByShip(args.fitIDs or None)
+    print('Exporting {} fits to {}'.format(len(fitIDs), args.output))
+
+    def progress(done, total):
+        if done % 100 == 0 or done == total:
+            print('  {}/{}'.format(done, total))
+
+    stats = exportFits(fitIDs, args.output, formats=formats, workers=args.workers, progress=progress)
+    print('Done: {fits} fits ({errors} failed) in {elapsed:.1f}s, {fitsPerSecond:.1f} fits/s with {workers} workers'.format(**stats))
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('fitIDs', nargs='*', type=int, help='IDs of fits to export, all fits by default')
+    parser.add_argument('-s', '--savepath', help='folder with pyfa saved data', default=None)
+    parser.add_argument('-r', '--root', action='store_true', help='use saved data stored in pyfa root folder')
+    parser.add_argument('-o', '--output', help='file to write JSON lines into', default='fits.jsonl')
+    parser.add_argument('-w', '--workers', type=int, help='amount of worker processes, CPU count by default', default=None)
+    parser.add_argument('-f', '--formats', help='comma-separated formats to export (efs, stats)', default='efs,stats')
+    main(parser.parse_args())
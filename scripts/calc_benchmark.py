@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Benchmark eos calculation engine on set of representative fits.
+
+Every scenario is imported from EFT text into temporary saved data, and then
+measured for recalc latency, capacitor simulation time, graph sweep time,
+EFT import/export throughput and memory used by calculation. Results are
+written as JSON, and can be compared with results of another run, e.g. made
+on a different commit. Runs headless, using gamedata from pyfa folder.
+
+    python scripts/calc_benchmark.py [-o results.json] [-c baseline.json] [-n 20] [-s scenario ...]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+
+# Add pyfa root path to sys.path so we can import ourselves
+path = os.path.dirname(__file__)
+sys.path.append(os.path.realpath(os.path.join(path, "..")))
+
+RESULTS_VERSION = 1
+
+FRIGATE = """[Rifter, Benchmark Rifter]
+Damage Control II
+Small Armor Repairer II
+Multispectrum Coating II
+
+5MN Y-T8 Compact Microwarpdrive
+Warp Scrambler II
+Stasis Webifier II
+
+200mm AutoCannon II, Republic Fleet EMP S
+200mm AutoCannon II, Republic Fleet EMP S
+200mm AutoCannon II, Republic Fleet EMP S
+
+Small Projectile Burst Aerator I
+Small Projectile Collision Accelerator I
+
+
+Warrior II x2
+"""
+
+STRATEGIC_CRUISER = """[Legion, Benchmark Legion]
+Damage Control II
+Multispectrum Energized Membrane II
+Multispectrum Energized Membrane II
+Medium Armor Repairer II
+Heat Sink II
+Heat Sink II
+
+50MN Microwarpdrive II
+Warp Scrambler II
+Stasis Webifier II
+Medium Capacitor Booster II, Navy Cap Booster 800
+
+Heavy Pulse Laser II, Scorch M
+Heavy Pulse Laser II, Scorch M
+Heavy Pulse Laser II, Scorch M
+Heavy Pulse Laser II, Scorch M
+Heavy Pulse Laser II, Scorch M
+
+Medium Trimark Armor Pump I
+Medium Trimark Armor Pump I
+
+Legion Core - Dissolution Sequencer
+Legion Defensive - Covert Reconfiguration
+Legion Offensive - Liquid Crystal Magnifiers
+Legion Propulsion - Intercalated Nanofibers
+
+
+Hammerhead II x5
+"""
+
+ADAPTIVE_ARMOR = """[Abaddon, Benchmark Abaddon]
+Reactive Armor Hardener
+Damage Control II
+Large Armor Repairer II
+Large Armor Repairer II
+Heat Sink II
+Heat Sink II
+Heat Sink II
+
+Large Micro Jump Drive
+Large Cap Battery II
+Heavy Capacitor Booster II, Navy Cap Booster 800
+Sensor Booster II
+
+Mega Pulse Laser II, Scorch L
+Mega Pulse Laser II, Scorch L
+Mega Pulse Laser II, Scorch L
+Mega Pulse Laser II, Scorch L
+Mega Pulse Laser II, Scorch L
+Mega Pulse Laser II, Scorch L
+Mega Pulse Laser II, Scorch L
+Mega Pulse Laser II, Scorch L
+
+Large Auxiliary Nano Pump I
+Large Auxiliary Nano Pump I
+Large Auxiliary Nano Pump I
+
+
+Hammerhead II x5
+"""
+
+CAPITAL = """[Thanatos, Benchmark Thanatos]
+Capital Armor Repairer II
+Damage Control II
+Fighter Support Unit II
+Fighter Support Unit II
+Multispectrum Energized Membrane II
+Multispectrum Energized Membrane II
+
+Capital Capacitor Booster II, Navy Cap Booster 3200
+Omnidirectional Tracking Link II
+Omnidirectional Tracking Link II
+
+Capital Trimark Armor Pump I
+Capital Trimark Armor Pump I
+Capital Trimark Armor Pump I
+
+
+Firbolg x9
+Firbolg x9
+Templar x9
+"""
+
+CAP_INJECTOR = """[Curse, Benchmark Curse]
+Damage Control II
+Drone Damage Amplifier II
+Drone Damage Amplifier II
+Capacitor Power Relay II
+
+Medium Capacitor Booster II, Navy Cap Booster 800
+10MN Afterburner II
+Large Shield Extender II
+Warp Disruptor II
+Tracking Disruptor II
+
+Heavy Energy Neutralizer II
+Heavy Energy Neutralizer II
+Heavy Energy Nosferatu II
+Heavy Energy Nosferatu II
+
+Medium Capacitor Control Circuit I
+Medium Capacitor Control Circuit I
+
+
+Hammerhead II x5
+"""
+
+FLEET_COMMAND = """[Damnation, Benchmark Damnation]
+Damage Control II
+Multispectrum Energized Membrane II
+Large Armor Repairer II
+
+Large Cap Battery II
+
+Armor Command Burst II, Armor Reinforcement Charge
+Armor Command Burst II, Rapid Repair Charge
+Information Command Burst II, Sensor Optimization Charge
+"""
+
+FLEET_LOGISTICS = """[Guardian, Benchmark Guardian]
+Damage Control II
+Large Armor Repairer II
+
+Large Cap Battery II
+
+Large Remote Armor Repairer II
+Large Remote Armor Repairer II
+Large Remote Armor Repairer II
+Large Remote Capacitor Transmitter II
+"""
+
+# Format: {name: (main fit, ((command fit), ...), ((projected fit, amount), ...))}
+SCENARIOS = {
+    'frigate': (FRIGATE, (), ()),
+    'strategicCruiser': (STRATEGIC_CRUISER, (), ()),
+    'adaptiveArmor': (ADAPTIVE_ARMOR, (), ()),
+    'capitalFighters': (CAPITAL, (), ()),
+    'fleet': (STRATEGIC_CRUISER, (FLEET_COMMAND, FLEET_COMMAND), ((FLEET_LOGISTICS, 10), (FRIGATE, 5))),
+    'capInjector': (CAP_INJECTOR, (), ())}
+
+# Format: ((graph internal name, x spec key, y spec key, needs target))
+GRAPH_SWEEPS = (
+    ('capacitorGraph', ('time', 's'), ('capAmount', 'GJ'), False),
+    ('dmgStatsGraph', ('distance', 'km'), ('dps', None), True))
+
+# Same as inputs passed from graph control panel
+InputData = namedtuple('InputData', ('handle', 'unit', 'value'))
+
+
+def getCommit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(func, repeat):
+    """Run func repeat times, return timing stats in milliseconds."""
+    gc.collect()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {
+        'runs': repeat,
+        'median': statistics.median(times),
+        'mean': statistics.mean(times),
+        'min': min(times),
+        'max': max(times)}
+
+
+def importFit(text):
+    from service.port import Port
+    importType, fits = Port.importFitFromBuffer(text)
+    if not fits:
+        raise ValueError('Failed to import fit: {}'.format(text.splitlines()[0]))
+    return fits[0]
+
+
+def buildScenario(name):
+    import eos.db
+    from gui.fitCommands.calc.commandFit.add import CalcAddCommandCommand
+    from gui.fitCommands.calc.projectedFit.add import CalcAddProjectedFitCommand
+    mainText, commandTexts, projectedSpecs = SCENARIOS[name]
+    fit = importFit(mainText)
+    for commandText in commandTexts:
+        commandFit = importFit(commandText)
+        CalcAddCommandCommand(fitID=fit.ID, commandFitID=commandFit.ID).Do()
+    for projectedText, amount in projectedSpecs:
+        projectedFit = importFit(projectedText)
+        CalcAddProjectedFitCommand(fitID=fit.ID, projectedFitID=projectedFit.ID, amount=amount).Do()
+    eos.db.commit()
+    return fit
+
+
+def checkInputConditions(inputDef, xSpec, ySpec):
+    if not inputDef.conditions:
+        return True
+    for xCond, yCond in inputDef.conditions:
+        xMatch = xCond is None or (xSpec.handle, xSpec.unit) == tuple(xCond)
+        yMatch = yCond is None or (ySpec.handle, ySpec.unit) == tuple(yCond)
+        if xMatch and yMatch:
+            return True
+    return False
+
+
+def getGraphInputs(graph, xSpec, ySpec):
+    """Return main and misc inputs with default values, like graph window would do."""
+    mainDef = graph.inputMap[xSpec.mainInput]
+    mainInput = InputData(handle=mainDef.handle, unit=mainDef.unit, value=mainDef.defaultRange)
+    miscInputs = []
+    handledHandles = {mainDef.handle}
+    for vectorDef in (graph.srcVectorDef, graph.tgtVectorDef):
+        if vectorDef is None:
+            continue
+        if vectorDef.lengthHandle not in handledHandles:
+            miscInputs.append(InputData(handle=vectorDef.lengthHandle, unit=vectorDef.lengthUnit, value=0))
+        miscInputs.append(InputData(handle=vectorDef.angleHandle, unit=vectorDef.angleUnit, value=0))
+        handledHandles.update((vectorDef.lengthHandle, vectorDef.angleHandle))
+    for inputDef in graph.inputs:
+        if inputDef.handle in handledHandles or not checkInputConditions(inputDef, xSpec, ySpec):
+            continue
+        handledHandles.add(inputDef.handle)
+        miscInputs.append(InputData(handle=inputDef.handle, unit=inputDef.unit, value=inputDef.defaultValue))
+    for checkboxDef in graph.checkboxes:
+        if checkboxDef.handle in handledHandles or not checkInputConditions(checkboxDef, xSpec, ySpec):
+            continue
+        handledHandles.add(checkboxDef.handle)
+        miscInputs.append(InputData(handle=checkboxDef.handle, unit=None, value=checkboxDef.defaultValue))
+    return mainInput, miscInputs
+
+
+def measureGraphSweep(fit, graphName, xKey, yKey, needsTarget, repeat):
+    from eos.saveddata.targetProfile import TargetProfile
+    from graphs.data.base import FitGraph
+    from graphs.wrapper import SourceWrapper, TargetWrapper
+    from service.const import GraphCacheCleanupReason
+    graph = FitGraph.viewMap[graphName]()
+    xSpec = graph.xDefMap[xKey]
+    ySpec = graph.yDefMap[yKey]
+    mainInput, miscInputs = getGraphInputs(graph, xSpec, ySpec)
+    src = SourceWrapper(item=fit, colorID=None)
+    tgt = TargetWrapper(item=TargetProfile.getIdeal(), lightnessID=None, lineStyleID=None) if needsTarget else None
+
+    def sweep():
+        # Start from scratch every time, as if fit has just been changed
+        graph.clearCache(reason=GraphCacheCleanupReason.fitChanged, extraData=fit.ID)
+        graph.getPlotPoints(mainInput=mainInput, miscInputs=miscInputs, xSpec=xSpec, ySpec=ySpec, src=src, tgt=tgt)
+
+    return measure(sweep, repeat)
+
+
+def measureMemory(name):
+    """Return memory taken by building and calculating scenario, in kilobytes."""
+    from service.fit import Fit
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fit = buildScenario(name)
+        Fit.getInstance().recalc(fit)
+        fit.simulateCap()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'retained': current / 1024, 'peak': peak / 1024}
+
+
+def runScenario(name, repeat, profile=False):
+    from eos.calcProfiler import calcProfiler
+    from service.const import PortEftOptions
+    from service.fit import Fit
+    from service.port.eft import exportEft, importEft
+    sFit = Fit.getInstance()
+    exportOptions = {option: True for option in PortEftOptions}
+
+    result = {'memory': measureMemory(name)}
+    fit = buildScenario(name)
+    sFit.recalc(fit)
+    result['modules'] = sum(1 for m in fit.modules if not m.isEmpty)
+    result['recalc'] = measure(lambda: sFit.recalc(fit), repeat)
+    result['capSim'] = measure(fit.simulateCap, repeat)
+    result['graphs'] = {}
+    for graphName, xKey, yKey, needsTarget in GRAPH_SWEEPS:
+        result['graphs'][graphName] = measureGraphSweep(fit, graphName, xKey, yKey, needsTarget, repeat)
+    eftText = exportEft(fit, exportOptions, callback=None)
+    eftLines = eftText.splitlines()
+    result['eftExport'] = measure(lambda: exportEft(fit, exportOptions, callback=None), repeat)
+    result['eftImport'] = measure(lambda: importEft(eftLines), repeat)
+    if profile:
+        with calcProfiler.profiling():
+            for _ in range(repeat):
+                sFit.recalc(fit)
+        result['calcProfile'] = calcProfiler.getReport(limit=10)
+    return result
+
+
+def compare(results, baseline):
+    """Print median timings of results against baseline ones."""
+    print('Compared with {} ({})'.format(baseline.get('commit'), baseline.get('timestamp')))
+
+    def iterTimings(scenarioResult, prefix=''):
+        for key, value in scenarioResult.items():
+            if not isinstance(value, dict):
+                continue
+            if 'median' in value:
+                yield prefix + key, value['median']
+            elif key != 'calcProfile':
+                yield from iterTimings(value, prefix='{}{}.'.format(prefix, key))
+
+    for name, scenarioResult in results['scenarios'].items():
+        baseResult = baseline.get('scenarios', {}).get(name)
+        if baseResult is None:
+            continue
+        baseTimings = dict(iterTimings(baseResult))
+        for metric, median in iterTimings(scenarioResult):
+            baseMedian = baseTimings.get(metric)
+            if not baseMedian:
+                continue
+            print('  {:<18} {:<28} {:>10.3f} -> {:>10.3f} ms ({:+.1%})'.format(
+                name, metric, baseMedian, median, median / baseMedian - 1))
+
+
+def main(args):
+    import config
+    config.defPaths(tempfile.mkdtemp(prefix='pyfa-bench-'))
+    if not os.path.isfile(config.gameDB):
+        sys.exit('Gamedata not found at {}, build it with db_update.py first'.format(config.gameDB))
+    import eos.db
+    eos.db.saveddata_meta.create_all()
+    # Graphs register themselves on import
+    import graphs.data  # noqa: F401
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = set(names).difference(SCENARIOS)
+    if unknown:
+        sys.exit('Unknown scenarios: {}'.format(', '.join(sorted(unknown))))
+    results = {
+        'version': RESULTS_VERSION,
+        'commit': getCommit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'scenarios': {}}
+    for name in names:
+        print('Running {}...'.format(name))
+        scenarioResult = results['scenarios'][name] = runScenario(name, args.repeat, profile=args.profile)
+        print('  recalc {:.3f} ms, cap sim {:.3f} ms, memory peak {:.0f} KiB'.format(
+            scenarioResult['recalc']['median'], scenarioResult['capSim']['median'],
+            scenarioResult['memory']['peak']))
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print('Results written to {}'.format(args.output))
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-o', '--output', help='file to write JSON results into', default='benchmark.json')
+    parser.add_argument('-c', '--compare', help='JSON results of previous run to compare with', default=None)
+    parser.add_argument('-n', '--repeat', type=int, help='amount of runs per measurement', default=20)
+    parser.add_argument('-s', '--scenario', dest='scenarios', action='append', choices=sorted(SCENARIOS),
+                        help='scenario to run, can be given multiple times; all scenarios by default')
+    parser.add_argument('-p', '--profile', action='store_true', help='include calc profile of recalcs into results')
+    main(parser.parse_args())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark EFT importer against large corpus of concatenated fits.
+
+Compares single-pass line classification of current importer with previous
+approach (patterns rebuilt and matched up to three times per line), and
+measures full multi-fit import throughput. Corpus is read from file if
+given, otherwise it is made by repeating built-in sample fit.
+
+    python scripts/eft_import_benchmark.py [-f dump.txt] [-n 2000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+# Add pyfa root path to sys.path so we can import ourselves
+path = os.path.dirname(__file__)
+sys.path.append(os.path.realpath(os.path.join(path, "..")))
+
+SAMPLE_FIT = """[Rifter, Benchmark Rifter]
+Damage Control II
+Small Armor Repairer II
+Multispectrum Coating II
+
+5MN Y-T8 Compact Microwarpdrive
+Warp Scrambler II
+Stasis Webifier II /OFFLINE
+
+200mm AutoCannon II, Republic Fleet EMP S
+200mm AutoCannon II, Republic Fleet EMP S
+200mm AutoCannon II, Republic Fleet EMP S
+[Empty High slot]
+
+Small Projectile Burst Aerator I
+Small Projectile Collision Accelerator I
+[Empty Rig slot]
+
+
+Warrior II x2
+
+
+Republic Fleet EMP S x1000
+Nanite Repair Paste x50
+"""
+
+
+def legacyClassify(line):
+    """Line classification as done by importer before single-pass tokenizer."""
+    from service.port.eft import NAME_CHARS, OFFLINE_SUFFIX
+    stubPattern = r'^\[.+?\]$'
+    modulePattern = r'^(?P<typeName>{0}+?)(,\s*(?P<chargeName>{0}+?))?(?P<offline>\s*{1})?(\s*\[(?P<mutation>\d+?)\])?$'.format(
+        NAME_CHARS, OFFLINE_SUFFIX)
+    droneCargoPattern = r'^(?P<typeName>{}+?) x(?P<amount>\d+?)(\s*\[(?P<mutation>\d+?)\])?$'.format(NAME_CHARS)
+    if re.match(stubPattern, line):
+        return 'stub'
+    if re.match(droneCargoPattern, line):
+        return 'multi'
+    if re.match(modulePattern, line):
+        return 'regular'
+    return None
+
+
+def timeit(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main(corpus, skipImport=False):
+    import config
+    config.defPaths(tempfile.mkdtemp(prefix='pyfa-bench-'))
+    import eos.db
+    eos.db.saveddata_meta.create_all()
+    from service.port.eft import classifyEftLine, importEftMulti, splitEftFits
+
+    lines = corpus.splitlines()
+    bodyLines = [l.strip() for l in lines if l.strip()]
+    print('Corpus: {} lines, {} fits'.format(len(lines), sum(1 for _ in splitEftFits(lines))))
+
+    legacyTime, legacyKinds = timeit(lambda: [legacyClassify(l) for l in bodyLines])
+    newTime, newKinds = timeit(lambda: [classifyEftLine(l)[0] for l in bodyLines])
+    if legacyKinds != newKinds:
+        print('WARNING: line classification differs from legacy one')
+    print('Line classification: legacy {:.3f}s, single-pass {:.3f}s ({:.1f}x)'.format(
+        legacyTime, newTime, legacyTime / newTime if newTime else float('inf')))
+
+    if not skipImport:
+        importTime, fits = timeit(lambda: list(importEftMulti(lines)))
+        print('Full import: {} fits in {:.3f}s ({:.1f} fits/s)'.format(
+            len(fits), importTime, len(fits) / importTime if importTime else float('inf')))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-f', '--file', dest='path', help='file with concatenated EFT fits', default=None)
+    parser.add_argument('-n', '--count', type=int, help='amount of sample fits to generate when no file is given', default=2000)
+    parser.add_argument('--no-import', dest='skipImport', action='store_true', help='benchmark only line classification')
+    args = parser.parse_args()
+    if args.path:
+        with open(args.path, encoding='utf-8') as f:
+            corpus = f.read()
+    else:
+        corpus = '\n\n'.join([SAMPLE_FIT] * args.count)
+    main(corpus, skipImport=args.skipImport)
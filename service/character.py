@@ -270,6 +270,7 @@ class Character:
         """Rollback edited skills"""
         char = eos.db.getCharacter(charID)
         char.revertLevels()
+        eos.db.clearFitStats(characterID=charID)
 
     @staticmethod
     def getSkillGroups():
@@ -302,6 +303,7 @@ class Character:
     def setAlphaClone(char, cloneID):
         char.alphaCloneID = cloneID
         eos.db.commit()
+        eos.db.clearFitStats(characterID=char.ID)
 
     @staticmethod
     def setSecStatus(char, secStatus):
@@ -393,6 +395,7 @@ class Character:
         char = eos.db.getCharacter(charID)
         char.apiUpdateCharSheet(skills, securitystatus)
         eos.db.commit()
+        eos.db.clearFitStats(characterID=charID)
 
     @classmethod
     def changeLevel(cls, charID, skillID, level, persist=False, ifHigher=False):
@@ -409,6 +412,10 @@ class Character:
             cls._trainSkillReqs(char, skill, persist)
             skill.setLevel(level, persist)
             eos.db.commit()
+        else:
+            return
+        # Unsaved levels are used in calculations too
+        eos.db.clearFitStats(characterID=charID)
 
     @classmethod
     def _trainSkillReqs(cls, char, skill, persist):
@@ -423,6 +430,7 @@ class Character:
         char = eos.db.getCharacter(charID)
         skill = char.getSkill(skillID)
         skill.revert()
+        eos.db.clearFitStats(characterID=charID)
 
     @staticmethod
     def saveSkill(charID, skillID):
@@ -441,12 +449,14 @@ class Character:
         char.implants.makeRoom(implant)
         char.implants.append(implant)
         eos.db.commit()
+        eos.db.clearFitStats(characterID=charID)
 
     @staticmethod
     def removeImplant(charID, implant):
         char = eos.db.getCharacter(charID)
         char.implants.remove(implant)
         eos.db.commit()
+        eos.db.clearFitStats(characterID=charID)
 
     @staticmethod
     def getImplants(charID):
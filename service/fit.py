@@ -19,6 +19,8 @@
 
 import copy
 import datetime
+import threading
+from contextlib import contextmanager
 from time import time
 from weakref import WeakSet
 
@@ -34,7 +36,9 @@ from eos.saveddata.fit import Fit as FitType
 from eos.saveddata.ship import Ship as es_Ship
 from service.character import Character
 from service.damagePattern import DamagePattern
+from service.fitHistory import FitCommandProcessor
 from service.settings import SettingsProvider
+from service.whatIf import WhatIf
 
 
 pyfalog = Logger(__name__)
@@ -54,6 +58,93 @@ class DeferRecalc:
         self.sFit.recalc(self.fitID)
 
 
+class RecalcScheduler:
+    """
+    Keeps track of which fits had their calculated data invalidated since
+    their last recalc, so that multiple recalc requests issued while
+    handling single user action result in single recalc. Fits are marked
+    dirty by calc commands (see InternalCommandHistory) and when their
+    revision changes, and are cleaned by recalc itself.
+    """
+
+    def __init__(self):
+        # Format: {fitID: fit revision}, for fits whose calculated data is
+        # known to match their state at that revision
+        self.__clean = {}
+        # Format: {fitID: amount of recalcs performed}
+        self.__recalcCounts = {}
+        # Fits whose recalc was held back until the end of current batch
+        self.__deferred = set()
+        self.__deferDepth = 0
+        self.requested = 0
+        self.performed = 0
+
+    def markDirty(self, fitID):
+        self.__clean.pop(fitID, None)
+
+    def markClean(self, fitID, revision):
+        self.__clean[fitID] = revision
+        self.__recalcCounts[fitID] = self.__recalcCounts.get(fitID, 0) + 1
+
+    def isDirty(self, fitID, revision):
+        return self.__clean.get(fitID) != revision
+
+    def getRecalcCount(self, fitID):
+        return self.__recalcCounts.get(fitID, 0)
+
+    def forget(self, fitID):
+        self.__clean.pop(fitID, None)
+        self.__recalcCounts.pop(fitID, None)
+
+    @contextmanager
+    def deferRecalcs(self):
+        """Hold back recalcs requested via recalcIfDirty until batch is over."""
+        self.__deferDepth += 1
+        try:
+            yield
+        finally:
+            self.__deferDepth -= 1
+
+    def defer(self, fitID):
+        """Remember fit for later recalc; False if no batch is running."""
+        if not self.__deferDepth:
+            return False
+        self.__deferred.add(fitID)
+        return True
+
+    def popDeferred(self):
+        fitIDs = self.__deferred
+        self.__deferred = set()
+        return fitIDs
+
+    def processDo(self, command, success, recalcCountBefore):
+        """Update dirty flag of fit after calc command has been done."""
+        fitID = getattr(command, 'fitID', None)
+        if fitID is None:
+            return
+        recalced = self.getRecalcCount(fitID) != recalcCountBefore
+        if not recalced:
+            # Command changed fit without recalculating it; if it failed
+            # without changing anything, fit stays as it was
+            if success:
+                self.markDirty(fitID)
+        elif not success or getattr(command, 'needsGuiRecalc', True):
+            # Fit was changed after command recalculated it
+            self.markDirty(fitID)
+
+    def processUndo(self, command):
+        fitID = getattr(command, 'fitID', None)
+        if fitID is not None:
+            self.markDirty(fitID)
+
+    @property
+    def skipped(self):
+        return self.requested - self.performed
+
+    def getStats(self):
+        return {'requested': self.requested, 'performed': self.performed, 'skipped': self.skipped}
+
+
 class Fit:
     instance = None
     processors = {}
@@ -72,6 +163,14 @@ class Fit:
         self.character = saveddata_Character.getAll5()
         self.booster = False
         self._loadedFits = WeakSet()
+        self.recalcScheduler = RecalcScheduler()
+        # Loaded fits are changed on main thread and calculated by graph
+        # worker in background, see changingFits
+        self.fitLock = threading.RLock()
+        self.changeCount = 0
+        # Amount of fit changes waiting for fit lock or holding it
+        self.changesPending = 0
+        self.__pendingLock = threading.Lock()
 
         serviceFittingDefaultOptions = {
             "useGlobalCharacter": False,
@@ -90,6 +189,8 @@ class Fit:
             "priceSystem": "Jita",
             "priceSource": "fuzzwork market",
             "showShipBrowserTooltip": True,
+            "showShipBrowserFitStats": True,
+            "shipBrowserFitSort": 0,
             "marketSearchDelay": 250,
             "ammoChangeAll": False,
             "additionsLabels": 1,
@@ -225,6 +326,9 @@ class Fit:
 
         if fitID in Fit.processors:
             del Fit.processors[fitID]
+        Fit.getInstance().recalcScheduler.forget(fitID)
+        eos.db.clearFitStats(fitID=fitID)
+        WhatIf.getInstance().clearForFit(fitID)
 
         pyfalog.debug("    Need to refresh {} fits: {}", len(refreshFits), refreshFits)
         for fit in refreshFits:
@@ -235,7 +339,7 @@ class Fit:
     @classmethod
     def getCommandProcessor(cls, fitID):
         if fitID not in cls.processors:
-            cls.processors[fitID] = wx.CommandProcessor(maxCommands=100)
+            cls.processors[fitID] = FitCommandProcessor(fitID, maxCommands=100)
         return cls.processors[fitID]
 
     @staticmethod
@@ -244,6 +348,9 @@ class Fit:
         fit = eos.db.getFit(fitID)
         newFit = copy.deepcopy(fit)
         eos.db.save(newFit)
+        # Linked fits know about the copy by its ID, which it has only now
+        for linkedFit in newFit.projectedFits + newFit.commandFits:
+            eos.db.saveddata_session.refresh(linkedFit)
         return newFit.ID
 
     @staticmethod
@@ -531,12 +638,72 @@ class Fit:
     def recalc(self, fit):
         if isinstance(fit, int):
             fit = self.getFit(fit)
+        self.recalcScheduler.requested += 1
+        self._recalc(fit)
+
+    def recalcIfDirty(self, fit):
+        """
+        Recalculate fit unless calc commands ran since its last recalc left
+        it intact. Meant to be used by GUI commands after submitting calc
+        commands, which often recalculate fit on their own already.
+        """
+        if isinstance(fit, int):
+            fit = self.getFit(fit)
+        self.recalcScheduler.requested += 1
+        # Fits we project onto or boost get their flag reset by eos itself
+        if fit.calculated and not self.recalcScheduler.isDirty(fit.ID, fit.revision):
+            pyfalog.debug("Skipping recalc of clean fit: {0}", fit.name)
+            return
+        if self.recalcScheduler.defer(fit.ID):
+            pyfalog.debug("Deferring recalc of fit: {0}", fit.name)
+            return
+        self._recalc(fit)
+
+    def recalcDeferred(self):
+        """Recalculate and fill fits whose recalcs were held back."""
+        fitIDs = self.recalcScheduler.popDeferred()
+        if not fitIDs:
+            return fitIDs
+        eos.db.flush()
+        for fitID in fitIDs:
+            fit = self.getFit(fitID)
+            if fit is None:
+                continue
+            self._recalc(fit)
+            self.fill(fitID)
+        eos.db.commit()
+        return fitIDs
+
+    @contextmanager
+    def changingFits(self):
+        """
+        Change or recalculate loaded fits while no background calculation
+        is using them. Calculations started before the change find out about
+        it via changed changeCount and drop their outdated results; those
+        which hold fit lock meanwhile see changesPending and let go of it.
+        """
+        with self.__pendingLock:
+            self.changesPending += 1
+        try:
+            with self.fitLock:
+                try:
+                    yield
+                finally:
+                    self.changeCount += 1
+        finally:
+            with self.__pendingLock:
+                self.changesPending -= 1
+
+    def _recalc(self, fit):
         start_time = time()
         pyfalog.info("=" * 10 + "recalc: {0}" + "=" * 10, fit.name)
 
-        fit.factorReload = self.serviceFittingOptions["useGlobalForceReload"]
-        fit.clear()
-        fit.calculateModifiedAttributes()
+        with self.changingFits():
+            fit.factorReload = self.serviceFittingOptions["useGlobalForceReload"]
+            fit.clear()
+            fit.calculateModifiedAttributes()
+        self.recalcScheduler.performed += 1
+        self.recalcScheduler.markClean(fit.ID, fit.revision)
         pyfalog.info("=" * 10 + "recalc time: " + str(time() - start_time) + "=" * 10)
 
     def fill(self, fit):
@@ -0,0 +1,101 @@
+# =============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# =============================================================================
+
+
+# noinspection PyPackageRequirements
+import wx
+from logbook import Logger
+
+
+pyfalog = Logger(__name__)
+
+
+class FitCommandProcessor(wx.CommandProcessor):
+    """
+    Undo history of single fit. Commands flagged with localStateOnly change
+    only state, charges or metas of local modules and drones, never fit
+    layout, via calc commands kept in their internal history. They are not
+    stored at all if they changed nothing, and series of them can be undone
+    and redone with single recalc. History stores commands themselves, not
+    diffs of fit state.
+    """
+
+    def __init__(self, fitID, maxCommands=100):
+        wx.CommandProcessor.__init__(self, maxCommands=maxCommands)
+        self.fitID = fitID
+
+    def Submit(self, command, storeIt=True):
+        from service.fit import Fit
+        with Fit.getInstance().changingFits():
+            return self.__submit(command, storeIt)
+
+    def Undo(self):
+        from service.fit import Fit
+        with Fit.getInstance().changingFits():
+            return wx.CommandProcessor.Undo(self)
+
+    def Redo(self):
+        from service.fit import Fit
+        with Fit.getInstance().changingFits():
+            return wx.CommandProcessor.Redo(self)
+
+    def __submit(self, command, storeIt):
+        if not storeIt or not getattr(command, 'localStateOnly', False):
+            return wx.CommandProcessor.Submit(self, command, storeIt)
+        if not command.Do():
+            return False
+        # Internal history keeps only calc commands which changed something
+        if not len(command.internalHistory):
+            pyfalog.debug('Not storing command which changed nothing: {}', command.GetName())
+            return True
+        self.Store(command)
+        return True
+
+    def undoSteps(self, count):
+        """Undo up to count commands, recalculating fit once for local state ones."""
+        return self.__applySteps(count, self.CanUndo, self.GetCurrentCommand, self.Undo)
+
+    def redoSteps(self, count):
+        return self.__applySteps(count, self.CanRedo, self.__getNextCommand, self.Redo)
+
+    def __getNextCommand(self):
+        commands = self.GetCommands()
+        current = self.GetCurrentCommand()
+        if current is None:
+            return commands[0] if commands else None
+        for i, command in enumerate(commands):
+            if command is current:
+                return commands[i + 1] if i + 1 < len(commands) else None
+        return None
+
+    def __applySteps(self, count, canApply, getCommand, apply):
+        from service.fit import Fit
+        sFit = Fit.getInstance()
+        with sFit.recalcScheduler.deferRecalcs():
+            for _ in range(count):
+                if not canApply():
+                    break
+                command = getCommand()
+                if not getattr(command, 'localStateOnly', False):
+                    # Other commands can change fit layout, which depends on
+                    # calculated attributes, thus we catch up before them
+                    sFit.recalcDeferred()
+                if not apply():
+                    break
+        sFit.recalcDeferred()
@@ -0,0 +1,138 @@
+# =============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# =============================================================================
+
+
+from collections import OrderedDict
+
+# noinspection PyPackageRequirements
+import wx
+from logbook import Logger
+
+import eos.config
+import eos.db
+from eos.saveddata.fitStats import FitStats as es_FitStats
+from service.fit import Fit
+
+
+pyfalog = Logger(__name__)
+
+
+class FitStats:
+    """
+    Keeps stored summaries of fit stats up to date. Summaries are calculated
+    one fit at a time when main loop is idle, so that listing many fits does
+    not block UI. Fits are calculated on main thread, since the same fit
+    objects and database session are used by the rest of UI.
+    """
+    instance = None
+
+    # Delay between calculations of fits waiting for summary, in milliseconds
+    CALC_DELAY = 100
+
+    @classmethod
+    def getInstance(cls):
+        if cls.instance is None:
+            cls.instance = FitStats()
+        return cls.instance
+
+    def __init__(self):
+        # Format: {fitID: [callbacks]}, in order summaries were requested
+        self.__pending = OrderedDict()
+        self.__timer = None
+
+    def getSummaries(self, fitIDs, callback=None):
+        """
+        Return valid summaries of passed fits as {fitID: summary}. Fits which
+        have no valid summary are scheduled for calculation, and callback is
+        called as callback(fitID, summary) once summary of each is ready.
+        """
+        fitIDs = list(fitIDs)
+        summaries = eos.db.getValidFitStats(fitIDs, eos.config.gamedata_version)
+        self.scheduleUpdate([fitID for fitID in fitIDs if fitID not in summaries], callback)
+        return summaries
+
+    def scheduleUpdate(self, fitIDs, callback=None):
+        """Schedule calculation of summaries for passed fits, e.g. after they were changed."""
+        for fitID in fitIDs:
+            if fitID is None:
+                continue
+            callbacks = self.__pending.setdefault(fitID, [])
+            if callback is not None and callback not in callbacks:
+                callbacks.append(callback)
+        if self.__pending and self.__timer is None:
+            self.__timer = wx.CallLater(self.CALC_DELAY, self.__processNext)
+
+    def cancelUpdates(self, callback):
+        """Stop notifying callback, e.g. when its owner lists different fits."""
+        for callbacks in self.__pending.values():
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    @staticmethod
+    def invalidateCharacter(charID):
+        """Drop summaries calculated with given character, e.g. after its skills were saved."""
+        eos.db.clearFitStats(characterID=charID)
+
+    @staticmethod
+    def clearSummaries():
+        eos.db.clearFitStats()
+
+    def __processNext(self):
+        self.__timer = None
+        if not self.__pending:
+            return
+        fitID, callbacks = self.__pending.popitem(last=False)
+        summary = None
+        try:
+            summary = self.updateSummary(fitID)
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except Exception:
+            pyfalog.warning("Failed to calculate stats summary for fit ID: {0}", fitID, exc_info=True)
+        if summary is not None:
+            for callback in callbacks:
+                try:
+                    callback(fitID, summary)
+                except (KeyboardInterrupt, SystemExit):
+                    raise
+                except Exception:
+                    pyfalog.error("Execution of fit stats callback failed.", exc_info=True)
+        if self.__pending:
+            self.__timer = wx.CallLater(self.CALC_DELAY, self.__processNext)
+
+    @staticmethod
+    def updateSummary(fitID):
+        sFit = Fit.getInstance()
+        fit = sFit.getFit(fitID)
+        if fit is None:
+            return None
+        if not fit.calculated:
+            sFit.recalc(fit)
+        fitModified = fit.modified or fit.created
+        gamedataVersion = eos.config.gamedata_version
+        summary = eos.db.getFitStats(fitID)
+        if summary is None:
+            summary = es_FitStats(fitID)
+        # Fit might have been scheduled several times, no need to redo the work
+        elif summary.isValid(fitModified, fit.characterID, gamedataVersion):
+            return summary
+        summary.update(fit, fitModified, gamedataVersion)
+        eos.db.save(summary)
+        pyfalog.debug("Updated stats summary: {0}", summary)
+        return summary
@@ -0,0 +1,153 @@
+# ===============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from collections import OrderedDict
+
+# noinspection PyPackageRequirements
+import wx
+from logbook import Logger
+
+import eos.db
+from service.marketIndex import MarketIndex
+
+
+pyfalog = Logger(__name__)
+
+
+class ItemPrefetch:
+    """
+    Loads items UI is likely to need next, along with their attributes,
+    effects, groups and traits, using batched eager queries. Work is split
+    into small chunks ran from main loop when it is idle: gamedata session
+    is per-thread, and objects loaded by another thread would not be found
+    by lookups made from UI.
+
+    Session keeps only weak references to loaded objects, so prefetched
+    items are held here until memory budget is exceeded.
+    """
+    instance = None
+
+    # Items loaded per chunk, and delay between chunks in milliseconds
+    CHUNK_SIZE = 25
+    CHUNK_DELAY = 50
+    # Rough memory cost estimates used for budgeting
+    ITEM_COST = 2048
+    ATTRIBUTE_COST = 160
+    EFFECT_COST = 120
+    MAX_BYTES = 32 * 1024 * 1024
+
+    @classmethod
+    def getInstance(cls):
+        if cls.instance is None:
+            cls.instance = ItemPrefetch()
+        return cls.instance
+
+    def __init__(self):
+        # Format: {source: [typeIDs]}; source which requested last goes first
+        self.__pending = OrderedDict()
+        # Format: {typeID: (item, estimated size)}, least recently prefetched first
+        self.__held = OrderedDict()
+        self.__heldBytes = 0
+        self.__timer = None
+        self.stats = {'requested': 0, 'loaded': 0, 'evicted': 0}
+
+    def prefetch(self, source, typeIDs):
+        """
+        Schedule loading of passed items. Source names what requested them
+        (e.g. "market"); new request from the same source replaces old one.
+        """
+        typeIDs = [typeID for typeID in dict.fromkeys(typeIDs) if typeID not in self.__held]
+        self.__pending.pop(source, None)
+        if not typeIDs:
+            return
+        self.stats['requested'] += len(typeIDs)
+        self.__pending[source] = typeIDs
+        self.__pending.move_to_end(source, last=False)
+        if self.__timer is None:
+            self.__timer = wx.CallLater(self.CHUNK_DELAY, self.__processChunk)
+
+    def prefetchFitVariations(self, fit):
+        """Variations of items fitted to the ship, as they are offered in context menus"""
+        if fit is None:
+            return
+        index = MarketIndex.getInstance()
+        typeIDs = []
+        for container in (fit.modules, fit.drones, fit.fighters, fit.implants, fit.boosters):
+            for obj in container:
+                item = getattr(obj, "item", None)
+                if item is None:
+                    continue
+                parentID = index.getVariationParentID(item.ID) or item.ID
+                typeIDs.append(parentID)
+                typeIDs.extend(index.getVariationIDs(parentID))
+        self.prefetch("fit", [typeID for typeID in typeIDs if index.isPublished(typeID)])
+
+    def prefetchMarketGroup(self, marketGroupID, limit=300):
+        index = MarketIndex.getInstance()
+        typeIDs = [typeID for typeID in index.getDescendantItemIDs(marketGroupID) if index.isPublished(typeID)]
+        self.prefetch("market", sorted(typeIDs)[:limit])
+
+    def prefetchShips(self, shipIDs):
+        self.prefetch("ships", shipIDs)
+
+    def cancel(self, source=None):
+        if source is None:
+            self.__pending.clear()
+        else:
+            self.__pending.pop(source, None)
+
+    def __processChunk(self):
+        self.__timer = None
+        if not self.__pending:
+            return
+        source, typeIDs = next(iter(self.__pending.items()))
+        chunk = typeIDs[:self.CHUNK_SIZE]
+        del typeIDs[:self.CHUNK_SIZE]
+        if not typeIDs:
+            del self.__pending[source]
+        chunk = [typeID for typeID in chunk if typeID not in self.__held]
+        try:
+            items = eos.db.getItemsPrefetched(chunk)
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except Exception:
+            pyfalog.warning("Failed to prefetch items requested by {0}", source, exc_info=True)
+            items = ()
+        for item in items:
+            self.__hold(item)
+        if self.__pending:
+            self.__timer = wx.CallLater(self.CHUNK_DELAY, self.__processChunk)
+
+    def __hold(self, item):
+        size = self.ITEM_COST + self.ATTRIBUTE_COST * len(item.attributes) + self.EFFECT_COST * len(item.effects)
+        self.__held[item.ID] = (item, size)
+        self.__heldBytes += size
+        self.stats['loaded'] += 1
+        while self.__heldBytes > self.MAX_BYTES and self.__held:
+            _, (_, evictedSize) = self.__held.popitem(last=False)
+            self.__heldBytes -= evictedSize
+            self.stats['evicted'] += 1
+
+    def getStats(self):
+        stats = dict(self.stats)
+        stats['held'] = len(self.__held)
+        stats['bytes'] = self.__heldBytes
+        stats['pending'] = sum(len(typeIDs) for typeIDs in self.__pending.values())
+        return stats
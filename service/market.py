@@ -34,6 +34,7 @@ from eos.gamedata import Category as types_Category, Group as types_Group, Item
     MetaGroup as types_MetaGroup
 from service import conversions
 from service.jargon import JargonLoader
+from service.marketIndex import MarketIndex
 from service.settings import SettingsProvider
 from utils.cjk import isStringCjk
 
@@ -54,10 +55,10 @@ class ShipBrowserWorkerThread(threading.Thread):
         pyfalog.debug("Initialize ShipBrowserWorkerThread.")
         self.name = "ShipBrowser"
         self.running = True
-
-    def run(self):
         self.queue = queue.Queue()
         self.cache = {}
+
+    def run(self):
         # Wait for full market initialization (otherwise there's high risky
         # this thread will attempt to init Market which is already being inited)
         mktRdy.wait(5)
@@ -106,10 +107,10 @@ class SearchWorkerThread(threading.Thread):
         self.jargonLoader.get_jargon()
         self.jargonLoader.get_jargon().apply('test string'.split())
         self.running = True
-
-    def run(self):
         self.cv = threading.Condition()
         self.searchRequest = None
+
+    def run(self):
         self.processSearches()
 
     def processSearches(self):
@@ -245,6 +246,8 @@ class Market:
     instance = None
 
     def __init__(self):
+        # Plain-data view of market tree, loaded from disk unless gamedata changed
+        self.index = MarketIndex.getInstance()
 
         # Init recently used module storage
         serviceMarketRecentlyUsedModules = {"pyfaMarketRecentlyUsedModules": []}
@@ -252,15 +255,10 @@ class Market:
         self.serviceMarketRecentlyUsedModules = SettingsProvider.getInstance().getSettings(
                 "pyfaMarketRecentlyUsedModules", serviceMarketRecentlyUsedModules)
 
-        # Thread which handles search
-        self.searchWorkerThread = SearchWorkerThread()
-        self.searchWorkerThread.daemon = True
-        self.searchWorkerThread.start()
-
-        # Ship browser helper thread
-        self.shipBrowserWorkerThread = ShipBrowserWorkerThread()
-        self.shipBrowserWorkerThread.daemon = True
-        self.shipBrowserWorkerThread.start()
+        # Worker threads are started on first use, see properties below
+        self.__workerLock = threading.Lock()
+        self.__searchWorkerThread = None
+        self.__shipBrowserWorkerThread = None
 
         # Items' group overrides
         self.customGroups = set()
@@ -327,8 +325,9 @@ class Market:
         }
 
         self.ITEMS_FORCEGROUP_R = self.__makeRevDict(self.ITEMS_FORCEGROUP)
-        for grp, itemNames in self.ITEMS_FORCEGROUP_R.items():
-            grp.addItems = list(self.getItem(i) for i in itemNames)
+        # Items forcibly added to groups are fetched when group is requested,
+        # format: {group: items}
+        self.__forceGroupItems = {}
         self.customGroups.add(self.les_grp)
 
         # List of items which are forcibly published or hidden
@@ -459,7 +458,7 @@ class Market:
                                    2203,  # Structure Modifications
                                    2456  # Filaments
                                    )
-        self.SHOWN_MARKET_GROUPS = eos.db.getMarketTreeNodeIds(self.ROOT_MARKET_GROUPS)
+        self.SHOWN_MARKET_GROUPS = self.index.getDescendantGroupIDs(self.ROOT_MARKET_GROUPS)
         self.FIT_CATEGORIES = ['Ship']
         self.FIT_GROUPS = ['Citadel', 'Engineering Complex', 'Refinery']
         # Tell other threads that Market is at their service
@@ -471,6 +470,26 @@ class Market:
             cls.instance = Market()
         return cls.instance
 
+    @property
+    def searchWorkerThread(self):
+        """Thread which handles search"""
+        with self.__workerLock:
+            if self.__searchWorkerThread is None:
+                self.__searchWorkerThread = SearchWorkerThread()
+                self.__searchWorkerThread.daemon = True
+                self.__searchWorkerThread.start()
+            return self.__searchWorkerThread
+
+    @property
+    def shipBrowserWorkerThread(self):
+        """Ship browser helper thread"""
+        with self.__workerLock:
+            if self.__shipBrowserWorkerThread is None:
+                self.__shipBrowserWorkerThread = ShipBrowserWorkerThread()
+                self.__shipBrowserWorkerThread.daemon = True
+                self.__shipBrowserWorkerThread.start()
+            return self.__shipBrowserWorkerThread
+
     @staticmethod
     def __makeRevDict(orig):
         """Creates reverse dictionary"""
@@ -644,7 +663,10 @@ class Market:
             parentName = self.ITEMS_FORCEDMETAGROUP[item.name][1]
             parent = self.getItem(parentName)
         if parent is None:
-            parent = item.varParent
+            # Avoid lazy loading of relationship, cached item lookup is much cheaper
+            parentID = self.index.getVariationParentID(item.ID)
+            if parentID is not None:
+                parent = self.getItem(parentID)
         # Consider self as parent if item has no parent in database
         if parent is None and selfparent is True:
             parent = item
@@ -743,8 +765,10 @@ class Market:
         # Return only public items; also, filter out items
         # which were forcibly set to other groups
         groupItems = set(group.items)
-        if hasattr(group, 'addItems'):
-            groupItems.update(group.addItems)
+        if group in self.ITEMS_FORCEGROUP_R:
+            if group not in self.__forceGroupItems:
+                self.__forceGroupItems[group] = list(self.getItem(i) for i in self.ITEMS_FORCEGROUP_R[group])
+            groupItems.update(self.__forceGroupItems[group])
         items = set([
             item for item in groupItems
             if self.getPublicityByItem(item) and self.getGroupByItem(item) == group])
@@ -753,8 +777,10 @@ class Market:
     def getItemsByMarketGroup(self, mg, vars_=True):
         """Get items in the given market group"""
         result = set()
-        # Get items from eos market group
-        baseitms = set(mg.items)
+        # Get items from eos market group; their IDs are known from index,
+        # and items themselves are fetched in one go
+        itemIDs = tuple(self.index.getItemIDs(mg.ID))
+        baseitms = set(eos.db.getItems(itemIDs)) if itemIDs else set()
         # Add hardcoded items to set
         if mg.ID in self.ITEMS_FORCEDMARKETGROUP_R:
             forceditms = set(self.getItem(itmn) for itmn in self.ITEMS_FORCEDMARKETGROUP_R[mg.ID])
@@ -782,15 +808,20 @@ class Market:
 
     def marketGroupHasTypesCheck(self, mg):
         """If market group has any items, return true"""
-        if mg and mg.ID in self.ITEMS_FORCEDMARKETGROUP_R:
+        if not mg:
+            return False
+        # Counts come from index, relationships are not loaded just to be measured
+        itemCount = len(self.index.getItemIDs(mg.ID))
+        childCount = len(self.index.getChildIDs(mg.ID))
+        if mg.ID in self.ITEMS_FORCEDMARKETGROUP_R:
             # This shouldn't occur normally but makes errors more mild when ITEMS_FORCEDMARKETGROUP is outdated.
-            if len(mg.children) > 0 and len(mg.items) == 0:
+            if childCount > 0 and itemCount == 0:
                 pyfalog.error(("Market group \"{0}\" contains no items and has children. "
                     "ITEMS_FORCEDMARKETGROUP is likely outdated and will need to be "
                     "updated for {1} to display correctly.").format(mg, self.ITEMS_FORCEDMARKETGROUP_R[mg.ID]))
                 return False
             return True
-        elif len(mg.items) > 0 and len(mg.children) == 0:
+        elif itemCount > 0 and childCount == 0:
             return True
         else:
             return False
@@ -801,21 +832,30 @@ class Market:
         # when it's declared to have types, but it doesn't contain anything
         if mg.ID in self.FORCEDMARKETGROUP:
             return self.FORCEDMARKETGROUP[mg.ID]
-        if mg.hasTypes and not self.marketGroupHasTypesCheck(mg):
+        if self.index.hasTypes(mg.ID) and not self.marketGroupHasTypesCheck(mg):
             return False
         else:
             return True
 
     def getIconByMarketGroup(self, mg):
         """Return icon associated to marketgroup"""
-        if mg.iconID:
-            return mg.iconID
+        iconID = self.index.getGroupIconID(mg.ID)
+        if iconID:
+            return iconID
         else:
-            while mg and not mg.hasTypes:
-                mg = mg.parent
+            # Walk market tree via index, parents are not loaded one by one
+            groupID = mg.ID
+            while groupID is not None and not self.index.hasTypes(groupID):
+                groupID = self.index.getParentGroupID(groupID)
+            if groupID is None:
+                return ""
+            mg = self.getMarketGroup(groupID)
             if not mg:
                 return ""
             elif self.marketGroupHasTypesCheck(mg):
+                iconID = self.index.getItemIconID(mg.ID)
+                if iconID:
+                    return iconID
                 # Do not request variations to make process faster
                 # Pick random item and use its icon
                 items = self.getItemsByMarketGroup(mg, vars_=False)
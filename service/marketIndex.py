@@ -0,0 +1,211 @@
+# ===============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import os.path
+import pickle
+
+from logbook import Logger
+
+import config
+import eos.config
+import eos.db
+
+
+pyfalog = Logger(__name__)
+
+
+class MarketIndex:
+    """
+    Plain-data index of market groups and items, built from raw gamedata rows
+    once per gamedata version (or database file, if version is unknown) and
+    kept on disk. Allows to answer questions
+    about market tree structure without lazy loading ORM relationships.
+    Market overrides (forced groups, publicity etc.) are not applied here,
+    that's done by market service on top of the index.
+    """
+    instance = None
+
+    # Bump when stored data format changes
+    FORMAT_VERSION = 2
+
+    @classmethod
+    def getInstance(cls):
+        if cls.instance is None:
+            cls.instance = MarketIndex()
+        return cls.instance
+
+    def __init__(self):
+        # Format: {marketGroupID: parentGroupID}
+        self.groupParents = {}
+        # Format: {marketGroupID: hasTypes}
+        self.groupHasTypes = {}
+        # Format: {marketGroupID: iconID}
+        self.groupIcons = {}
+        # Format: {marketGroupID: [childGroupIDs]}
+        self.groupChildren = {}
+        # Format: {marketGroupID: [typeIDs]}, only items directly in the group
+        self.groupItems = {}
+        # Format: {typeID: parentTypeID}
+        self.varParents = {}
+        # Format: {parentTypeID: [typeIDs]}
+        self.varChildren = {}
+        self.published = set()
+        # Format: {typeID: iconID}, only published items with market group and icon
+        self.itemIcons = {}
+        # Format: {marketGroupID: frozenset(typeIDs)}, filled on demand
+        self.__descendantItems = {}
+        self.__load()
+
+    @staticmethod
+    def getStoragePath():
+        if config.savePath is None:
+            return None
+        return os.path.join(config.savePath, "cache", "marketIndex.pickle")
+
+    @staticmethod
+    def getGamedataKey():
+        """
+        Return identifier of gamedata index is built from: gamedata version,
+        or modification time of gamedata database if version is unknown.
+        None means that stored index cannot be trusted.
+        """
+        gamedataVersion = eos.config.gamedata_version
+        if gamedataVersion:
+            return gamedataVersion
+        try:
+            return "mtime:{}".format(os.path.getmtime(config.gameDB))
+        except (TypeError, OSError):
+            return None
+
+    def __load(self):
+        gamedataKey = self.getGamedataKey()
+        path = self.getStoragePath() if gamedataKey is not None else None
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    stored = pickle.load(f)
+                if stored["formatVersion"] == self.FORMAT_VERSION and stored["gamedataKey"] == gamedataKey:
+                    self.__apply(stored["data"])
+                    pyfalog.debug("Loaded market index for gamedata {0}", gamedataKey)
+                    return
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except Exception:
+                pyfalog.warning("Failed to load stored market index, rebuilding", exc_info=True)
+        data = self.__build()
+        self.__apply(data)
+        if path is not None:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    pickle.dump({
+                        "formatVersion": self.FORMAT_VERSION,
+                        "gamedataKey": gamedataKey,
+                        "data": data}, f, pickle.HIGHEST_PROTOCOL)
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except Exception:
+                pyfalog.warning("Failed to store market index", exc_info=True)
+
+    @staticmethod
+    def __build():
+        pyfalog.debug("Building market index")
+        groupRows, itemRows = eos.db.getMarketIndexData()
+        groups = [tuple(row) for row in groupRows]
+        items = [tuple(row) for row in itemRows]
+        return {"groups": groups, "items": items}
+
+    def __apply(self, data):
+        for groupID, parentID, hasTypes, iconID in data["groups"]:
+            self.groupParents[groupID] = parentID
+            self.groupHasTypes[groupID] = bool(hasTypes)
+            if iconID:
+                self.groupIcons[groupID] = iconID
+            if parentID is not None:
+                self.groupChildren.setdefault(parentID, []).append(groupID)
+        for typeID, marketGroupID, published, parentID, iconID in data["items"]:
+            if published:
+                self.published.add(typeID)
+            if parentID is not None:
+                self.varParents[typeID] = parentID
+                self.varChildren.setdefault(parentID, []).append(typeID)
+            if marketGroupID is not None:
+                self.groupItems.setdefault(marketGroupID, []).append(typeID)
+                if iconID and published:
+                    self.itemIcons[typeID] = iconID
+
+    def getChildIDs(self, groupID):
+        return self.groupChildren.get(groupID, ())
+
+    def getItemIDs(self, groupID):
+        """Items which are directly in passed market group"""
+        return self.groupItems.get(groupID, ())
+
+    def getDescendantItemIDs(self, groupID):
+        """Items in passed market group and all its subgroups"""
+        items = self.__descendantItems.get(groupID)
+        if items is None:
+            items = set(self.getItemIDs(groupID))
+            for childID in self.getChildIDs(groupID):
+                items.update(self.getDescendantItemIDs(childID))
+            items = self.__descendantItems[groupID] = frozenset(items)
+        return items
+
+    def getDescendantGroupIDs(self, groupIDs):
+        result = set()
+        pending = list(groupIDs)
+        while pending:
+            groupID = pending.pop()
+            if groupID in result:
+                continue
+            result.add(groupID)
+            pending.extend(self.getChildIDs(groupID))
+        return result
+
+    def getParentGroupID(self, groupID):
+        return self.groupParents.get(groupID)
+
+    def hasTypes(self, groupID):
+        return self.groupHasTypes.get(groupID, False)
+
+    def getGroupIconID(self, groupID):
+        return self.groupIcons.get(groupID)
+
+    def getItemIconID(self, groupID):
+        """Icon of some published item directly in passed market group, if any"""
+        for typeID in self.getItemIDs(groupID):
+            iconID = self.itemIcons.get(typeID)
+            if iconID:
+                return iconID
+        return None
+
+    def getItemIconIDs(self, groupID):
+        """Icons of all published items directly in passed market group"""
+        itemIcons = self.itemIcons
+        return [itemIcons[typeID] for typeID in self.getItemIDs(groupID) if typeID in itemIcons]
+
+    def getVariationParentID(self, typeID):
+        return self.varParents.get(typeID)
+
+    def getVariationIDs(self, parentID):
+        return self.varChildren.get(parentID, ())
+
+    def isPublished(self, typeID):
+        return typeID in self.published
@@ -0,0 +1,121 @@
+# =============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# =============================================================================
+
+
+import json
+import multiprocessing
+import time
+from functools import partial
+
+from logbook import Logger
+
+import config
+
+
+pyfalog = Logger(__name__)
+
+
+FORMAT_EFS = 'efs'
+FORMAT_STATS = 'stats'
+ALL_FORMATS = (FORMAT_EFS, FORMAT_STATS)
+
+
+def _initWorker(savePath, saveInRoot):
+    # Workers are spawned rather than forked, so they do not inherit DB
+    # engines and sessions of parent process. Every worker sets up its own
+    # configuration, and gets its own engines and sessions when eos.db is
+    # imported
+    config.saveInRoot = saveInRoot
+    config.defPaths(savePath)
+
+
+def _exportFit(fitID, formats):
+    from service.fit import Fit
+    from service.port.efs import EfsPort
+    from service.port.shipstats import exportFitStats
+    start = time.perf_counter()
+    record = {'fitID': fitID}
+    try:
+        fit = Fit.getInstance().getFit(fitID)
+        if fit is None:
+            record['error'] = 'Fit not found'
+            return record
+        record['name'] = fit.name
+        record['shipTypeID'] = fit.shipID
+        if FORMAT_EFS in formats:
+            record[FORMAT_EFS] = json.loads(EfsPort.exportEfs(fit, 0, None))
+        if FORMAT_STATS in formats:
+            record[FORMAT_STATS] = exportFitStats(fit, None)
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except Exception as e:
+        pyfalog.error('Failed to export fit {}', fitID, exc_info=True)
+        record['error'] = '{}: {}'.format(type(e).__name__, e)
+    record['time'] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def getFitIDsByShip(fitIDs=None):
+    """
+    Return IDs of passed fits (or all fits if None), ordered so that fits
+    of the same hull go together and can reuse per-hull export data.
+    """
+    from service.fit import Fit
+    fits = Fit.getAllFitsLite()
+    if fitIDs is not None:
+        fitIDs = set(fitIDs)
+        fits = [f for f in fits if f.ID in fitIDs]
+    return [f.ID for f in sorted(fits, key=lambda f: (f.shipID, f.ID))]
+
+
+def exportFits(fitIDs, path, formats=ALL_FORMATS, workers=None, progress=None):
+    """
+    Export fits in worker processes, writing one JSON object per fit into
+    file at path as soon as it is ready. Progress, if passed, is called as
+    progress(done, total) after each fit. Returns summary stats.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    total = len(fitIDs)
+    # Consecutive fits go to the same worker, so that fits of the same hull
+    # share cached data as long as IDs are ordered by hull
+    chunkSize = max(1, min(50, total // (workers * 4)))
+    start = time.perf_counter()
+    done = 0
+    errors = 0
+    context = multiprocessing.get_context('spawn')
+    with open(path, 'w', encoding='utf-8') as f, context.Pool(
+            processes=workers, initializer=_initWorker,
+            initargs=(config.savePath, config.saveInRoot)) as pool:
+        for record in pool.imap_unordered(partial(_exportFit, formats=tuple(formats)), fitIDs, chunksize=chunkSize):
+            f.write(json.dumps(record, skipkeys=True))
+            f.write('\n')
+            done += 1
+            if 'error' in record:
+                errors += 1
+            if progress is not None:
+                progress(done, total)
+    elapsed = time.perf_counter() - start
+    stats = {
+        'fits': done,
+        'errors': errors,
+        'workers': workers,
+        'elapsed': elapsed,
+        'fitsPerSecond': done / elapsed if elapsed else 0}
+    pyfalog.info('Exported {} fits in {:.1f}s using {} workers', done, elapsed, workers)
+    return stats
@@ -4,10 +4,12 @@ from numbers import Number
 
 from logbook import Logger
 
+import eos.config
 import eos.db
 from config import getVersion
 from service.fit import Fit
 from service.market import Market
+from service.whatIf import FitOverrides, WhatIf
 from eos.const import FittingModuleState, FittingHardpoint, FittingSlot
 from service.const import PortEftRigSize
 from eos.saveddata.module import Module
@@ -18,7 +20,6 @@ from eos.gamedata import Attribute, Effect, Group, Item, ItemEffect
 from eos.utils.spoolSupport import SpoolType, SpoolOptions
 from gui.fitCommands.calc.module.localAdd import CalcAddLocalModuleCommand
 from gui.fitCommands.calc.module.localRemove import CalcRemoveLocalModulesCommand
-from gui.fitCommands.calc.module.changeCharges import CalcChangeModuleChargesCommand
 from gui.fitCommands.helpers import ModuleInfo
 
 
@@ -28,6 +29,10 @@ pyfaVersion = getVersion()
 
 class EfsPort:
     wepTestSet = {}
+    # Gamedata version test sets were built for
+    wepTestSetVersion = None
+    # Format: {(gamedata version, ship type ID, mode type ID, subsystem type IDs, skills key): multipliers}
+    weaponBonusCache = {}
     version = 0.06
 
     @staticmethod
@@ -83,18 +88,15 @@ class EfsPort:
         return mwdPropSpeed
 
     @staticmethod
-    def getPropData(fit, sFit):
+    def getPropData(fit):
         propMods = filter(lambda mod: mod.item and mod.item.group.name == "Propulsion Module", fit.modules)
         activePropWBloomFilter = lambda mod: mod.state > 0 and "signatureRadiusBonus" in mod.item.attributes
         propWithBloom = next(filter(activePropWBloomFilter, propMods), None)
         if propWithBloom is not None:
-            oldPropState = propWithBloom.state
-            propWithBloom.state = FittingModuleState.ONLINE
-            sFit.recalc(fit)
-            sp = fit.maxSpeed
-            sig = fit.ship.getModifiedItemAttr("signatureRadius")
-            propWithBloom.state = oldPropState
-            sFit.recalc(fit)
+            sp, sig = WhatIf.getInstance().evaluate(
+                fit, "unpropedSpeedSig",
+                lambda f: (f.maxSpeed, f.ship.getModifiedItemAttr("signatureRadius")),
+                FitOverrides(moduleStates={propWithBloom.position: FittingModuleState.ONLINE}))
             return {"usingMWD": True, "unpropedSpeed": sp, "unpropedSig": sig}
         return {
             "usingMWD": False,
@@ -110,9 +112,23 @@ class EfsPort:
         matchingMods.sort(key=lambda mod: mod.item.group.ID)
         return matchingMods
 
+    @staticmethod
+    def getUnloadedCapacitorNeeds(fit):
+        """Return {position: capacitorNeed} of ancillary shield boosters without their charges."""
+        capNeeds = {}
+        for mod in EfsPort.getModsInGroups(fit, ["Ancillary Shield Booster"]):
+            if mod.charge is None:
+                continue
+            position = mod.position
+            capNeeds[position] = WhatIf.getInstance().evaluate(
+                fit, ("unloadedCapacitorNeed", position),
+                lambda f: f.modules[position].getModifiedItemAttr("capacitorNeed"),
+                FitOverrides(unloadedCharges=(position,)))
+        return capNeeds
+
     # Note this also includes data for any cap boosters as they "repair" cap.
     @staticmethod
-    def getRepairData(fit, sFit):
+    def getRepairData(fit, unloadedCapacitorNeeds):
         modGroupNames = [
             "Shield Booster", "Armor Repair Unit",
             "Ancillary Shield Booster", "Ancillary Armor Repairer",
@@ -135,22 +151,8 @@ class EfsPort:
                 if mod.item.group.name == "Ancillary Shield Booster":
                     stats["numShots"] = mod.numShots
                     EfsPort.attrDirectMap(["reloadTime"], stats, mod)
-                    c = mod.charge
-                    if c:
-                        sFit.recalc(fit)
-                        CalcChangeModuleChargesCommand(
-                            fit.ID,
-                            projected=False,
-                            chargeMap={mod.position: None},
-                            recalc=False).Do()
-                        sFit.recalc(fit)
-                        stats["unloadedCapacitorNeed"] = mod.getModifiedItemAttr("capacitorNeed")
-                        CalcChangeModuleChargesCommand(
-                            fit.ID,
-                            projected=False,
-                            chargeMap={mod.position: c.typeID},
-                            recalc=False).Do()
-                        sFit.recalc(fit)
+                    if mod.position in unloadedCapacitorNeeds:
+                        stats["unloadedCapacitorNeed"] = unloadedCapacitorNeeds[mod.position]
             elif mod.item.group.name == "Capacitor Booster":
                 # The capacitorNeed is negative, which provides the boost.
                 stats["type"] = "Capacitor Booster"
@@ -492,6 +494,9 @@ class EfsPort:
                 return str(item.attributes["chargeGroup1"].value) + "-" + str(item.attributes["chargeSize"].value)
             return str(item.attributes["chargeGroup1"].value)
 
+        if EfsPort.wepTestSetVersion != eos.config.gamedata_version:
+            EfsPort.wepTestSet.clear()
+            EfsPort.wepTestSetVersion = eos.config.gamedata_version
         if setType in EfsPort.wepTestSet.keys():
             return EfsPort.wepTestSet[setType]
         else:
@@ -528,11 +533,15 @@ class EfsPort:
                 modSet.append(mod)
 
         sMkt = Market.getInstance()
+        # Charges of all test modules are fetched at once and grouped here
+        chargeGroupIDs = set(mod.getModifiedItemAttr("chargeGroup1") for mod in modSet)
+        chargesByGroup = {}
+        for charge in gamedata_session.query(Item).filter(Item.groupID.in_(chargeGroupIDs)).all():
+            chargesByGroup.setdefault(charge.groupID, []).append(charge)
         # Due to typed missile damage bonuses we"ll need to add extra launchers to cover all four types.
         additionalLaunchers = []
         for mod in modSet:
-            clist = list(gamedata_session.query(Item).options().
-                    filter(Item.groupID == mod.getModifiedItemAttr("chargeGroup1")).all())
+            clist = chargesByGroup[mod.getModifiedItemAttr("chargeGroup1")]
             mods = [mod]
             charges = [clist[0]]
             if setType == "launcher":
@@ -558,6 +567,26 @@ class EfsPort:
 
     @staticmethod
     def getWeaponBonusMultipliers(fit):
+        # Multipliers depend only on hull, its mode, subsystems and skills,
+        # thus all fits of the same hull share them
+        subsystemIDs = tuple(sorted(
+            mod.item.ID for mod in fit.modules if mod.slot == FittingSlot.SUBSYSTEM and mod.item))
+        skillsKey = tuple(sorted((skill.itemID, skill.level) for skill in fit.character.skills))
+        key = (
+            eos.config.gamedata_version, fit.ship.item.ID,
+            fit.mode.item.ID if fit.mode is not None else None, subsystemIDs, skillsKey)
+        try:
+            return EfsPort.weaponBonusCache[key]
+        except KeyError:
+            pass
+        # Trait effects are applied to fit ship directly, so they are calculated on a copy
+        multipliers = WhatIf.getInstance().evaluate(
+            fit, "weaponBonusMultipliers", EfsPort.calcWeaponBonusMultipliers, mutatesFit=True)
+        EfsPort.weaponBonusCache[key] = multipliers
+        return multipliers
+
+    @staticmethod
+    def calcWeaponBonusMultipliers(fit):
         def sumDamage(attr):
             totalDamage = 0
             for damageType in ["emDamage", "thermalDamage", "kineticDamage", "explosiveDamage"]:
@@ -586,6 +615,8 @@ class EfsPort:
         for weaponTypeSet in [turrets, launchers, drones]:
             for mod in weaponTypeSet:
                 mod.owner = fit
+                # Test sets are shared, drop what previous fit applied to them
+                mod.clear()
         turrets = list(filter(lambda mod: mod.getModifiedItemAttr("damageMultiplier"), turrets))
         launchers = list(filter(lambda mod: sumDamage(mod.getModifiedChargeAttr), launchers))
 
@@ -622,7 +653,6 @@ class EfsPort:
         multipliers["turret"] = round(getMaxRatio(preTraitMultipliers, postTraitMultipliers, "turrets"), 6)
         multipliers["launcher"] = round(getMaxRatio(preTraitMultipliers, postTraitMultipliers, "launchers"), 6)
         multipliers["droneBandwidth"] = round(getMaxRatio(preTraitMultipliers, postTraitMultipliers, "drones"), 6)
-        Fit.getInstance().recalc(fit)
         return multipliers
 
     @staticmethod
@@ -666,7 +696,9 @@ class EfsPort:
             fitName = fit.ship.name + ": " + fit.name
         pyfalog.info("Creating Eve Fleet Simulator data for: " + fit.name)
         fitModAttr = fit.ship.getModifiedItemAttr
-        propData = EfsPort.getPropData(fit, sFit)
+        weaponBonusMultipliers = EfsPort.getWeaponBonusMultipliers(fit)
+        propData = EfsPort.getPropData(fit)
+        unloadedCapacitorNeeds = EfsPort.getUnloadedCapacitorNeeds(fit)
         mwdPropSpeed = fit.maxSpeed
         if includeShipTypeData:
             mwdPropSpeed = EfsPort.getT2MwdSpeed(fit, sFit)
@@ -680,7 +712,6 @@ class EfsPort:
         turretSlots = fitModAttr("turretSlotsLeft") if fitModAttr("turretSlotsLeft") is not None else 0
         launcherSlots = fitModAttr("launcherSlotsLeft") if fitModAttr("launcherSlotsLeft") is not None else 0
         droneBandwidth = fitModAttr("droneBandwidth") if fitModAttr("droneBandwidth") is not None else 0
-        weaponBonusMultipliers = EfsPort.getWeaponBonusMultipliers(fit)
         effectiveTurretSlots = round(turretSlots * weaponBonusMultipliers["turret"], 2)
         effectiveLauncherSlots = round(launcherSlots * weaponBonusMultipliers["launcher"], 2)
         effectiveDroneBandwidth = round(droneBandwidth * weaponBonusMultipliers["droneBandwidth"], 2)
@@ -711,7 +742,7 @@ class EfsPort:
         for cargo in fit.cargo:
             cargoIDs.append(cargo.itemID)
 
-        repairs = EfsPort.getRepairData(fit, sFit)
+        repairs = EfsPort.getRepairData(fit, unloadedCapacitorNeeds)
 
         def roundNumbers(data, digits):
             if isinstance(data, str):
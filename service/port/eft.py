@@ -46,7 +46,18 @@ pyfalog = Logger(__name__)
 MODULE_CATS = ('Module', 'Subsystem', 'Structure Module')
 SLOT_ORDER = (FittingSlot.LOW, FittingSlot.MED, FittingSlot.HIGH, FittingSlot.RIG, FittingSlot.SUBSYSTEM, FittingSlot.SERVICE)
 OFFLINE_SUFFIX = '/OFFLINE'
-NAME_CHARS = '[^,/\[\]]'  # Characters which are allowed to be used in name
+NAME_CHARS = r'[^,/\[\]]'  # Characters which are allowed to be used in name
+# Fit header, e.g. [Rifter, My Fit]; stub lines like [Empty High slot] have no comma
+FIT_HEADER_PATTERN = re.compile(r'^\[(?P<shipType>[^,\[\]]+),\s*(?P<fitName>.+)\]$')
+# Single expression which classifies EFT body line in one pass, trying stub,
+# item with quantity specifier and regular item (with optional charge) in this
+# order
+LINE_PATTERN = re.compile(
+    r'^(?:'
+    r'(?P<stub>\[.+?\])|'
+    r'(?P<multiTypeName>{0}+?) x(?P<amount>\d+?)(\s*\[(?P<multiMutation>\d+?)\])?|'
+    r'(?P<typeName>{0}+?)(,\s*(?P<chargeName>{0}+?))?(?P<offline>\s*{1})?(\s*\[(?P<mutation>\d+?)\])?'
+    r')$'.format(NAME_CHARS, OFFLINE_SUFFIX))
 
 
 class MutationExportData:
@@ -243,46 +254,12 @@ def importEft(lines):
     aFit = AbstractFit()
     aFit.mutations = importGetMutationData(lines)
 
-    stubPattern = '^\[.+?\]$'
-    modulePattern = '^(?P<typeName>{0}+?)(,\s*(?P<chargeName>{0}+?))?(?P<offline>\s*{1})?(\s*\[(?P<mutation>\d+?)\])?$'.format(NAME_CHARS, OFFLINE_SUFFIX)
-    droneCargoPattern = '^(?P<typeName>{}+?) x(?P<amount>\d+?)(\s*\[(?P<mutation>\d+?)\])?$'.format(NAME_CHARS)
-
     sections = []
     for section in _importSectionIter(lines):
         for line in section.lines:
-            # Stub line
-            if re.match(stubPattern, line):
-                section.itemSpecs.append(None)
-                continue
-            # Items with quantity specifier
-            m = re.match(droneCargoPattern, line)
-            if m:
-                try:
-                    itemSpec = MultiItemSpec(m.group('typeName'))
-                # Items which cannot be fetched are considered as stubs
-                except EftImportError:
-                    section.itemSpecs.append(None)
-                else:
-                    itemSpec.amount = int(m.group('amount'))
-                    section.itemSpecs.append(itemSpec)
-                    if m.group('mutation'):
-                        itemSpec.mutationIdx = int(m.group('mutation'))
-                continue
-            # All other items
-            m = re.match(modulePattern, line)
-            if m:
-                try:
-                    itemSpec = RegularItemSpec(m.group('typeName'), chargeName=m.group('chargeName'))
-                # Items which cannot be fetched are considered as stubs
-                except EftImportError:
-                    section.itemSpecs.append(None)
-                else:
-                    if m.group('offline'):
-                        itemSpec.offline = True
-                    if m.group('mutation'):
-                        itemSpec.mutationIdx = int(m.group('mutation'))
-                    section.itemSpecs.append(itemSpec)
-                continue
+            kind, m = classifyEftLine(line)
+            if kind is not None:
+                section.itemSpecs.append(_makeItemSpec(kind, m))
         _clearTail(section.itemSpecs)
         sections.append(section)
 
@@ -365,6 +342,77 @@ def importEft(lines):
     return fit
 
 
+def importEftMulti(lines):
+    """
+    Import several concatenated EFT fits from iterable of lines, which can be
+    a file object. Fits are parsed one by one as their lines are consumed, and
+    only successfully imported fits are yielded.
+    """
+    for fitLines in splitEftFits(lines):
+        fit = importEft(fitLines)
+        if fit is not None:
+            yield fit
+
+
+def splitEftFits(lines):
+    """Split lines into per-fit line lists at fit headers, dropping anything before first header."""
+    fitLines = None
+    for line in lines:
+        if FIT_HEADER_PATTERN.match(line.strip()):
+            if fitLines is not None:
+                yield fitLines
+            fitLines = []
+        if fitLines is not None:
+            fitLines.append(line)
+    if fitLines is not None:
+        yield fitLines
+
+
+def classifyEftLine(line):
+    """
+    Classify stripped EFT body line.
+
+    :return: tuple (kind, match), where kind is 'stub', 'multi', 'regular' or
+    None for lines which do not describe any item
+    """
+    m = LINE_PATTERN.match(line)
+    if m is None:
+        return None, None
+    if m.group('stub') is not None:
+        return 'stub', m
+    if m.group('multiTypeName') is not None:
+        return 'multi', m
+    return 'regular', m
+
+
+def _makeItemSpec(kind, m):
+    """Make item spec out of classified line, None stands for stub."""
+    if kind == 'stub':
+        return None
+    # Items with quantity specifier
+    if kind == 'multi':
+        try:
+            itemSpec = MultiItemSpec(m.group('multiTypeName'))
+        # Items which cannot be fetched are considered as stubs
+        except EftImportError:
+            return None
+        itemSpec.amount = int(m.group('amount'))
+        if m.group('multiMutation'):
+            itemSpec.mutationIdx = int(m.group('multiMutation'))
+        return itemSpec
+    # All other items
+    try:
+        itemSpec = RegularItemSpec(m.group('typeName'), chargeName=m.group('chargeName'))
+    # Items which cannot be fetched are considered as stubs
+    except EftImportError:
+        return None
+    if m.group('offline'):
+        itemSpec.offline = True
+    if m.group('mutation'):
+        itemSpec.mutationIdx = int(m.group('mutation'))
+    return itemSpec
+
+
 def importEftCfg(shipname, lines, progress):
     """Handle import from EFT config store file"""
 
@@ -584,7 +632,7 @@ def _importPrepare(lines):
     return lines
 
 
-mutantHeaderPattern = re.compile('^\[(?P<ref>\d+)\](?P<tail>.*)')
+mutantHeaderPattern = re.compile(r'^\[(?P<ref>\d+)\](?P<tail>.*)')
 
 
 def importGetMutationData(lines):
@@ -645,7 +693,7 @@ def _importCreateFit(lines):
     """Create fit and set top-level entity (ship or citadel)."""
     fit = Fit()
     header = lines.pop(0)
-    m = re.match('\[(?P<shipType>[^,]+),\s*(?P<fitName>.+)\]', header)
+    m = FIT_HEADER_PATTERN.match(header.strip())
     if not m:
         pyfalog.warning('service.port.eft.importEft: corrupted fit header')
         raise EftImportError
@@ -968,7 +1016,7 @@ def lineIter(text):
 def parseAdditions(text, mutaData=None):
     items = []
     sMkt = Market.getInstance()
-    pattern = '^(?P<typeName>{}+?)( x(?P<amount>\d+?))?(\s*\[(?P<mutaref>\d+?)\])?$'.format(NAME_CHARS)
+    pattern = r'^(?P<typeName>{}+?)( x(?P<amount>\d+?))?(\s*\[(?P<mutaref>\d+?)\])?$'.format(NAME_CHARS)
     for line in lineIter(text):
         m = re.match(pattern, line)
         if not m:
@@ -991,7 +1039,7 @@ def isValidDroneImport(text):
     lines = list(lineIter(text))
     mutaData = importGetMutationData(lines)
     text = '\n'.join(lines)
-    pattern = 'x\d+(\s*\[\d+\])?$'
+    pattern = r'x\d+(\s*\[\d+\])?$'
     for line in lineIter(text):
         if not re.search(pattern, line):
             return False, ()
@@ -1005,7 +1053,7 @@ def isValidDroneImport(text):
 
 
 def isValidFighterImport(text):
-    pattern = 'x\d+$'
+    pattern = r'x\d+$'
     for line in lineIter(text):
         if not re.search(pattern, line):
             return False, ()
@@ -1019,7 +1067,7 @@ def isValidFighterImport(text):
 
 
 def isValidCargoImport(text):
-    pattern = 'x\d+$'
+    pattern = r'x\d+$'
     for line in lineIter(text):
         if not re.search(pattern, line):
             return False, ()
@@ -1033,7 +1081,7 @@ def isValidCargoImport(text):
 
 
 def isValidImplantImport(text):
-    pattern = 'x\d+$'
+    pattern = r'x\d+$'
     for line in lineIter(text):
         if re.search(pattern, line):
             return False, ()
@@ -1047,7 +1095,7 @@ def isValidImplantImport(text):
 
 
 def isValidBoosterImport(text):
-    pattern = 'x\d+$'
+    pattern = r'x\d+$'
     for line in lineIter(text):
         if re.search(pattern, line):
             return False, ()
@@ -33,7 +33,7 @@ from eos.const import ImplantLocation
 from service.fit import Fit as svcFit
 from service.port.dna import exportDna, importDna, importDnaAlt
 from service.port.eft import (
-    exportEft, importEft, importEftCfg,
+    exportEft, importEft, importEftCfg, importEftMulti, FIT_HEADER_PATTERN,
     isValidDroneImport, isValidFighterImport, isValidCargoImport,
     isValidImplantImport, isValidBoosterImport)
 from service.port.esi import exportESI, importESI
@@ -239,6 +239,9 @@ class Port:
         # If no file is specified and there's comma between brackets,
         # consider that we have [ship, setup name] and detect like eft export format
         if re.match("^\s*\[.*,.*\]", firstLine):
+            # Several fits pasted one after another
+            if sum(1 for line in lines if FIT_HEADER_PATTERN.match(line.strip())) > 1:
+                return "EFT", True, tuple(cls.importEftMulti(lines))
             return "EFT", True, (cls.importEft(lines),)
 
         # Check if string is in DNA format
@@ -295,6 +298,10 @@ class Port:
     def importEft(lines):
         return importEft(lines)
 
+    @staticmethod
+    def importEftMulti(lines):
+        return importEftMulti(lines)
+
     @staticmethod
     def importEftCfg(shipname, lines, progress=None):
         return importEftCfg(shipname, lines, progress)
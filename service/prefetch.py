@@ -18,11 +18,14 @@
 # =============================================================================
 
 import os
+import threading
 
 import config
 from eos import db
 from eos.db import migration
-from eos.db.saveddata.databaseRepair import DatabaseCleanup
+from eos.db.saveddata.databaseRepair import DatabaseCleanup, IntegrityMarker
+from service.settings import DatabaseSettings
+from utils.startupProfile import StartupProfile
 
 from logbook import Logger
 
@@ -35,21 +38,32 @@ if config.savePath and not os.path.exists(config.savePath):
 if config.saveDB and os.path.isfile(config.saveDB):
     # If database exists, run migration after init'd database
     pyfalog.debug("Run database migration.")
-    db.saveddata_meta.create_all()
-    migration.update(db.saveddata_engine)
-
-    # Finds and fixes database corruption issues.
-    pyfalog.debug("Starting database validation.")
-    database_cleanup_instance = DatabaseCleanup()
-    database_cleanup_instance.OrphanedCharacterSkills(db.saveddata_engine)
-    database_cleanup_instance.OrphanedFitCharacterIDs(db.saveddata_engine)
-    database_cleanup_instance.OrphanedFitDamagePatterns(db.saveddata_engine)
-    database_cleanup_instance.NullDamagePatternNames(db.saveddata_engine)
-    database_cleanup_instance.NullTargetResistNames(db.saveddata_engine)
-    database_cleanup_instance.OrphanedFitIDItemID(db.saveddata_engine)
-    database_cleanup_instance.NullDamageTargetPatternValues(db.saveddata_engine)
-    database_cleanup_instance.DuplicateSelectedAmmoName(db.saveddata_engine)
-    pyfalog.debug("Completed database validation.")
+    with StartupProfile.getInstance().phase("database migration"):
+        db.saveddata_meta.create_all()
+        oldVersion = migration.getVersion(db.saveddata_engine)
+        migration.update(db.saveddata_engine)
+
+    # Marker is present only if previous session shut down cleanly; migration
+    # changes the database, so its results are validated regardless
+    marker = IntegrityMarker(config.saveDB)
+    cleanlyClosed = marker.consume(oldVersion)
+    if migration.getVersion(db.saveddata_engine) != oldVersion:
+        cleanlyClosed = False
+
+    if cleanlyClosed:
+        pyfalog.debug("Database was closed cleanly, skipping validation.")
+    elif DatabaseSettings.getInstance().get('backgroundValidation'):
+        # Finds and fixes database corruption issues, without holding up startup
+        pyfalog.debug("Starting database validation in background.")
+        threading.Thread(
+            target=DatabaseCleanup.RunAll, args=(db.saveddata_engine,),
+            name="DatabaseValidation", daemon=True).start()
+    else:
+        # Finds and fixes database corruption issues.
+        pyfalog.debug("Starting database validation.")
+        with StartupProfile.getInstance().phase("database validation"):
+            DatabaseCleanup.RunAll(db.saveddata_engine)
+        pyfalog.debug("Completed database validation.")
 
 else:
     # If database does not exist, do not worry about migration. Simply
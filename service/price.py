@@ -51,10 +51,18 @@ class Price:
     sources = {}
 
     def __init__(self):
-        # Start price fetcher
-        self.priceWorkerThread = PriceWorkerThread()
-        self.priceWorkerThread.daemon = True
-        self.priceWorkerThread.start()
+        # Price fetcher is started on first request
+        self.__workerLock = threading.Lock()
+        self.__priceWorkerThread = None
+
+    @property
+    def priceWorkerThread(self):
+        with self.__workerLock:
+            if self.__priceWorkerThread is None:
+                self.__priceWorkerThread = PriceWorkerThread()
+                self.__priceWorkerThread.daemon = True
+                self.__priceWorkerThread.start()
+            return self.__priceWorkerThread
 
     @classmethod
     def register(cls, source):
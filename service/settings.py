@@ -19,6 +19,8 @@
 
 import pickle
 import os.path
+import sqlite3
+import threading
 import urllib.request
 import urllib.error
 import urllib.parse
@@ -37,8 +39,20 @@ pyfalog = Logger(__name__)
 
 
 class SettingsProvider:
+    """
+    Keeps all settings areas in single SQLite store, one pickled row per area.
+
+    Whole store is read on first access, changes are coalesced and written in
+    single transaction shortly after last change, as well as on saveAll().
+    Areas persisted by older versions as separate pickle files in BASE_PATH are
+    picked up when they are not in the store yet, and settings are written to
+    those files when the store cannot be opened.
+    """
     if config.savePath:
         BASE_PATH = os.path.join(config.savePath, 'settings')
+        STORE_PATH = os.path.join(config.savePath, 'settings.db')
+    # Seconds to wait after last change before writing settings
+    SAVE_DELAY = 2
     settings = {}
     _instance = None
 
@@ -50,60 +64,127 @@ class SettingsProvider:
         return cls._instance
 
     def __init__(self):
-        if hasattr(self, 'BASE_PATH'):
-            if not os.path.exists(self.BASE_PATH):
-                os.mkdir(self.BASE_PATH)
+        self.__lock = threading.RLock()
+        self.__conn = None
+        # Pickled data per area as of last commit, format: {area: bytes}
+        self.__stored = None
+        self.__saveTimer = None
+
+    def __getStored(self):
+        with self.__lock:
+            if self.__stored is None:
+                self.__stored = {}
+                # NOTE: needed to change for tests
+                if not hasattr(self, 'STORE_PATH'):
+                    return self.__stored
+                try:
+                    self.__conn = sqlite3.connect(self.STORE_PATH, check_same_thread=False)
+                    with self.__conn:
+                        self.__conn.execute('CREATE TABLE IF NOT EXISTS settings (area TEXT PRIMARY KEY, data BLOB NOT NULL)')
+                    for area, data in self.__conn.execute('SELECT area, data FROM settings'):
+                        self.__stored[area] = data
+                except sqlite3.Error as e:
+                    pyfalog.error("Failed to open settings store {0}: {1}", self.STORE_PATH, e)
+                    self.__conn = None
+            return self.__stored
+
+    def __loadArea(self, area):
+        data = self.__getStored().get(area)
+        if data is None and hasattr(self, 'BASE_PATH'):
+            legacy_path = os.path.join(self.BASE_PATH, area)
+            if os.path.exists(legacy_path):
+                with open(legacy_path, "rb") as f:
+                    data = f.read()
+        if data is None:
+            return None
+        return pickle.loads(data)
 
     def getSettings(self, area, defaults=None):
         # type: (basestring, dict) -> service.Settings
-        # NOTE: needed to change for tests
-        # TODO: Write to memory with mmap -> https://docs.python.org/2/library/mmap.html
         settings_obj = self.settings.get(area)
-        if settings_obj is None:  # and hasattr(self, 'BASE_PATH'):
-            canonical_path = os.path.join(self.BASE_PATH, area) if hasattr(self, 'BASE_PATH') else ""
-            if not os.path.exists(canonical_path):  # path string or empty string.
+        if settings_obj is None:
+            try:
+                info = self.__loadArea(area)
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except:
+                pyfalog.warning("Failed to load settings for '{0}', using defaults", area)
+                info = None
+            if info is None:
                 info = {}
-                if defaults:
-                    info.update(defaults)
-            else:
-                try:
-                    with open(canonical_path, "rb") as f:
-                        info = pickle.load(f)
-                    for item in defaults:
-                        if item not in info:
-                            info[item] = defaults[item]
-                except (KeyboardInterrupt, SystemExit):
-                    raise
-                except:
-                    info = {}
-                    info.update(defaults)
-
-            self.settings[area] = settings_obj = Settings(canonical_path, info)
+            for item in defaults or ():
+                if item not in info:
+                    info[item] = defaults[item]
+
+            self.settings[area] = settings_obj = Settings(self, area, info)
         return settings_obj
 
+    def scheduleSave(self):
+        """Write settings once no more changes come in for SAVE_DELAY seconds."""
+        with self.__lock:
+            # NOTE: needed to change for tests
+            if not hasattr(self, 'STORE_PATH'):
+                return
+            if self.__saveTimer is not None:
+                self.__saveTimer.cancel()
+            self.__saveTimer = threading.Timer(self.SAVE_DELAY, self.__delayedSave)
+            self.__saveTimer.daemon = True
+            self.__saveTimer.start()
+
+    def __delayedSave(self):
+        try:
+            self.saveAll()
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except Exception as e:
+            # Settings might be changed while we pickle them, they will be
+            # written with next save
+            pyfalog.warning("Failed to save settings: {0}", e)
+
     def saveAll(self):
-        for settings in self.settings.values():
-            settings.save()
+        with self.__lock:
+            if self.__saveTimer is not None:
+                self.__saveTimer.cancel()
+                self.__saveTimer = None
+            stored = self.__getStored()
+            changed = {}
+            for area, settings in self.settings.items():
+                data = pickle.dumps(settings.info, pickle.HIGHEST_PROTOCOL)
+                if stored.get(area) != data:
+                    changed[area] = data
+            if not changed:
+                return
+            if self.__conn is None:
+                self.__saveLegacy(changed)
+            else:
+                # Single transaction, either all areas are written or none
+                with self.__conn:
+                    self.__conn.executemany(
+                        'INSERT OR REPLACE INTO settings (area, data) VALUES (?, ?)',
+                        list(changed.items()))
+            stored.update(changed)
+
+    def __saveLegacy(self, changed):
+        """Write areas into separate pickle files, as older versions did."""
+        if not hasattr(self, 'BASE_PATH'):
+            return
+        pyfalog.warning("Settings store is not available, writing settings to {0}", self.BASE_PATH)
+        if not os.path.exists(self.BASE_PATH):
+            os.mkdir(self.BASE_PATH)
+        for area, data in changed.items():
+            with open(os.path.join(self.BASE_PATH, area), "wb") as f:
+                f.write(data)
 
 
 class Settings:
-    def __init__(self, location, info):
-        # type: (basestring, dict) -> None
-        # path string or empty string.
-        self.location = location
+    def __init__(self, provider, area, info):
+        # type: (SettingsProvider, basestring, dict) -> None
+        self.provider = provider
+        self.area = area
         self.info = info
 
-    # def save(self):
-    #     f = open(self.location, "wb")
-    #     cPickle.dump(self.info, f, cPickle.HIGHEST_PROTOCOL)
-
     def save(self):
-        # NOTE: needed to change for tests
-        if self.location is None or not self.location:
-            return
-        # NOTE: with + open -> file handle auto close
-        with open(self.location, "wb") as f:
-            pickle.dump(self.info, f, pickle.HIGHEST_PROTOCOL)
+        self.provider.saveAll()
 
     def __getitem__(self, k):
         try:
@@ -114,6 +195,7 @@ class Settings:
 
     def __setitem__(self, k, v):
         self.info[k] = v
+        self.provider.scheduleSave()
 
     def __iter__(self):
         return self.info.__iter__()
@@ -546,6 +628,29 @@ class GraphSettings:
         self.settings[type] = value
 
 
+class DatabaseSettings:
+
+    _instance = None
+
+    @classmethod
+    def getInstance(cls):
+        if cls._instance is None:
+            cls._instance = DatabaseSettings()
+        return cls._instance
+
+    def __init__(self):
+        # backgroundValidation - If True, validate saveddata after unclean
+        #                        shutdown without holding up startup
+        defaults = {'backgroundValidation': False}
+        self.settings = SettingsProvider.getInstance().getSettings('pyfaDatabaseSettings', defaults)
+
+    def get(self, type):
+        return self.settings[type]
+
+    def set(self, type, value):
+        self.settings[type] = value
+
+
 class LocaleSettings:
     _instance = None
     DEFAULT = "en_US"
@@ -0,0 +1,132 @@
+# =============================================================================
+# Copyright (C) 2010 Diego Duclos
+#
+# This file is part of pyfa.
+#
+# pyfa is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# pyfa is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyfa.  If not, see <http://www.gnu.org/licenses/>.
+# =============================================================================
+
+
+from logbook import Logger
+
+from eos.const import FittingModuleState
+
+
+pyfalog = Logger(__name__)
+
+
+class FitOverrides:
+    """
+    Hypothetical changes to fit: states forced onto local modules, charges
+    taken out of local modules and incoming projections switched off.
+    """
+
+    def __init__(self, moduleStates=None, unloadedCharges=(), disableProjections=False):
+        # Format: {position: state}
+        self.moduleStates = dict(moduleStates or {})
+        self.unloadedCharges = frozenset(unloadedCharges)
+        self.disableProjections = disableProjections
+
+    @property
+    def signature(self):
+        return (
+            tuple(sorted(self.moduleStates.items())),
+            tuple(sorted(self.unloadedCharges)),
+            self.disableProjections)
+
+    @property
+    def isEmpty(self):
+        return not self.moduleStates and not self.unloadedCharges and not self.disableProjections
+
+    def makeFit(self, fit):
+        """Return scratch copy of fit with overrides applied to it."""
+        fitCopy = fit.scratchCopy(projectedFits=not self.disableProjections)
+        for position, state in self.moduleStates.items():
+            mod = fitCopy.modules[position]
+            if not mod.isEmpty:
+                mod.state = state
+        for position in self.unloadedCharges:
+            mod = fitCopy.modules[position]
+            if not mod.isEmpty:
+                mod.charge = None
+        if self.disableProjections:
+            for mod in fitCopy.projectedModules:
+                if not mod.isExclusiveSystemEffect and mod.state >= FittingModuleState.ACTIVE:
+                    mod.state = FittingModuleState.ONLINE
+            for drone in fitCopy.projectedDrones:
+                drone.amountActive = 0
+            for fighter in fitCopy.projectedFighters:
+                fighter.active = False
+        return fitCopy
+
+
+class WhatIf:
+    """
+    Answers questions like "what would fit speed be with this module
+    offline" without persisting anything. Overrides are applied to scratch
+    copy of the fit, so the fit itself, its calculated data and its session
+    are never touched. Results are memoized by fit state and override
+    signature.
+    """
+    instance = None
+
+    @classmethod
+    def getInstance(cls):
+        if cls.instance is None:
+            cls.instance = WhatIf()
+        return cls.instance
+
+    def __init__(self):
+        # Format: {fitID: [fit stamp, {(name, override signature): result}]}
+        self.__results = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def __getStamp(fit):
+        from service.fit import Fit
+        return fit.revision, Fit.getInstance().recalcScheduler.getRecalcCount(fit.ID)
+
+    def evaluate(self, fit, name, getter, overrides=None, mutatesFit=False):
+        """
+        Return getter(fit) as if overrides were applied to fit. Set
+        mutatesFit when getter itself leaves calculated data of fit dirty,
+        to run it against copy of the fit as well.
+        """
+        if overrides is None:
+            overrides = FitOverrides()
+        key = (name, overrides.signature)
+        stamp = self.__getStamp(fit)
+        fitResults = self.__results.get(fit.ID)
+        if fitResults is not None and fitResults[0] == stamp and key in fitResults[1]:
+            self.hits += 1
+            return fitResults[1][key]
+        self.misses += 1
+        if overrides.isEmpty and not mutatesFit:
+            result = getter(fit)
+        else:
+            pyfalog.debug('Evaluating {} on copy of fit {}', name, fit.ID)
+            fitCopy = overrides.makeFit(fit)
+            fitCopy.calculateModifiedAttributes()
+            result = getter(fitCopy)
+        if fitResults is None or fitResults[0] != stamp:
+            fitResults = self.__results[fit.ID] = [stamp, {}]
+        fitResults[1][key] = result
+        return result
+
+    def clearForFit(self, fitID):
+        self.__results.pop(fitID, None)
+
+    def getStats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'fits': len(self.__results)}
@@ -3,6 +3,9 @@
 import math
 import os
 import sys
+
+import pytest
+
 script_dir = os.path.dirname(os.path.abspath(__file__))
 script_dir = os.path.realpath(os.path.join(script_dir, '..', '..', '..'))
 print(script_dir)
@@ -46,3 +49,111 @@ def test_multiply_stacking_penalties(DB, Saveddata, RifterFit):
 
         assert em_resist == calculated_resist
         # print(str(em_resist) + "==" + str(calculated_resist))
+
+
+def _makeAttrDict(velocity=100.0):
+    from eos.modifiedAttributeDict import ModifiedAttributeDict
+    attrDict = ModifiedAttributeDict()
+    attrDict.original = {'maxVelocity': velocity}
+    return attrDict
+
+
+def _penalizedValue(velocity, multipliers):
+    # Multipliers have to be of the same sign and sorted by strength
+    for i, multiplier in enumerate(multipliers):
+        velocity *= 1 + (multiplier - 1) * math.exp(- i ** 2 / 7.1289)
+    return velocity
+
+
+def test_multiplyN_stacking_penalties(DB):
+    bulk = _makeAttrDict()
+    bulk.multiplyN('maxVelocity', 1.1, 3, stackingPenalties=True)
+    bulk.multiply('maxVelocity', 1.2, stackingPenalties=True)
+    single = _makeAttrDict()
+    for _ in range(3):
+        single.multiply('maxVelocity', 1.1, stackingPenalties=True)
+    single.multiply('maxVelocity', 1.2, stackingPenalties=True)
+
+    assert bulk['maxVelocity'] == single['maxVelocity']
+    assert bulk['maxVelocity'] == pytest.approx(_penalizedValue(100.0, [1.2, 1.1, 1.1, 1.1]))
+
+
+def test_multiplyN_no_stacking_penalties(DB):
+    bulk = _makeAttrDict()
+    bulk.multiplyN('maxVelocity', 1.1, 3)
+    bulk.boostN('maxVelocity', 50, 2)
+    bulk.increaseN('maxVelocity', 5, 4)
+    single = _makeAttrDict()
+    for _ in range(3):
+        single.multiply('maxVelocity', 1.1)
+    for _ in range(2):
+        single.boost('maxVelocity', 50)
+    for _ in range(4):
+        single.increase('maxVelocity', 5)
+
+    assert bulk['maxVelocity'] == pytest.approx(single['maxVelocity'])
+    assert bulk['maxVelocity'] == pytest.approx(120.0 * 1.1 ** 3 * 1.5 ** 2)
+
+
+def test_multiplyN_ignorePenMult(DB):
+    attrDict = _makeAttrDict()
+    attrDict.multiplyN('maxVelocity', 1.1, 3, stackingPenalties=True)
+    attrDict.multiply('maxVelocity', 1.2, stackingPenalties=True)
+    calculateValue = attrDict._ModifiedAttributeDict__calculateValue
+
+    # Ignoring multiplier applied several times removes one application of it
+    assert calculateValue('maxVelocity', ignorePenMult={'default': [1.1]}) == pytest.approx(
+        _penalizedValue(100.0, [1.2, 1.1, 1.1]))
+    assert calculateValue('maxVelocity', ignorePenMult={'default': [1.2, 1.1]}) == pytest.approx(
+        _penalizedValue(100.0, [1.1, 1.1]))
+    # Source data is not changed by that
+    assert attrDict['maxVelocity'] == pytest.approx(_penalizedValue(100.0, [1.2, 1.1, 1.1, 1.1]))
+
+
+def _makeSeboFit(DB, Saveddata, name):
+    ship = Saveddata['Ship'](DB['db'].getItem("Heron"))
+    fit = Saveddata['Fit'](ship, name)
+    for _ in range(2):
+        mod = Saveddata['Module'](DB['db'].getItem("Remote Sensor Booster II"))
+        mod.state = Saveddata['State'].ACTIVE
+        fit.modules.append(mod)
+    DB['db'].save(fit)
+    return fit
+
+
+def _project(DB, targetFit, projectedFits, amount):
+    DB['db'].save(targetFit)
+    for fit in projectedFits:
+        targetFit.projectedFitDict[fit.ID] = fit
+        targetFit.victimOf[fit.ID].amount = amount
+    DB['db'].save(targetFit)
+    for fit in projectedFits:
+        DB['saveddata_session'].refresh(fit)
+    targetFit.clear()
+    targetFit.calculateModifiedAttributes()
+
+
+def _getProjectedStats(fit):
+    attrs = fit.ship.itemModifiedAttributes
+    afflictions = sum(len(a) for a in attrs.getAfflictions('maxTargetRange').values())
+    return attrs['maxTargetRange'], attrs['scanResolution'], afflictions
+
+
+def test_projected_amount(DB, Saveddata, RifterFit):
+    # Fit projected 3 times should affect target as 3 separate fits would
+    seboFit = _makeSeboFit(DB, Saveddata, "Sebo Heron")
+    _project(DB, RifterFit, [seboFit], 3)
+    seboFits = [_makeSeboFit(DB, Saveddata, "Sebo Heron {}".format(i)) for i in range(3)]
+    targetFit = Saveddata['Fit'](Saveddata['Ship'](DB['db'].getItem("Rifter")), "Target Rifter")
+    _project(DB, targetFit, seboFits, 1)
+
+    amountStats = _getProjectedStats(RifterFit)
+    separateStats = _getProjectedStats(targetFit)
+    assert amountStats[0] == pytest.approx(separateStats[0])
+    assert amountStats[1] == pytest.approx(separateStats[1])
+    assert amountStats[2] == separateStats[2]
+    # Projection amount does not leak into local modifications of target
+    assert RifterFit.getModifierAmount() == 1
+
+    for fit in [RifterFit, targetFit, seboFit] + seboFits:
+        DB['db'].remove(fit)
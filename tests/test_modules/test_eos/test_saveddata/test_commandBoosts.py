@@ -0,0 +1,80 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..', '..')))
+
+
+def _makeFit(DB, Saveddata, shipName, fitName):
+    ship = Saveddata['Ship'](DB['db'].getItem(shipName))
+    fit = Saveddata['Fit'](ship, fitName)
+    DB['db'].save(fit)
+    return fit
+
+
+def _makeBooster(DB, Saveddata, chargeName):
+    booster = _makeFit(DB, Saveddata, 'Claymore', 'Claymore Booster')
+    mod = Saveddata['Module'](DB['db'].getItem('Shield Command Burst I'))
+    mod.charge = DB['db'].getItem(chargeName)
+    mod.state = Saveddata['State'].ACTIVE
+    booster.modules.append(mod)
+    DB['db'].save(booster)
+    return booster
+
+
+def _boost(DB, booster, boostedFits):
+    for fit in boostedFits:
+        fit.commandFitDict[booster.ID] = booster
+        DB['db'].save(fit)
+    # Command info is keyed by boosted fit ID, which is known only after flush
+    DB['saveddata_session'].refresh(booster)
+
+
+def _getShieldStats(fit):
+    return fit.ship.getModifiedItemAttr('shieldEmDamageResonance'), fit.ship.getModifiedItemAttr('shieldCapacity')
+
+
+def test_commandBoosts_sharedBooster(DB, Saveddata):
+    booster = _makeBooster(DB, Saveddata, 'Shield Harmonizing Charge')
+    unboosted = _makeFit(DB, Saveddata, 'Rifter', 'Unboosted Rifter')
+    boosted1 = _makeFit(DB, Saveddata, 'Rifter', 'Boosted Rifter 1')
+    boosted2 = _makeFit(DB, Saveddata, 'Rifter', 'Boosted Rifter 2')
+    _boost(DB, booster, (boosted1, boosted2))
+
+    unboosted.calculateModifiedAttributes()
+    # First fit runs booster effects directly, second one gets them replayed
+    boosted1.calculateModifiedAttributes()
+    boosted2.calculateModifiedAttributes()
+
+    assert _getShieldStats(boosted1) == _getShieldStats(boosted2)
+    assert _getShieldStats(boosted1)[0] < _getShieldStats(unboosted)[0]
+
+    for fit in (boosted1, boosted2, unboosted, booster):
+        DB['db'].remove(fit)
+
+
+def test_commandBoosts_boosterCleared(DB, Saveddata):
+    booster = _makeBooster(DB, Saveddata, 'Shield Harmonizing Charge')
+    unboosted = _makeFit(DB, Saveddata, 'Rifter', 'Unboosted Rifter')
+    boosted1 = _makeFit(DB, Saveddata, 'Rifter', 'Boosted Rifter 1')
+    boosted2 = _makeFit(DB, Saveddata, 'Rifter', 'Boosted Rifter 2')
+    _boost(DB, booster, (boosted1, boosted2))
+    unboosted.calculateModifiedAttributes()
+    boosted1.calculateModifiedAttributes()
+    boosted2.calculateModifiedAttributes()
+
+    # Swap burst charge, buffs collected for the old one should not be replayed
+    booster.modules[0].charge = DB['db'].getItem('Shield Extension Charge')
+    for fit in (booster, boosted1, boosted2):
+        fit.clear()
+    boosted1.calculateModifiedAttributes()
+    boosted2.calculateModifiedAttributes()
+
+    assert _getShieldStats(boosted1) == _getShieldStats(boosted2)
+    assert _getShieldStats(boosted2)[0] == _getShieldStats(unboosted)[0]
+    assert _getShieldStats(boosted2)[1] > _getShieldStats(unboosted)[1]
+
+    for fit in (boosted1, boosted2, unboosted, booster):
+        DB['db'].remove(fit)
@@ -0,0 +1,63 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..', '..')))
+
+
+def _projectHeron(DB, Saveddata, RifterFit, HeronFit):
+    for mod in HeronFit.modules:
+        mod.state = Saveddata['State'].ACTIVE
+    RifterFit.character = Saveddata['Character'].getAll5()
+    DB['db'].save(RifterFit)
+    DB['db'].save(HeronFit)
+    RifterFit.projectedFitDict[HeronFit.ID] = HeronFit
+    DB['db'].save(RifterFit)
+    # Projection info is keyed by victim ID, which is known only after flush
+    DB['saveddata_session'].refresh(HeronFit)
+
+
+def test_scratchCopy_outOfSession(DB, Saveddata, RifterFit, HeronFit):
+    _projectHeron(DB, Saveddata, RifterFit, HeronFit)
+    session = DB['saveddata_session']
+
+    fitCopy = RifterFit.scratchCopy()
+    fitCopy.calculateModifiedAttributes()
+    fitCopy.name = 'My Changed Rifter Fit'
+    fitCopy.modules.append(Saveddata['Module'](DB['db'].getItem("Remote Sensor Booster II")))
+    fitCopy.clear()
+    fitCopy.calculateModifiedAttributes()
+    session.flush()
+
+    assert fitCopy not in session
+    assert fitCopy.ID is None
+    for mod in fitCopy.modules:
+        assert mod not in session
+    assert fitCopy not in RifterFit.character.fits
+    assert RifterFit.name == 'My Rifter Fit'
+    assert len(RifterFit.modules) == 0
+
+    DB['db'].remove(RifterFit)
+    DB['db'].remove(HeronFit)
+
+
+def test_scratchCopy_linkedFits(DB, Saveddata, RifterFit, HeronFit):
+    _projectHeron(DB, Saveddata, RifterFit, HeronFit)
+    RifterFit.calculateModifiedAttributes()
+    projectedRange = RifterFit.ship.getModifiedItemAttr('maxTargetRange')
+
+    # Projections onto original fit apply to its copy as well
+    fitCopy = RifterFit.scratchCopy()
+    fitCopy.calculateModifiedAttributes()
+    assert fitCopy.ship.getModifiedItemAttr('maxTargetRange') == projectedRange
+
+    unprojectedCopy = RifterFit.scratchCopy(projectedFits=False)
+    unprojectedCopy.calculateModifiedAttributes()
+    assert unprojectedCopy.ship.getModifiedItemAttr('maxTargetRange') < projectedRange
+    # Copies never project onto anything themselves
+    assert list(HeronFit.projectedOnto) == [RifterFit.ID]
+
+    DB['db'].remove(RifterFit)
+    DB['db'].remove(HeronFit)
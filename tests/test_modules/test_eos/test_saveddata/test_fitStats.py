@@ -0,0 +1,121 @@
+# Add root folder to python paths
+# This must be done on every test in order to pass in Travis
+import datetime
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..', '..')))
+
+# noinspection PyPackageRequirements
+from eos.saveddata.fitStats import FitStats
+
+
+MODIFIED = datetime.datetime(2020, 1, 1, 12, 0, 0)
+
+
+def _makeSummary(fitID=1, fitModified=MODIFIED, characterID=5, gamedataVersion='1000'):
+    summary = FitStats(fitID)
+    summary.fitModified = fitModified
+    summary.characterID = characterID
+    summary.gamedataVersion = gamedataVersion
+    return summary
+
+
+def test_isValid_sameState():
+    summary = _makeSummary()
+    assert summary.isValid(MODIFIED, 5, '1000') is True
+
+
+def test_isValid_fitModified():
+    summary = _makeSummary()
+    assert summary.isValid(MODIFIED + datetime.timedelta(seconds=1), 5, '1000') is False
+
+
+def test_isValid_character():
+    summary = _makeSummary()
+    assert summary.isValid(MODIFIED, 6, '1000') is False
+    assert summary.isValid(MODIFIED, None, '1000') is False
+
+
+def test_isValid_gamedataVersion():
+    summary = _makeSummary()
+    assert summary.isValid(MODIFIED, 5, '1001') is False
+    assert summary.isValid(MODIFIED, 5, None) is False
+
+
+def test_isValid_noTimestamps():
+    # Fits which have neither modification nor creation time still get valid summaries
+    summary = _makeSummary(fitModified=None, characterID=None, gamedataVersion=None)
+    assert summary.isValid(None, None, None) is True
+
+
+def test_getValidFitStats(DB, Saveddata, RifterFit):
+    DB['db'].save(RifterFit)
+    RifterFit.character = Saveddata['Character'].getAll5()
+    RifterFit.calculateModifiedAttributes()
+    fitModified = RifterFit.modified or RifterFit.created
+    summary = FitStats(RifterFit.ID)
+    summary.update(RifterFit, fitModified, '1000')
+    DB['db'].save(summary)
+
+    summaries = DB['db'].getValidFitStats([RifterFit.ID], '1000')
+    assert summaries == {RifterFit.ID: summary}
+    # Summaries made for other game data are outdated
+    assert DB['db'].getValidFitStats([RifterFit.ID], '1001') == {}
+
+    DB['db'].remove(summary)
+    DB['db'].remove(RifterFit)
+
+
+def test_getValidFitStats_noTimestamps(DB, Saveddata, RifterFit):
+    DB['db'].save(RifterFit)
+    # Fits stored by old versions might have no timestamps at all
+    DB['saveddata_session'].execute(
+        'UPDATE fits SET created = NULL, modified = NULL WHERE ID = :fitID', {'fitID': RifterFit.ID})
+    summary = FitStats(RifterFit.ID)
+    summary.characterID = RifterFit.characterID
+    summary.gamedataVersion = '1000'
+    DB['db'].save(summary)
+
+    assert list(DB['db'].getValidFitStats([RifterFit.ID], '1000')) == [RifterFit.ID]
+
+    DB['db'].remove(summary)
+    DB['db'].remove(RifterFit)
+
+
+def test_getValidFitStats_fitChanged(DB, Saveddata, RifterFit):
+    DB['db'].save(RifterFit)
+    summary = FitStats(RifterFit.ID)
+    summary.fitModified = RifterFit.modified or RifterFit.created
+    summary.characterID = RifterFit.characterID
+    summary.gamedataVersion = '1000'
+    DB['db'].save(summary)
+
+    RifterFit.name = 'My Renamed Rifter Fit'
+    DB['db'].save(RifterFit)
+    assert DB['db'].getValidFitStats([RifterFit.ID], '1000') == {}
+
+    DB['db'].remove(summary)
+    DB['db'].remove(RifterFit)
+
+
+def test_clearFitStats_character(DB, Saveddata, RifterFit, HeronFit):
+    DB['db'].save(RifterFit)
+    DB['db'].save(HeronFit)
+    summaries = []
+    for fit, characterID in ((RifterFit, 1), (HeronFit, 2)):
+        summary = FitStats(fit.ID)
+        summary.characterID = characterID
+        DB['db'].save(summary)
+        summaries.append(summary)
+
+    DB['db'].clearFitStats(characterID=1)
+    assert DB['db'].getFitStats(RifterFit.ID) is None
+    assert DB['db'].getFitStats(HeronFit.ID) is not None
+
+    DB['db'].clearFitStats()
+    assert DB['db'].getFitStats(HeronFit.ID) is None
+
+    DB['db'].remove(RifterFit)
+    DB['db'].remove(HeronFit)
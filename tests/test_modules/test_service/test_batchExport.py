@@ -0,0 +1,49 @@
+# Add root folder to python paths
+import json
+import multiprocessing
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..')))
+
+import config
+# noinspection PyPackageRequirements
+from service.port.batchExport import exportFits
+
+
+def _createFits(savePath):
+    config.saveInRoot = False
+    config.defPaths(savePath)
+    import eos.db
+    from eos.saveddata.fit import Fit
+    from eos.saveddata.ship import Ship
+    eos.db.saveddata_meta.create_all()
+    fitIDs = []
+    for shipName in ('Rifter', 'Heron'):
+        fit = Fit(Ship(eos.db.getItem(shipName)), 'My {} Fit'.format(shipName))
+        eos.db.save(fit)
+        fitIDs.append(fit.ID)
+    return fitIDs
+
+
+def test_exportFits_twoFits(tmp_path, monkeypatch):
+    savePath = str(tmp_path)
+    # Saveddata of tests is kept in memory, while workers read it from disk,
+    # thus fits are stored by separate process
+    with multiprocessing.get_context('spawn').Pool(processes=1) as pool:
+        fitIDs = pool.apply(_createFits, (savePath,))
+    monkeypatch.setattr(config, 'savePath', savePath)
+    monkeypatch.setattr(config, 'saveInRoot', False)
+    outPath = os.path.join(savePath, 'fits.jsonl')
+
+    stats = exportFits(fitIDs, outPath, workers=2)
+
+    with open(outPath, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert stats['fits'] == 2
+    assert stats['errors'] == 0
+    assert sorted(record['fitID'] for record in records) == sorted(fitIDs)
+    for record in records:
+        assert 'efs' in record
+        assert 'stats' in record
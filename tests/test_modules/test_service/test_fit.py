@@ -31,3 +31,29 @@ def test_getFitsWithShip_RifterFit(DB, RifterFit):
     assert Fit.getFitsWithShip(587)[0][1] == 'My Rifter Fit'
 
     DB['db'].remove(RifterFit)
+
+
+def test_copyFit_linkedFits(DB, RifterFit, HeronFit, CurseFit):
+    for fit in (RifterFit, HeronFit, CurseFit):
+        DB['db'].save(fit)
+    RifterFit.projectedFitDict[HeronFit.ID] = HeronFit
+    RifterFit.commandFitDict[CurseFit.ID] = CurseFit
+    projectionInfo = RifterFit.victimOf[HeronFit.ID]
+    projectionInfo.active = False
+    projectionInfo.amount = 3
+    projectionInfo.projectionRange = 20000
+    RifterFit.boostedOf[CurseFit.ID].active = False
+    DB['db'].save(RifterFit)
+
+    copyID = Fit.copyFit(RifterFit.ID)
+
+    copyProjectionInfo = HeronFit.getProjectionInfo(copyID)
+    assert copyProjectionInfo.active is False
+    assert copyProjectionInfo.amount == 3
+    assert copyProjectionInfo.projectionRange == 20000
+    assert CurseFit.getCommandInfo(copyID).active is False
+
+    DB['db'].remove(DB['db'].getFit(copyID))
+    DB['db'].remove(RifterFit)
+    DB['db'].remove(HeronFit)
+    DB['db'].remove(CurseFit)
@@ -0,0 +1,97 @@
+# Add root folder to python paths
+import os
+import pickle
+import sqlite3
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.realpath(os.path.join(script_dir, '..', '..', '..')))
+
+import pytest
+
+# noinspection PyPackageRequirements
+from service.settings import SettingsProvider
+
+
+DEFAULTS = {'enabled': False, 'path': ''}
+
+
+@pytest.fixture
+def SettingsPaths(tmp_path, monkeypatch):
+    paths = {
+        'store': str(tmp_path / 'settings.db'),
+        'base': str(tmp_path / 'settings')}
+    monkeypatch.setattr(SettingsProvider, 'STORE_PATH', paths['store'], raising=False)
+    monkeypatch.setattr(SettingsProvider, 'BASE_PATH', paths['base'], raising=False)
+    monkeypatch.setattr(SettingsProvider, 'settings', {})
+    return paths
+
+
+def _reload(monkeypatch):
+    # Loaded areas are shared between providers, new session starts without them
+    monkeypatch.setattr(SettingsProvider, 'settings', {})
+    return SettingsProvider()
+
+
+def _getStoredAreas(storePath):
+    conn = sqlite3.connect(storePath)
+    try:
+        return {area: pickle.loads(data) for area, data in conn.execute('SELECT area, data FROM settings')}
+    finally:
+        conn.close()
+
+
+def test_saveAll_roundTrip(SettingsPaths, monkeypatch):
+    provider = SettingsProvider()
+    settings = provider.getSettings('testArea', DEFAULTS)
+    settings['enabled'] = True
+    provider.saveAll()
+
+    assert _getStoredAreas(SettingsPaths['store']) == {'testArea': {'enabled': True, 'path': ''}}
+    assert not os.path.exists(os.path.join(SettingsPaths['base'], 'testArea'))
+
+    provider = _reload(monkeypatch)
+    settings = provider.getSettings('testArea', dict(DEFAULTS, extra=1))
+    assert settings['enabled'] is True
+    assert settings['extra'] == 1
+
+
+def test_scheduleSave_debounce(SettingsPaths, monkeypatch):
+    monkeypatch.setattr(SettingsProvider, 'SAVE_DELAY', 0.2)
+    provider = SettingsProvider()
+    settings = provider.getSettings('testArea', DEFAULTS)
+    settings['enabled'] = True
+    settings['path'] = 'fits.html'
+    # Nothing is written until changes stop coming in
+    assert _getStoredAreas(SettingsPaths['store']) == {}
+
+    deadline = time.time() + 5
+    while time.time() < deadline and not _getStoredAreas(SettingsPaths['store']):
+        time.sleep(0.05)
+    assert _getStoredAreas(SettingsPaths['store']) == {'testArea': {'enabled': True, 'path': 'fits.html'}}
+
+
+def test_getSettings_legacyPickle(SettingsPaths):
+    os.mkdir(SettingsPaths['base'])
+    with open(os.path.join(SettingsPaths['base'], 'testArea'), 'wb') as f:
+        pickle.dump({'enabled': True}, f, pickle.HIGHEST_PROTOCOL)
+
+    settings = SettingsProvider().getSettings('testArea', DEFAULTS)
+    assert settings['enabled'] is True
+    assert settings['path'] == ''
+
+
+def test_saveAll_storeUnavailable(SettingsPaths, monkeypatch, tmp_path):
+    # Directory cannot be opened as SQLite database
+    monkeypatch.setattr(SettingsProvider, 'STORE_PATH', str(tmp_path), raising=False)
+    provider = SettingsProvider()
+    settings = provider.getSettings('testArea', DEFAULTS)
+    settings['enabled'] = True
+    provider.saveAll()
+
+    with open(os.path.join(SettingsPaths['base'], 'testArea'), 'rb') as f:
+        assert pickle.load(f) == {'enabled': True, 'path': ''}
+
+    settings = _reload(monkeypatch).getSettings('testArea', DEFAULTS)
+    assert settings['enabled'] is True
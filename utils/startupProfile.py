@@ -0,0 +1,87 @@
+import builtins
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    """
+    Collects wall time of named startup phases, along with time spent in
+    imports while each phase was running. Phases can be nested.
+
+    with StartupProfile.getInstance().phase('database migration'):
+        ...
+    """
+    _instance = None
+
+    @classmethod
+    def getInstance(cls):
+        if cls._instance is None:
+            cls._instance = StartupProfile()
+        return cls._instance
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        # Format: [(depth, name, wall time, import time)], in order phases were started
+        self.phases = []
+        self.__depth = 0
+        self.__importTime = 0
+        self.__importDepth = 0
+        self.__origImport = None
+        self.__mainThread = threading.main_thread()
+
+    def installImportHook(self):
+        """Start accounting time spent in import statements of main thread."""
+        if self.__origImport is not None:
+            return
+        self.__origImport = origImport = builtins.__import__
+
+        def timedImport(*args, **kwargs):
+            if threading.current_thread() is not self.__mainThread:
+                return origImport(*args, **kwargs)
+            # Only outermost import is timed, nested ones are part of it
+            self.__importDepth += 1
+            start = time.perf_counter() if self.__importDepth == 1 else None
+            try:
+                return origImport(*args, **kwargs)
+            finally:
+                self.__importDepth -= 1
+                if start is not None:
+                    self.__importTime += time.perf_counter() - start
+
+        builtins.__import__ = timedImport
+
+    def removeImportHook(self):
+        if self.__origImport is None:
+            return
+        builtins.__import__ = self.__origImport
+        self.__origImport = None
+
+    @contextmanager
+    def phase(self, name):
+        entry = [self.__depth, name, None, None]
+        self.phases.append(entry)
+        self.__depth += 1
+        start = time.perf_counter()
+        importStart = self.__importTime
+        try:
+            yield
+        finally:
+            self.__depth -= 1
+            entry[2] = time.perf_counter() - start
+            entry[3] = self.__importTime - importStart
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def report(self):
+        lines = ['Startup profile ({:.0f}ms total, {:.0f}ms in imports):'.format(
+            self.elapsed * 1000, self.__importTime * 1000)]
+        for depth, name, wallTime, importTime in self.phases:
+            if wallTime is None:
+                lines.append('{}{}: not finished'.format('  ' * (depth + 1), name))
+                continue
+            lines.append('{}{}: {:.0f}ms (imports {:.0f}ms)'.format(
+                '  ' * (depth + 1), name, wallTime * 1000, importTime * 1000))
+        return '\n'.join(lines)